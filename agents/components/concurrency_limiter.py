@@ -0,0 +1,329 @@
+# agents/components/concurrency_limiter.py
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import fcntl
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+
+_OVERLOAD_CODES = {429, 504}
+_OVERLOAD_STATUSES = {"RESOURCE_EXHAUSTED", "DEADLINE_EXCEEDED"}
+
+# Cancel message for calls abandoned because the caller's deadline ran out; the limiter
+# counts those as overload, unlike other cancellations (e.g. a hedge race loser)
+DEADLINE_CANCEL_MSG = "deadline exceeded"
+
+
+def is_overload(exc: BaseException) -> bool:
+    """Quota (429) and deadline errors mean "back off"; anything else is a real failure."""
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, httpx.TimeoutException)):
+        return True
+    code = getattr(exc, "code", None)
+    if callable(code):  # google.api_core exceptions expose code as a property, grpc as a method
+        with contextlib.suppress(Exception):
+            code = code()
+    if isinstance(code, int) and code in _OVERLOAD_CODES:
+        return True
+    status = getattr(exc, "status", None) or getattr(code, "name", None)
+    if isinstance(status, str) and status.upper() in _OVERLOAD_STATUSES:
+        return True
+    return type(exc).__name__ in ("ResourceExhausted", "DeadlineExceeded", "TooManyRequests")
+
+
+# --------------------------
+# Cross-process state
+# --------------------------
+
+class _SharedState:
+    """
+    Small JSON file guarded by flock so every worker on the host sees one limit
+    and one in-flight count. Holders are tracked per pid so a crashed worker's
+    slots are reclaimed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.pid = str(os.getpid())
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[Dict[str, Any]]:
+        with open(self.path, "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read()
+                state = json.loads(raw) if raw.strip() else {}
+                state.setdefault("holders", {})
+                yield state
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _alive(pid: str) -> bool:
+        try:
+            os.kill(int(pid), 0)
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def try_acquire(self, default_limit: float) -> bool:
+        with self._locked() as state:
+            holders = {p: n for p, n in state["holders"].items() if n > 0 and self._alive(p)}
+            limit = state.setdefault("limit", default_limit)
+            if sum(holders.values()) >= max(1, int(limit)):
+                state["holders"] = holders
+                return False
+            holders[self.pid] = holders.get(self.pid, 0) + 1
+            state["holders"] = holders
+            return True
+
+    def release(self) -> None:
+        with self._locked() as state:
+            n = state["holders"].get(self.pid, 0) - 1
+            if n > 0:
+                state["holders"][self.pid] = n
+            else:
+                state["holders"].pop(self.pid, None)
+
+    def update_limit(self, fn: Callable[[float], float], default_limit: float) -> float:
+        with self._locked() as state:
+            state["limit"] = fn(float(state.get("limit", default_limit)))
+            return state["limit"]
+
+    def read(self) -> Dict[str, Any]:
+        with self._locked() as state:
+            return {"limit": state.get("limit"), "in_flight": sum(state["holders"].values())}
+
+
+# --------------------------
+# AIMD limiter
+# --------------------------
+
+class AdaptiveLimiter:
+    """
+    Additive-increase / multiplicative-decrease cap on in-flight model calls.
+    Overload errors multiply the limit by `backoff`; each success adds 1/limit,
+    so the limit grows by about one per window of successful calls.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial: float = 8,
+        min_limit: float = 1,
+        max_limit: float = 64,
+        backoff: float = 0.5,
+        state_file: Optional[str] = None,
+        poll_s: float = 0.05,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.poll_s = poll_s
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self._in_flight = 0
+        self._waiting = 0
+        self._successes = 0
+        self._overloads = 0
+        self._last_wait_s = 0.0
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._async_waiters: "list[tuple[asyncio.AbstractEventLoop, asyncio.Future]]" = []
+        self._shared = _SharedState(state_file) if state_file else None
+
+    # ---- limit ----
+
+    @property
+    def limit(self) -> float:
+        return self._limit
+
+    def _clamp(self, v: float) -> float:
+        return min(max(v, self.min_limit), self.max_limit)
+
+    def _adjust(self, fn: Callable[[float], float]) -> None:
+        if self._shared is not None:
+            v = self._shared.update_limit(lambda cur: self._clamp(fn(cur)), self._limit)
+        else:
+            v = self._clamp(fn(self._limit))
+        with self._lock:
+            self._limit = v
+
+    def on_success(self) -> None:
+        with self._lock:
+            self._successes += 1
+        self._adjust(lambda cur: cur + 1.0 / max(cur, 1.0))
+
+    def on_overload(self) -> None:
+        with self._lock:
+            self._overloads += 1
+        self._adjust(lambda cur: cur * self.backoff)
+
+    # ---- slots ----
+
+    def _try_acquire(self) -> bool:
+        if self._shared is not None:
+            if not self._shared.try_acquire(self._limit):
+                return False
+            with self._lock:
+                self._in_flight += 1
+            return True
+        with self._lock:
+            if self._in_flight >= max(1, int(self._limit)):
+                return False
+            self._in_flight += 1
+            return True
+
+    def _release(self) -> None:
+        if self._shared is not None:
+            self._shared.release()
+        with self._lock:
+            self._in_flight -= 1
+            self._cond.notify()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, fut in waiters:
+            loop.call_soon_threadsafe(lambda f=fut: f.done() or f.set_result(None))
+
+    def _settle(self, exc: Optional[BaseException]) -> None:
+        if exc is None:
+            self.on_success()
+        elif is_overload(exc):
+            self.on_overload()
+
+    # With a state file every acquire/settle/release is flock + file I/O; keep that off the event loop
+
+    async def _offload(self, fn: Callable[..., T], *args: Any) -> T:
+        if self._shared is None:
+            return fn(*args)
+        return await asyncio.to_thread(fn, *args)
+
+    async def _atry_acquire(self) -> bool:
+        if self._shared is None:
+            return self._try_acquire()
+        fut = asyncio.ensure_future(asyncio.to_thread(self._try_acquire))
+        try:
+            return await asyncio.shield(fut)
+        except asyncio.CancelledError:
+            # the thread runs to completion regardless; hand back a slot it may have taken
+            fut.add_done_callback(
+                lambda f: not f.cancelled() and f.exception() is None and f.result() and self._release()
+            )
+            raise
+
+    @contextlib.contextmanager
+    def slot(self) -> Iterator[None]:
+        started = time.perf_counter()
+        with self._lock:
+            self._waiting += 1
+        try:
+            while not self._try_acquire():
+                with self._cond:
+                    self._cond.wait(self.poll_s)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+                self._last_wait_s = time.perf_counter() - started
+        try:
+            yield
+        except Exception as e:
+            self._settle(e)
+            raise
+        else:
+            self._settle(None)
+        finally:
+            self._release()
+
+    @contextlib.asynccontextmanager
+    async def aslot(self) -> AsyncIterator[None]:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        with self._lock:
+            self._waiting += 1
+        try:
+            while not await self._atry_acquire():
+                fut = loop.create_future()
+                with self._lock:
+                    self._async_waiters.append((loop, fut))
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(fut, self.poll_s)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+                self._last_wait_s = time.perf_counter() - started
+        try:
+            yield
+        except asyncio.CancelledError as e:
+            # a deadline miss is overload; any other cancellation (hedge losers) is neither outcome
+            if DEADLINE_CANCEL_MSG in e.args:
+                await self._offload(self._settle, asyncio.TimeoutError())
+            raise
+        except Exception as e:
+            await self._offload(self._settle, e)
+            raise
+        else:
+            await self._offload(self._settle, None)
+        finally:
+            await self._offload(self._release)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current limit and queue depth, for logs and health endpoints."""
+        with self._lock:
+            snap = {
+                "limit": round(self._limit, 2),
+                "in_flight": self._in_flight,
+                "queue_depth": self._waiting,
+                "successes": self._successes,
+                "overloads": self._overloads,
+                "last_wait_ms": round(self._last_wait_s * 1000, 1),
+            }
+        if self._shared is not None:
+            snap["shared"] = self._shared.read()
+        return snap
+
+
+# --------------------------
+# Retries
+# --------------------------
+
+def _backoff_delay(attempt: int, base_s: float, cap_s: float) -> float:
+    # "full jitter": spread retries so a burst of 429s does not come back in lockstep
+    return random.uniform(0, min(cap_s, base_s * (2 ** attempt)))
+
+
+def call_with_retries(
+    fn: Callable[[], T], *, retries: int = 3, base_s: float = 0.5, cap_s: float = 8.0
+) -> T:
+    for attempt in range(retries + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt >= retries or not is_overload(e):
+                raise
+            time.sleep(_backoff_delay(attempt, base_s, cap_s))
+    raise AssertionError("unreachable")
+
+
+async def acall_with_retries(
+    fn: Callable[[], Awaitable[T]], *, retries: int = 3, base_s: float = 0.5, cap_s: float = 8.0
+) -> T:
+    for attempt in range(retries + 1):
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt >= retries or not is_overload(e):
+                raise
+            await asyncio.sleep(_backoff_delay(attempt, base_s, cap_s))
+    raise AssertionError("unreachable")
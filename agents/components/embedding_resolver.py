@@ -0,0 +1,175 @@
+# agents/components/embedding_resolver.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import zlib
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .ontology_index import normalize_term
+
+ONTOLOGY_EMBED_DIM = int(os.getenv("ONTOLOGY_EMBED_DIM", "4096"))
+ONTOLOGY_EMBED_CUTOFF = float(os.getenv("ONTOLOGY_EMBED_CUTOFF", "0.45"))
+
+
+# --------------------------
+# Vectorizer
+# --------------------------
+
+class HashingVectorizer:
+    """
+    Char n-grams (within padded words) plus whole words, hashed into a fixed number
+    of buckets with a sign bit, then L2-normalized. crc32 keeps bucket ids stable
+    across processes, so a saved matrix stays valid.
+    """
+
+    def __init__(self, dim: int = ONTOLOGY_EMBED_DIM, ngram_range: Tuple[int, int] = (3, 5), word_weight: float = 2.0):
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.word_weight = word_weight
+
+    def _features(self, term: str) -> List[Tuple[str, float]]:
+        feats: List[Tuple[str, float]] = []
+        lo, hi = self.ngram_range
+        for word in normalize_term(term).split():
+            feats.append((f"w:{word}", self.word_weight))
+            padded = f"<{word}>"
+            for n in range(lo, hi + 1):
+                feats.extend((padded[i:i + n], 1.0) for i in range(len(padded) - n + 1))
+        return feats
+
+    def transform(self, terms: Sequence[str]) -> np.ndarray:
+        out = np.zeros((len(terms), self.dim), dtype=np.float32)
+        for row, term in enumerate(terms):
+            for feat, w in self._features(term):
+                h = zlib.crc32(feat.encode("utf-8"))
+                out[row, h % self.dim] += w if (h >> 31) & 1 else -w
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+
+# --------------------------
+# Resolver
+# --------------------------
+
+def _ontology_terms(ontology: Mapping[str, Any]) -> List[Tuple[str, str]]:
+    labels: List[Tuple[str, str]] = []
+    seen = set()
+    for logical, cfg in ontology.items():
+        for term in [logical] + list((cfg or {}).get("synonyms", []) or []):
+            norm = normalize_term(term)
+            if norm and norm not in seen:
+                seen.add(norm)
+                labels.append((norm, logical))
+    return labels
+
+
+class EmbeddingResolver:
+    """
+    Dense (terms × dim) matrix; a lookup is one mat-vec, a batch one mat-mat.
+
+    The hashed n-gram vectors only match terms that overlap an existing synonym in
+    spelling ("espresso bars", "fitness centre"); a real paraphrase with no shared
+    n-grams ("third wave roastery") scores below the cutoff and is left to the
+    search-backed matcher. A learned embedding model would fill this matrix instead.
+    """
+
+    def __init__(self, matrix: np.ndarray, labels: List[Tuple[str, str]], vectorizer: HashingVectorizer):
+        self.matrix = matrix
+        self.terms = [t for t, _ in labels]
+        self.categories = [c for _, c in labels]
+        self.vectorizer = vectorizer
+
+    @classmethod
+    def from_ontology(cls, ontology: Mapping[str, Any], dim: int = ONTOLOGY_EMBED_DIM) -> "EmbeddingResolver":
+        vec = HashingVectorizer(dim)
+        labels = _ontology_terms(ontology)
+        return cls(vec.transform([t for t, _ in labels]), labels, vec)
+
+    # ---- persistence ----
+
+    @staticmethod
+    def artifact_paths(ontology_file: str) -> Tuple[str, str]:
+        stem = os.path.splitext(ontology_file)[0]
+        return f"{stem}.vectors.npy", f"{stem}.vectors.json"
+
+    @classmethod
+    def load_or_build(
+        cls,
+        ontology_file: str,
+        ontology: Mapping[str, Any],
+        dim: int = ONTOLOGY_EMBED_DIM,
+        digest: Optional[str] = None,
+    ) -> "EmbeddingResolver":
+        """
+        Memory-map `<ontology>.vectors.npy` when it was built from this exact YAML
+        (sha256) and dimension; otherwise rebuild and write it next to the YAML.
+        Pass `digest` when the caller has already hashed the file.
+        """
+        npy_path, meta_path = cls.artifact_paths(ontology_file)
+        if digest is None:
+            with open(ontology_file, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("ontology_sha256") == digest and meta.get("dim") == dim:
+                matrix = np.load(npy_path, mmap_mode="r")
+                return cls(matrix, [tuple(x) for x in meta["labels"]], HashingVectorizer(dim))
+        except (OSError, ValueError, KeyError):
+            pass
+
+        resolver = cls.from_ontology(ontology, dim)
+        try:
+            tmp = f"{npy_path}.tmp.npy"
+            np.save(tmp, resolver.matrix)
+            os.replace(tmp, npy_path)
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "ontology_sha256": digest,
+                    "dim": dim,
+                    "labels": [[t, c] for t, c in zip(resolver.terms, resolver.categories)],
+                }, f)
+        except OSError:
+            pass  # read-only checkout: keep the in-memory matrix
+        return resolver
+
+    # ---- queries ----
+
+    def _rank(self, scores: np.ndarray, k: int, cutoff: float) -> List[Tuple[str, float]]:
+        order = np.argsort(-scores, kind="stable")
+        out: List[Tuple[str, float]] = []
+        seen = set()
+        for tid in order:
+            score = float(scores[tid])
+            if score < cutoff or score <= 0:
+                break
+            cat = self.categories[tid]
+            if cat in seen:
+                continue
+            seen.add(cat)
+            out.append((cat, round(score, 4)))
+            if len(out) >= k:
+                break
+        return out
+
+    def top_k(self, term: str, k: int = 5, cutoff: float = 0.0) -> List[Tuple[str, float]]:
+        """Ranked (category, cosine) pairs for one term."""
+        q = self.vectorizer.transform([term])[0]
+        return self._rank(self.matrix @ q, k, cutoff)
+
+    def resolve_batch(self, terms: Sequence[str], cutoff: float = ONTOLOGY_EMBED_CUTOFF) -> Dict[str, Optional[str]]:
+        """Best category per term, all terms scored by a single matrix multiply."""
+        if not terms:
+            return {}
+        scores = self.matrix @ self.vectorizer.transform(list(terms)).T   # (n_terms_ontology, n_queries)
+        best = scores.argmax(axis=0)
+        return {
+            term: (self.categories[best[j]] if scores[best[j], j] >= cutoff else None)
+            for j, term in enumerate(terms)
+        }
@@ -0,0 +1,98 @@
+# agents/components/fuzzy_matcher.py
+from __future__ import annotations
+
+import os
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Set
+
+import numpy as np
+
+from .ontology_index import normalize_term
+
+ONTOLOGY_FUZZY_CUTOFF = float(os.getenv("ONTOLOGY_FUZZY_CUTOFF", "0.6"))
+
+
+@dataclass(frozen=True)
+class FuzzyCandidate:
+    category: str
+    term: str       # the ontology spelling that matched
+    score: float    # Dice similarity over character trigrams, 0..1
+
+
+def trigrams(term: str) -> Set[str]:
+    """Character trigrams of the normalized term, padded so word edges count."""
+    norm = normalize_term(term)
+    if not norm:
+        return set()
+    padded = f"  {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """
+    Inverted index from trigram → ontology term ids, stored as NumPy arrays.
+
+    A lookup concatenates the posting lists of the query's trigrams and counts them
+    with one `bincount`, which gives the shared-trigram count for every term at
+    once; Dice similarity and the cutoff are then vectorized over all terms.
+    """
+
+    def __init__(self, terms: Mapping[str, str]):
+        self._terms: List[str] = []
+        self._categories: List[str] = []
+        sizes: List[int] = []
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for term, category in terms.items():
+            grams = trigrams(term)
+            if not grams:
+                continue
+            tid = len(self._terms)
+            self._terms.append(normalize_term(term))
+            self._categories.append(category)
+            sizes.append(len(grams))
+            for g in grams:
+                postings[g].append(tid)
+        self._sizes = np.asarray(sizes, dtype=np.float32)
+        self._postings = {g: np.asarray(ids, dtype=np.int32) for g, ids in postings.items()}
+
+    @classmethod
+    def from_ontology(cls, ontology: Mapping[str, Any]) -> "TrigramIndex":
+        terms: Dict[str, str] = {}
+        for logical, cfg in ontology.items():
+            terms.setdefault(logical, logical)
+            for syn in (cfg or {}).get("synonyms", []) or []:
+                terms.setdefault(syn, logical)
+        return cls(terms)
+
+    def match(self, term: str, k: int = 5, cutoff: float = 0.0) -> List[FuzzyCandidate]:
+        """Top-k categories by best trigram similarity, highest first."""
+        grams = trigrams(term)
+        if not grams:
+            return []
+        lists = [self._postings[g] for g in grams if g in self._postings]
+        if not lists:
+            return []
+        shared = np.bincount(np.concatenate(lists), minlength=len(self._terms))
+        scores = 2.0 * shared / (len(grams) + self._sizes)
+
+        idx = np.flatnonzero((shared > 0) & (scores >= cutoff))
+        order = idx[np.argsort(-scores[idx], kind="stable")]
+        out: List[FuzzyCandidate] = []
+        seen: Set[str] = set()
+        for tid in order:
+            cat = self._categories[tid]
+            if cat in seen:
+                continue
+            seen.add(cat)
+            out.append(FuzzyCandidate(cat, self._terms[tid], round(float(scores[tid]), 4)))
+            if len(out) >= k:
+                break
+        return out
+
+    def best(self, term: str, cutoff: float = ONTOLOGY_FUZZY_CUTOFF) -> Optional[FuzzyCandidate]:
+        hits = self.match(term, k=1, cutoff=cutoff)
+        return hits[0] if hits else None
+
+    def __len__(self) -> int:
+        return len(self._terms)
@@ -0,0 +1,96 @@
+# agents/components/ontology_index.py
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set
+
+_PUNCT = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_term(term: str) -> str:
+    """Casefold, turn punctuation/underscores into spaces and collapse whitespace."""
+    return " ".join(_PUNCT.sub(" ", (term or "").casefold()).split())
+
+
+def _singular(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith(("ches", "shes", "sses", "xes", "zes")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def _plural(word: str) -> str:
+    if word.endswith("y") and len(word) > 2 and word[-2] not in "aeiou":
+        return word[:-1] + "ies"
+    if word.endswith(("s", "x", "z", "ch", "sh")):
+        return word + "es"
+    return word + "s"
+
+
+def term_variants(term: str) -> Set[str]:
+    """
+    Normalized spellings that should resolve to the same category: the term itself,
+    its head noun singular/plural, and the same with spaces removed ("coffee shop" →
+    "coffeeshop").
+    """
+    norm = normalize_term(term)
+    if not norm:
+        return set()
+    words = norm.split(" ")
+    head = words[-1]
+    forms = {norm}
+    for alt in (_singular(head), _plural(_singular(head))):
+        forms.add(" ".join(words[:-1] + [alt]))
+    return forms | {f.replace(" ", "") for f in forms}
+
+
+class OntologyIndex:
+    """
+    Every logical key and synonym, expanded through `term_variants`, mapped to its
+    logical category. Lookups are a normalization plus one dict probe.
+    """
+
+    def __init__(self, lookup: Dict[str, str], ambiguous: Optional[Dict[str, List[str]]] = None):
+        self._lookup = lookup
+        self.ambiguous = ambiguous or {}
+
+    @classmethod
+    def build(cls, ontology: Mapping[str, Any]) -> "OntologyIndex":
+        lookup: Dict[str, str] = {}
+        ambiguous: Dict[str, List[str]] = {}
+
+        def add(terms: Iterable[str], logical: str) -> None:
+            for term in terms:
+                for v in term_variants(term):
+                    owner = lookup.setdefault(v, logical)
+                    if owner != logical:
+                        ambiguous.setdefault(v, [owner]).append(logical)
+
+        # logical keys first so they win over another category's synonym
+        for logical in ontology:
+            add([logical], logical)
+        for logical, cfg in ontology.items():
+            add((cfg or {}).get("synonyms", []) or [], logical)
+        return cls(lookup, ambiguous)
+
+    def lookup(self, term: str) -> Optional[str]:
+        norm = normalize_term(term)
+        if not norm:
+            return None
+        hit = self._lookup.get(norm)
+        if hit is not None:
+            return hit
+        for v in term_variants(norm):
+            hit = self._lookup.get(v)
+            if hit is not None:
+                return hit
+        return None
+
+    def terms(self) -> Dict[str, str]:
+        return dict(self._lookup)
+
+    def __len__(self) -> int:
+        return len(self._lookup)
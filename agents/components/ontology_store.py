@@ -0,0 +1,209 @@
+# agents/components/ontology_store.py
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import yaml
+
+from .embedding_resolver import EmbeddingResolver
+from .fuzzy_matcher import TrigramIndex
+from .ontology_index import OntologyIndex
+
+logger = logging.getLogger(__name__)
+
+ONTOLOGY_RELOAD_INTERVAL_S = float(os.getenv("ONTOLOGY_RELOAD_INTERVAL_S", "2.0"))
+
+# bump when the pickled layout of OntologyIndex / TrigramIndex changes
+_SNAPSHOT_FORMAT = 1
+
+
+@dataclass(frozen=True)
+class OntologySnapshot:
+    """One immutable, fully-built ontology version. Resolvers hold a reference for a whole request."""
+    version: str                # sha256 of the YAML bytes
+    mtime_ns: int
+    ontology: Dict[str, Any]
+    index: OntologyIndex
+    fuzzy: TrigramIndex
+    embeddings: EmbeddingResolver
+    loaded_at: float
+    from_snapshot: bool         # True when the compiled pickle was reused
+
+
+def snapshot_path(ontology_file: str) -> str:
+    return f"{os.path.splitext(ontology_file)[0]}.snapshot.pkl"
+
+
+def _read_pickle(path: str, digest: str, mtime_ns: int) -> Optional[dict]:
+    try:
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if (
+        not isinstance(data, dict)
+        or data.get("format") != _SNAPSHOT_FORMAT
+        or data.get("sha256") != digest
+        or data.get("mtime_ns") != mtime_ns
+    ):
+        return None
+    return data
+
+
+def _write_pickle(path: str, data: dict) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.debug("ontology snapshot not written (%s)", e)
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def load_snapshot(ontology_file: str, pickle_path: Optional[str] = None) -> OntologySnapshot:
+    """
+    Build an `OntologySnapshot` for `ontology_file`, reusing the compiled pickle
+    when both the YAML's mtime and sha256 match the ones it was built from.
+    """
+    pickle_path = pickle_path or snapshot_path(ontology_file)
+    with open(ontology_file, "rb") as f:
+        raw = f.read()
+        mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+    digest = hashlib.sha256(raw).hexdigest()
+
+    data = _read_pickle(pickle_path, digest, mtime_ns)
+    reused = data is not None
+    if data is None:
+        ontology = yaml.safe_load(raw) or {}
+        data = {
+            "format": _SNAPSHOT_FORMAT,
+            "sha256": digest,
+            "mtime_ns": mtime_ns,
+            "ontology": ontology,
+            "index": OntologyIndex.build(ontology),
+            "fuzzy": TrigramIndex.from_ontology(ontology),
+        }
+        _write_pickle(pickle_path, data)
+
+    return OntologySnapshot(
+        version=digest,
+        mtime_ns=mtime_ns,
+        ontology=data["ontology"],
+        index=data["index"],
+        fuzzy=data["fuzzy"],
+        embeddings=EmbeddingResolver.load_or_build(ontology_file, data["ontology"], digest=digest),
+        loaded_at=time.time(),
+        from_snapshot=reused,
+    )
+
+
+class OntologyStore:
+    """
+    Lazily loaded, hot-reloadable ontology.
+
+    The first `current()` call loads synchronously. After that, at most once per
+    `check_interval_s`, the YAML is stat()ed; a changed mtime/size starts a single
+    background reload, and callers keep getting the previous snapshot until the
+    new one is fully built and swapped in with one reference assignment.
+    """
+
+    def __init__(
+        self,
+        ontology_file: str,
+        pickle_path: Optional[str] = None,
+        check_interval_s: float = ONTOLOGY_RELOAD_INTERVAL_S,
+    ):
+        self.ontology_file = ontology_file
+        self.pickle_path = pickle_path or snapshot_path(ontology_file)
+        self.check_interval_s = check_interval_s
+        self._snap: Optional[OntologySnapshot] = None
+        self._stat: Optional[tuple] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self._reloading: Optional[threading.Thread] = None
+        self._reloads = 0
+        self._reload_errors = 0
+
+    def _file_stat(self) -> Optional[tuple]:
+        try:
+            st = os.stat(self.ontology_file)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _load(self) -> OntologySnapshot:
+        stat = self._file_stat()
+        snap = load_snapshot(self.ontology_file, self.pickle_path)
+        self._snap, self._stat = snap, stat
+        return snap
+
+    def current(self) -> OntologySnapshot:
+        snap = self._snap
+        if snap is None:
+            with self._lock:
+                if self._snap is None:
+                    self._load()
+                    self._next_check = time.monotonic() + self.check_interval_s
+                return self._snap
+        if self.check_interval_s >= 0 and time.monotonic() >= self._next_check:
+            self._maybe_reload()
+        return snap
+
+    def _maybe_reload(self) -> None:
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval_s
+            if self._reloading is not None and self._reloading.is_alive():
+                return
+            stat = self._file_stat()
+            if stat is None or stat == self._stat:
+                return
+            self._reloading = threading.Thread(target=self._reload, name="ontology-reload", daemon=True)
+            self._reloading.start()
+
+    def _reload(self) -> None:
+        old = self._snap
+        try:
+            snap = self._load()
+        except Exception:
+            # keep serving the last good version; a broken edit must not take resolution down
+            self._reload_errors += 1
+            self._stat = self._file_stat()
+            logger.exception("ontology reload failed; keeping version %s", old.version[:12] if old else None)
+            return
+        self._reloads += 1
+        if old is None or snap.version != old.version:
+            logger.info("ontology reloaded: %s -> %s", old.version[:12] if old else None, snap.version[:12])
+
+    def reload(self) -> OntologySnapshot:
+        """Force a synchronous reload (tests, admin endpoints)."""
+        with self._lock:
+            self._load()
+            self._reloads += 1
+            return self._snap
+
+    def wait_for_reload(self, timeout: Optional[float] = None) -> None:
+        t = self._reloading
+        if t is not None:
+            t.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        snap = self._snap
+        return {
+            "loaded": snap is not None,
+            "version": snap.version if snap else None,
+            "from_snapshot": snap.from_snapshot if snap else None,
+            "loaded_at": snap.loaded_at if snap else None,
+            "reloads": self._reloads,
+            "reload_errors": self._reload_errors,
+        }
@@ -0,0 +1,113 @@
+# agents/components/single_flight.py
+from __future__ import annotations
+
+import asyncio
+import copy
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _LeaderAbandoned(Exception):
+    """Set on the shared future when the leader was cancelled; followers re-join instead of failing."""
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key: the first caller (the leader) does
+    the work and every caller that arrives while it is running waits on the same
+    future. Followers get a deep copy so no two callers share a mutable result.
+
+    Sync and async callers share one table of concurrent.futures.Future objects,
+    so a request on the event loop can join work started on a worker thread and
+    vice versa.
+
+    Errors reach every follower, but a cancelled leader (client disconnect,
+    request timeout) does not: its entry is dropped and one waiting follower
+    takes over as the new leader.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.leaders = 0
+        self.coalesced = 0
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        with self._lock:
+            self.calls += 1
+            fut = self._inflight.get(key)
+            if fut is not None:
+                self.coalesced += 1
+                return fut, False
+            fut = self._inflight[key] = Future()
+            self.leaders += 1
+            return fut, True
+
+    def _finish(self, key: str, fut: Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is fut:
+                del self._inflight[key]
+
+    def _abandon(self, key: str, fut: Future) -> None:
+        self._finish(key, fut)          # first, so the follower that re-joins becomes leader
+        fut.set_exception(_LeaderAbandoned())
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        while True:
+            fut, leader = self._join(key)
+            if leader:
+                break
+            try:
+                return copy.deepcopy(fut.result())
+            except _LeaderAbandoned:
+                continue
+        try:
+            result = fn()
+        except Exception as e:
+            fut.set_exception(e)
+            raise
+        except BaseException:
+            self._abandon(key, fut)
+            raise
+        else:
+            fut.set_result(result)
+            return copy.deepcopy(result)
+        finally:
+            self._finish(key, fut)
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        while True:
+            fut, leader = self._join(key)
+            if leader:
+                break
+            try:
+                return copy.deepcopy(await asyncio.wrap_future(fut))
+            except _LeaderAbandoned:
+                continue
+        try:
+            result = await fn()
+        except Exception as e:
+            fut.set_exception(e)
+            raise
+        except BaseException:           # CancelledError: this caller went away, the work didn't fail
+            self._abandon(key, fut)
+            raise
+        else:
+            fut.set_result(result)
+            return copy.deepcopy(result)
+        finally:
+            self._finish(key, fut)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "coalescing_ratio": (self.coalesced / self.calls) if self.calls else 0.0,
+                "in_flight": len(self._inflight),
+            }
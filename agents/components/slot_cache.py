@@ -0,0 +1,197 @@
+# agents/components/slot_cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .slot_schema import SlotExtraction
+
+SLOT_CACHE_PATH = os.getenv("SLOT_CACHE_PATH", ".cache/slot_extraction.sqlite")
+SLOT_CACHE_SIZE = int(os.getenv("SLOT_CACHE_SIZE", "2048"))
+SLOT_CACHE_TTL = float(os.getenv("SLOT_CACHE_TTL", str(7 * 24 * 3600)))
+
+
+# --------------------------
+# Keys
+# --------------------------
+
+_WS = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """Casefold and collapse whitespace so trivially different spellings share a key."""
+    return _WS.sub(" ", (text or "").strip()).casefold()
+
+
+def _sha(payload: str) -> str:
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def fingerprint(model: str, system_prompt: str, schema: Dict[str, Any]) -> str:
+    """Identity of the extractor configuration; any change invalidates old entries."""
+    return _sha(json.dumps(
+        [model, _sha(system_prompt), _sha(json.dumps(schema, sort_keys=True))],
+        separators=(",", ":"),
+    ))
+
+
+def cache_key(user_query: str, extractor_fingerprint: str) -> str:
+    return _sha(f"{extractor_fingerprint}\x1f{normalize_query(user_query)}")
+
+
+# --------------------------
+# Two-tier cache
+# --------------------------
+
+class SlotCache:
+    """
+    Memory LRU in front of an on-disk SQLite store.
+
+    Values are stored as JSON and a fresh SlotExtraction is returned on every hit,
+    so callers may mutate the result without corrupting the cache.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = SLOT_CACHE_PATH,
+        *,
+        maxsize: int = SLOT_CACHE_SIZE,
+        ttl: float = SLOT_CACHE_TTL,
+    ):
+        self.path = path or None
+        self.maxsize = max(0, maxsize)
+        self.ttl = ttl
+        self._mem: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired = 0
+        if self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS slot_cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    # ---- lookups ----
+
+    def get(self, key: str) -> Optional[SlotExtraction]:
+        now = time.time()
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                expires_at, raw = entry
+                if expires_at > now:
+                    self._mem.move_to_end(key)
+                    self.memory_hits += 1
+                    return SlotExtraction.model_validate_json(raw)
+                del self._mem[key]
+                self.expired += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM slot_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    raw, expires_at = row
+                    if expires_at > now:
+                        self._remember(key, expires_at, raw)
+                        self.disk_hits += 1
+                        return SlotExtraction.model_validate_json(raw)
+                    self._db.execute("DELETE FROM slot_cache WHERE key = ?", (key,))
+                    self.expired += 1
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, slots: SlotExtraction, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        raw = slots.model_dump_json()
+        with self._lock:
+            self._remember(key, expires_at, raw)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO slot_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, raw, expires_at),
+                )
+
+    def _remember(self, key: str, expires_at: float, raw: str) -> None:
+        if self.maxsize == 0:
+            return
+        self._mem[key] = (expires_at, raw)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.maxsize:
+            self._mem.popitem(last=False)
+
+    # ---- maintenance ----
+
+    def purge_expired(self) -> int:
+        """Drop expired entries from both tiers; returns the number of disk rows removed."""
+        now = time.time()
+        with self._lock:
+            for k in [k for k, (exp, _) in self._mem.items() if exp <= now]:
+                del self._mem[k]
+            if self._db is None:
+                return 0
+            cur = self._db.execute("DELETE FROM slot_cache WHERE expires_at <= ?", (now,))
+            return cur.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM slot_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            total = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "hit_rate": (hits / total) if total else 0.0,
+                "memory_size": len(self._mem),
+                "maxsize": self.maxsize,
+                "path": self.path,
+            }
+
+
+_cache: Optional[SlotCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_slot_cache() -> SlotCache:
+    """Process-wide cache instance, created on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SlotCache()
+    return _cache
+
+
+def set_slot_cache(cache: Optional[SlotCache]) -> None:
+    """Swap the process-wide cache (tests, notebooks, or a custom path)."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
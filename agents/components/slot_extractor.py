@@ -1,11 +1,30 @@
 # backend/services/slot_extractor.py
 import os, json
+import asyncio
+import logging
+import threading
+import weakref
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+import httpx
 from pydantic import ValidationError
 from google import genai
 from google.genai.types import HttpOptions
 from .slot_schema import SlotExtraction
+from .slot_cache import cache_key, fingerprint, get_slot_cache
+from .slot_rules import RuleExtractor
+from .slot_hedging import SLOT_DEADLINE_S, Hedger, route_model
+from .concurrency_limiter import AdaptiveLimiter, acall_with_retries, call_with_retries
+from shared.clients.registry import REGISTRY
+
+logger = logging.getLogger(__name__)
 
 MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+SLOT_RULES_MIN_CONFIDENCE = float(os.getenv("SLOT_RULES_MIN_CONFIDENCE", "0.9"))
+GENAI_MAX_CONCURRENCY = int(os.getenv("GENAI_MAX_CONCURRENCY", "16"))
+GENAI_KEEPALIVE_S = float(os.getenv("GENAI_KEEPALIVE_S", "60"))
+GENAI_RETRIES = int(os.getenv("GENAI_RETRIES", "3"))
+GENAI_LIMITER_STATE_FILE = os.getenv("GENAI_LIMITER_STATE_FILE", "")  # set to share the limit across workers
 
 # Supported JSON Schema subset (no $schema/$id/$defs)
 SLOT_EXTRACTION_SCHEMA = {
@@ -65,27 +84,239 @@ Example:
  "filters":[{"field":"income","op":"gt","value":"70000"},{"field":"distance","op":"within_km","value":"1"}]}
 """
 
+# --------------------------
+# Shared client
+# --------------------------
+
+def _http_options() -> HttpOptions:
+    # One pooled httpx client per direction; connections stay warm between requests
+    limits = dict(
+        max_connections=max(GENAI_MAX_CONCURRENCY, 1) * 2,
+        max_keepalive_connections=max(GENAI_MAX_CONCURRENCY, 1),
+        keepalive_expiry=GENAI_KEEPALIVE_S,
+    )
+    return HttpOptions(
+        client_args={"limits": httpx.Limits(**limits)},
+        async_client_args={"limits": httpx.Limits(**limits)},
+    )
+
 def _client() -> genai.Client:
+    """Process-wide genai client from the shared registry, reused by the sync and async paths."""
     # Vertex mode picked up from env (GOOGLE_GENAI_USE_VERTEXAI / PROJECT / LOCATION)
-    return genai.Client(
-        vertexai=True,
-        project=os.environ["GOOGLE_CLOUD_PROJECT"],
-        location=os.environ.get("GOOGLE_CLOUD_LOCATION", "us-central1"),
+    project = os.environ["GOOGLE_CLOUD_PROJECT"]
+    location = os.environ.get("GOOGLE_CLOUD_LOCATION", "us-central1")
+    return REGISTRY.get(
+        "genai",
+        lambda: genai.Client(vertexai=True, project=project, location=location, http_options=_http_options()),
+        project=project,
+        location=location,
     )
 
-def extract_slots_genai(user_query: str) -> SlotExtraction:
-    client = _client()
-    resp = client.models.generate_content(
-        model=MODEL,
-        contents=[SYSTEM_PROMPT, user_query],
-        config={
-            "response_mime_type": "application/json",
-            "response_schema": SLOT_EXTRACTION_SCHEMA,
-        },
-    )
+def close_client() -> None:
+    """Drop the shared client so the next call builds a fresh one (e.g. after env changes)."""
+    REGISTRY.close("genai")
+
+# asyncio primitives are bound to a loop, so keep one semaphore per running loop
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+def _semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    sem = _semaphores.get(loop)
+    if sem is None:
+        sem = _semaphores[loop] = asyncio.Semaphore(max(GENAI_MAX_CONCURRENCY, 1))
+    return sem
+
+# --------------------------
+# Model call
+# --------------------------
 
+def _extractor_fingerprint(model: str = MODEL) -> str:
+    return fingerprint(model, SYSTEM_PROMPT, SLOT_EXTRACTION_SCHEMA)
+
+_GENERATE_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": SLOT_EXTRACTION_SCHEMA,
+}
+
+def _parse_response(resp: Any) -> SlotExtraction:
     data = resp.parsed if hasattr(resp, "parsed") and resp.parsed is not None else json.loads(resp.text)
     try:
         return SlotExtraction.model_validate(data)
     except ValidationError as e:
         raise RuntimeError(f"Schema validation failed: {e}\nJSON: {json.dumps(data, indent=2)}")
+
+# Adaptive cap shared by the sync and async paths (and, with a state file, by every worker on the host)
+_LIMITER = AdaptiveLimiter(
+    initial=float(os.getenv("GENAI_LIMIT_INITIAL", "8")),
+    min_limit=float(os.getenv("GENAI_LIMIT_MIN", "1")),
+    max_limit=float(os.getenv("GENAI_LIMIT_MAX", str(max(GENAI_MAX_CONCURRENCY, 1)))),
+    state_file=GENAI_LIMITER_STATE_FILE or None,
+)
+
+def _log_if_queued() -> None:
+    snap = _LIMITER.snapshot()
+    if snap["last_wait_ms"] >= 100:
+        logger.info("genai call queued %.0fms (limiter %s)", snap["last_wait_ms"], snap)
+
+def _generate_slots(user_query: str, model: str = MODEL) -> SlotExtraction:
+    def call():
+        with _LIMITER.slot():
+            _log_if_queued()
+            return _client().models.generate_content(
+                model=model,
+                contents=[SYSTEM_PROMPT, user_query],
+                config=_GENERATE_CONFIG,
+            )
+    return _parse_response(call_with_retries(call, retries=GENAI_RETRIES))
+
+async def _agenerate_slots(user_query: str, model: str = MODEL) -> SlotExtraction:
+    async def call():
+        async with _semaphore(), _LIMITER.aslot():
+            _log_if_queued()
+            return await _client().aio.models.generate_content(
+                model=model,
+                contents=[SYSTEM_PROMPT, user_query],
+                config=_GENERATE_CONFIG,
+            )
+    return _parse_response(await acall_with_retries(call, retries=GENAI_RETRIES))
+
+def limiter_stats() -> Dict[str, Any]:
+    """Current adaptive limit, in-flight count and queue depth for genai calls."""
+    return _LIMITER.snapshot()
+
+# Deadline-bound calls go through the hedger (model routing + hedged second request)
+_HEDGER = Hedger(_agenerate_slots, MODEL)
+
+def _deadline_budget(deadline_s: Optional[float]) -> Optional[float]:
+    budget = SLOT_DEADLINE_S if deadline_s is None else deadline_s
+    return budget if budget and budget > 0 else None
+
+async def _acall_model(user_query: str, deadline_s: Optional[float]) -> Tuple[SlotExtraction, str]:
+    """Returns the slots and the model that served them."""
+    budget = _deadline_budget(deadline_s)
+    if budget is None:
+        return await _agenerate_slots(user_query), MODEL
+    result = await _HEDGER.run(user_query, deadline_s=budget)
+    logger.info(
+        "slot extraction model=%s route=%s winner=%s hedged=%s %.0fms",
+        result.model, result.route, result.winner, result.hedged, result.elapsed_s * 1000,
+    )
+    return result.slots, result.model
+
+def hedging_stats() -> Dict[str, int]:
+    """Routing decisions and hedge winners for deadline-bound calls in this process."""
+    return _HEDGER.stats()
+
+# --------------------------
+# Cached extraction
+# --------------------------
+
+def _extract_genai_traced(user_query: str, use_cache: bool) -> Tuple[SlotExtraction, str]:
+    if not use_cache:
+        return _generate_slots(user_query), "model"
+
+    cache = get_slot_cache()
+    key = cache_key(user_query, _extractor_fingerprint())
+    hit = cache.get(key)
+    if hit is not None:
+        return hit, "cache"
+    slots = _generate_slots(user_query)
+    cache.put(key, slots)
+    return slots, "model"
+
+async def _aextract_genai_traced(
+    user_query: str, use_cache: bool, deadline_s: Optional[float] = None
+) -> Tuple[SlotExtraction, str]:
+    if not use_cache:
+        return (await _acall_model(user_query, deadline_s))[0], "model"
+
+    # Results are cached per serving model, so a fast-model answer is never served as the primary's.
+    # A deadline-bound call may use either: the primary's answer first, then the routed model's.
+    cache = get_slot_cache()
+    models = [MODEL]
+    if _deadline_budget(deadline_s) is not None:
+        routed, _ = route_model(user_query, MODEL, _HEDGER.fast_model)
+        if routed != MODEL:
+            models.append(routed)
+    for model in models:
+        hit = cache.get(cache_key(user_query, _extractor_fingerprint(model)))
+        if hit is not None:
+            return hit, "cache"
+    slots, served_by = await _acall_model(user_query, deadline_s)
+    cache.put(cache_key(user_query, _extractor_fingerprint(served_by)), slots)
+    return slots, "model"
+
+def extract_slots_genai(user_query: str, *, use_cache: bool = True) -> SlotExtraction:
+    """
+    Extract slots with Gemini, answering repeated questions from the slot cache.
+    Pass use_cache=False to force a fresh model call (the result is not stored either).
+    """
+    return _extract_genai_traced(user_query, use_cache)[0]
+
+async def aextract_slots_genai(
+    user_query: str, *, use_cache: bool = True, deadline_s: Optional[float] = None
+) -> SlotExtraction:
+    """
+    Async twin of extract_slots_genai; at most GENAI_MAX_CONCURRENCY calls in flight per loop.
+    With a deadline (argument or SLOT_DEADLINE_S) the call is routed and hedged.
+    """
+    return (await _aextract_genai_traced(user_query, use_cache, deadline_s))[0]
+
+# --------------------------
+# Rule-based fast path
+# --------------------------
+
+_RULES = RuleExtractor(SLOT_EXTRACTION_SCHEMA)
+_paths: Counter = Counter()
+_paths_lock = threading.Lock()
+
+def _record_path(path: str) -> None:
+    with _paths_lock:
+        _paths[path] += 1
+
+def _rules_match(user_query: str, use_rules: bool) -> Optional[SlotExtraction]:
+    match = _RULES.extract(user_query) if use_rules else None
+    if match is not None and match.confidence >= SLOT_RULES_MIN_CONFIDENCE:
+        return match.slots
+    return None
+
+def extract_slots_traced(
+    user_query: str, *, use_cache: bool = True, use_rules: bool = True
+) -> Tuple[SlotExtraction, str]:
+    """
+    Try the local grammar first and fall back to Gemini when it is not confident.
+    Returns (slots, path) where path is one of "rules", "cache" or "model".
+    """
+    slots = _rules_match(user_query, use_rules)
+    if slots is not None:
+        path = "rules"
+    else:
+        slots, path = _extract_genai_traced(user_query, use_cache)
+    _record_path(path)
+    return slots, path
+
+async def aextract_slots_traced(
+    user_query: str, *, use_cache: bool = True, use_rules: bool = True, deadline_s: Optional[float] = None
+) -> Tuple[SlotExtraction, str]:
+    slots = _rules_match(user_query, use_rules)
+    if slots is not None:
+        path = "rules"
+    else:
+        slots, path = await _aextract_genai_traced(user_query, use_cache, deadline_s)
+    _record_path(path)
+    return slots, path
+
+def extract_slots(user_query: str, *, use_cache: bool = True, use_rules: bool = True) -> SlotExtraction:
+    return extract_slots_traced(user_query, use_cache=use_cache, use_rules=use_rules)[0]
+
+async def aextract_slots(
+    user_query: str, *, use_cache: bool = True, use_rules: bool = True, deadline_s: Optional[float] = None
+) -> SlotExtraction:
+    return (await aextract_slots_traced(
+        user_query, use_cache=use_cache, use_rules=use_rules, deadline_s=deadline_s
+    ))[0]
+
+def extraction_path_stats() -> Dict[str, int]:
+    """How many requests each path (rules / cache / model) has served in this process."""
+    with _paths_lock:
+        return dict(_paths)
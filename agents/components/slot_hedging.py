@@ -0,0 +1,178 @@
+# agents/components/slot_hedging.py
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from .concurrency_limiter import DEADLINE_CANCEL_MSG
+from .slot_schema import SlotExtraction
+
+GEMINI_FAST_MODEL = os.getenv("GEMINI_FAST_MODEL", "gemini-2.5-flash-lite")
+SLOT_DEADLINE_S = float(os.getenv("SLOT_DEADLINE_S", "0"))          # 0 = no deadline / no hedging
+SLOT_HEDGE_PERCENTILE = float(os.getenv("SLOT_HEDGE_PERCENTILE", "95"))
+SLOT_HEDGE_DEFAULT_S = float(os.getenv("SLOT_HEDGE_DEFAULT_S", "1.5"))
+SLOT_HEDGE_MIN_SAMPLES = int(os.getenv("SLOT_HEDGE_MIN_SAMPLES", "20"))
+SLOT_FAST_MAX_WORDS = int(os.getenv("SLOT_FAST_MAX_WORDS", "12"))
+
+Generate = Callable[[str, str], Awaitable[SlotExtraction]]
+
+
+@dataclass
+class HedgedExtraction:
+    slots: SlotExtraction
+    model: str
+    route: str          # why this model was picked
+    winner: str         # "primary" or "hedge"
+    hedged: bool        # whether a second request was sent
+    elapsed_s: float
+
+
+# --------------------------
+# Latency tracking
+# --------------------------
+
+class LatencyTracker:
+    """Rolling window of successful call latencies for one model."""
+
+    def __init__(self, window: int = 512):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float, min_samples: int = SLOT_HEDGE_MIN_SAMPLES) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < max(min_samples, 1):
+                return None
+            vals = sorted(self._samples)
+        idx = min(len(vals) - 1, max(0, math.ceil(pct / 100.0 * len(vals)) - 1))
+        return vals[idx]
+
+
+# --------------------------
+# Model routing
+# --------------------------
+
+# Comparisons, conjunctions and negations mean the question needs the full model
+_COMPLEX = re.compile(
+    r"\b(?:and|or|but|except|without|no|not|between|compare|versus|vs|rank|top|per)\b|[<>=]|\d",
+    re.I,
+)
+
+
+def route_model(user_query: str, primary_model: str, fast_model: str = GEMINI_FAST_MODEL) -> Tuple[str, str]:
+    """Pick the model for a query; returns (model, reason)."""
+    if not fast_model or fast_model == primary_model:
+        return primary_model, "default"
+    words = len((user_query or "").split())
+    if words > SLOT_FAST_MAX_WORDS:
+        return primary_model, "long"
+    if _COMPLEX.search(user_query or ""):
+        return primary_model, "complex"
+    return fast_model, "short"
+
+
+# --------------------------
+# Hedged execution
+# --------------------------
+
+class Hedger:
+    """
+    Runs one model call per request and, if it has not returned by the model's
+    observed latency percentile, sends a second identical call. The first valid
+    SlotExtraction wins and the loser is cancelled. Everything must finish inside
+    the request deadline.
+    """
+
+    def __init__(self, generate: Generate, primary_model: str, fast_model: str = GEMINI_FAST_MODEL):
+        self.generate = generate
+        self.primary_model = primary_model
+        self.fast_model = fast_model
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+
+    def tracker(self, model: str) -> LatencyTracker:
+        with self._lock:
+            t = self._trackers.get(model)
+            if t is None:
+                t = self._trackers[model] = LatencyTracker()
+            return t
+
+    def hedge_delay(self, model: str, deadline_s: float, percentile: float = SLOT_HEDGE_PERCENTILE) -> float:
+        delay = self.tracker(model).percentile(percentile)
+        if delay is None:
+            delay = SLOT_HEDGE_DEFAULT_S
+        # leave the hedge at least half of the budget
+        return min(delay, deadline_s / 2)
+
+    async def run(
+        self,
+        user_query: str,
+        *,
+        deadline_s: float,
+        percentile: float = SLOT_HEDGE_PERCENTILE,
+    ) -> HedgedExtraction:
+        model, route = route_model(user_query, self.primary_model, self.fast_model)
+        started = time.perf_counter()
+        deadline = started + deadline_s
+
+        def remaining() -> float:
+            return max(0.0, deadline - time.perf_counter())
+
+        tasks: Dict[asyncio.Task, str] = {asyncio.ensure_future(self.generate(user_query, model)): "primary"}
+        hedge_at = started + self.hedge_delay(model, deadline_s, percentile)
+        hedge_sent = False
+        last_error: Optional[BaseException] = None
+        deadline_hit = False
+
+        try:
+            while remaining() > 0 and (tasks or not hedge_sent):
+                if tasks:
+                    wait_for = remaining() if hedge_sent else min(remaining(), max(0.0, hedge_at - time.perf_counter()))
+                    done, _ = await asyncio.wait(tasks, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        label = tasks.pop(task)
+                        if task.exception() is not None:
+                            last_error = task.exception()
+                            continue
+                        elapsed = time.perf_counter() - started
+                        self.tracker(model).record(elapsed)
+                        self._record(route, label)
+                        return HedgedExtraction(
+                            slots=task.result(), model=model, route=route, winner=label,
+                            hedged=hedge_sent, elapsed_s=elapsed,
+                        )
+                # hedge on schedule, or straight away if the primary already failed
+                if not hedge_sent and (not tasks or time.perf_counter() >= hedge_at):
+                    tasks[asyncio.ensure_future(self.generate(user_query, model))] = "hedge"
+                    hedge_sent = True
+            deadline_hit = remaining() <= 0
+        finally:
+            # calls still running past the deadline are cancelled as such, so the limiter backs off;
+            # a hedge race loser is cancelled plainly
+            for task in tasks:
+                task.cancel(DEADLINE_CANCEL_MSG if deadline_hit else None)
+
+        self._record(route, "timeout" if remaining() <= 0 else "error")
+        if last_error is not None and remaining() > 0:
+            raise last_error
+        raise asyncio.TimeoutError(f"Slot extraction exceeded its {deadline_s:.2f}s deadline")
+
+    def _record(self, route: str, outcome: str) -> None:
+        with self._lock:
+            self._counts[f"route:{route}"] += 1
+            self._counts[f"winner:{outcome}"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
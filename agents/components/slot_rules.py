@@ -0,0 +1,177 @@
+# agents/components/slot_rules.py
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .slot_schema import Dimension, Filter, Metric, SlotExtraction
+
+@dataclass
+class RuleMatch:
+    slots: SlotExtraction
+    confidence: float
+    rule: str
+
+
+# --------------------------
+# Vocabulary
+# --------------------------
+
+# Comparison phrases → schema operators (only kept if the schema allows them)
+_OP_WORDS: List[Tuple[str, str]] = [
+    (r">=|at least|no less than", "gte"),
+    (r"<=|at most|no more than", "lte"),
+    (r">|above|over|more than|greater than|higher than", "gt"),
+    (r"<|below|under|less than|lower than", "lt"),
+    (r"!=|not equal to", "neq"),
+    (r"=|==|equals?|of", "eq"),
+]
+
+_UNITS_TO_KM = {
+    "km": 1.0, "kms": 1.0, "kilometer": 1.0, "kilometers": 1.0, "kilometre": 1.0, "kilometres": 1.0,
+    "m": 0.001, "meter": 0.001, "meters": 0.001, "metre": 0.001, "metres": 0.001,
+    "mi": 1.609344, "mile": 1.609344, "miles": 1.609344,
+}
+
+_NUM = r"\$?\d[\d,]*(?:\.\d+)?\s*[km]?"
+_UNIT = r"(?:" + "|".join(sorted(map(re.escape, _UNITS_TO_KM), key=len, reverse=True)) + r")"
+_TERM = r"[a-z][a-z0-9 '&\-]*?"
+_PLACE = r"[a-z0-9][a-z0-9 ',.&\-]*?"
+_AREAS = r"(?:areas?|neighbou?rhoods?|zips?|zip codes?|tracts?|regions?|places?)"
+_LEAD = r"(?:(?:find|show(?: me)?|list|which|where are|what are|get)\s+)?(?:the\s+|all\s+)?"
+
+# Words that suggest a compound question the grammar does not model
+_AMBIGUOUS = re.compile(r"\b(?:or|but|except|between|and|with|without|not|near|nearest)\b")
+
+
+def _number(raw: str) -> str:
+    s = raw.replace("$", "").replace(",", "").strip().lower()
+    mult = 1
+    if s.endswith("k"):
+        s, mult = s[:-1], 1_000
+    elif s.endswith("m"):
+        s, mult = s[:-1], 1_000_000
+    v = float(s) * mult
+    return str(int(v)) if v == int(v) else str(v)
+
+
+def _km(raw: str, unit: str) -> str:
+    v = float(raw.replace(",", "")) * _UNITS_TO_KM[unit]
+    v = round(v, 6)
+    return str(int(v)) if v == int(v) else str(v)
+
+
+def _clean(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "").strip()).rstrip(" ?.!")
+
+
+def _term_penalty(*terms: str) -> float:
+    return 0.5 if any(_AMBIGUOUS.search(t.lower()) for t in terms) else 1.0
+
+
+_Built = Tuple[SlotExtraction, float]
+
+
+# --------------------------
+# Extractor
+# --------------------------
+
+class RuleExtractor:
+    """
+    Grammar for the head of the query distribution. Every rule must consume the whole
+    question; anything else is left to the model.
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        props = schema["properties"]
+        self.intents = set(props["intent"]["enum"])
+        self.ops = set(props["filters"]["items"]["properties"]["op"]["enum"])
+        self._op_patterns = [(re.compile(rf"^(?:{pat})$", re.I), op) for pat, op in _OP_WORDS if op in self.ops]
+        op_alt = "|".join(pat for pat, op in _OP_WORDS if op in self.ops)
+        self._rules: List[Tuple[str, str, "re.Pattern[str]", Callable[[Dict[str, str]], Optional[_Built]]]] = [
+            (
+                "gap", "gap",
+                re.compile(
+                    rf"{_LEAD}{_AREAS} (?:with|where) (?:the )?(?P<metric>{_TERM}) (?:is )?(?P<op>{op_alt}) ?"
+                    rf"(?P<value>{_NUM}) (?:and|but|with) (?:no|without(?: any)?) (?P<category>{_TERM})"
+                    rf"(?: within (?P<dist>\d+(?:\.\d+)?) ?(?P<unit>{_UNIT}))?",
+                    re.I,
+                ),
+                self._gap,
+            ),
+            (
+                "nearby", "nearby",
+                re.compile(
+                    rf"{_LEAD}(?P<category>{_TERM}) (?:within|in a radius of) (?P<dist>\d+(?:\.\d+)?) ?"
+                    rf"(?P<unit>{_UNIT}) (?:of|from|around) (?P<place>{_PLACE})",
+                    re.I,
+                ),
+                self._nearby,
+            ),
+            # no "top N": the schema has no slot for a limit, so those go to the model
+            (
+                "rank", "rank",
+                re.compile(rf"{_LEAD}{_AREAS} (?:ranked )?by (?:highest |most )?(?P<metric>{_TERM})", re.I),
+                self._rank,
+            ),
+        ]
+
+    def _op(self, word: str) -> Optional[str]:
+        for pat, op in self._op_patterns:
+            if pat.match(word):
+                return op
+        return None
+
+    def extract(self, user_query: str) -> Optional[RuleMatch]:
+        text = _clean(user_query)
+        if not text:
+            return None
+        for name, intent, pattern, build in self._rules:
+            if intent not in self.intents:
+                continue
+            m = pattern.fullmatch(text)
+            if m is None:
+                continue
+            groups = {k: (v if k == "place" else v.lower()) for k, v in m.groupdict().items() if v is not None}
+            built = build(groups)
+            if built is not None:
+                return RuleMatch(slots=built[0], confidence=built[1], rule=name)
+        return None
+
+    # ---- rule builders ----
+
+    def _distance(self, g: Dict[str, str]) -> List[Filter]:
+        if "dist" not in g or "within_km" not in self.ops:
+            return []
+        return [Filter(field="distance", op="within_km", value=_km(g["dist"], g["unit"]))]
+
+    def _gap(self, g: Dict[str, str]) -> Optional[_Built]:
+        op = self._op(g["op"])
+        if op is None:
+            return None
+        slots = SlotExtraction(
+            intent="gap",
+            target_category=g["category"],
+            dimensions=[Dimension(name="area")],
+            filters=[Filter(field=g["metric"], op=op, value=_number(g["value"]))] + self._distance(g),
+        )
+        return slots, _term_penalty(g["metric"], g["category"])
+
+    def _nearby(self, g: Dict[str, str]) -> Optional[_Built]:
+        if "eq" not in self.ops:
+            return None
+        slots = SlotExtraction(
+            intent="nearby",
+            target_category=g["category"],
+            filters=self._distance(g) + [Filter(field="place", op="eq", value=g["place"])],
+        )
+        return slots, _term_penalty(g["category"], g["place"])
+
+    def _rank(self, g: Dict[str, str]) -> Optional[_Built]:
+        slots = SlotExtraction(
+            intent="rank",
+            metrics=[Metric(name=g["metric"])],
+            dimensions=[Dimension(name="area")],
+        )
+        return slots, _term_penalty(g["metric"])
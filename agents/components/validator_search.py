@@ -1,4 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from functools import lru_cache
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
 from shared.clients.vertex_search_client import search_validate
+from .slot_schema import SlotExtraction
+
+VALIDATION_MAX_CONCURRENCY = int(os.getenv("VALIDATION_MAX_CONCURRENCY", "8"))
+VALIDATION_TIMEOUT_S = float(os.getenv("VALIDATION_TIMEOUT_S", "2.0"))
+
+CATEGORY_FIELDS = ("category", "amenity")
+PLACE_FIELDS = ("place", "city", "county", "zip", "area")
+
 
 def validate_slots(slots: dict, intent: str):
     return search_validate(slots, intent)
+
+
+# --------------------------
+# Batch validation
+# --------------------------
+
+@dataclass(frozen=True)
+class Lookup:
+    slot: str       # where the term came from, e.g. "target_category" or "filters[2].value"
+    kind: str       # "category" | "place"
+    term: str
+
+
+def lookups_for(slots: SlotExtraction) -> List[Lookup]:
+    out: List[Lookup] = []
+    if slots.target_category:
+        out.append(Lookup("target_category", "category", slots.target_category))
+    for i, f in enumerate(slots.filters):
+        if f.field in CATEGORY_FIELDS:
+            out.append(Lookup(f"filters[{i}].value", "category", f.value))
+        elif f.field in PLACE_FIELDS:
+            out.append(Lookup(f"filters[{i}].value", "place", f.value))
+    return out
+
+
+@lru_cache(maxsize=1)
+def _default_clients():
+    from shared.config.settings import settings
+    from shared.clients.category_search import CategorySearchClient
+    from shared.clients.gazetteer_search import GazetteerSearchClient
+    from shared.clients.search_cache import cached
+
+    return (
+        cached(CategorySearchClient(project_id=settings.PROJECT_ID, location=settings.SEARCH_LOCATION), "category"),
+        cached(GazetteerSearchClient(project_id=settings.PROJECT_ID, location=settings.SEARCH_LOCATION), "gazetteer"),
+    )
+
+
+async def _search(client, term: str) -> Dict[str, Any]:
+    # async clients are awaited directly; the current sync wrappers run on a worker thread
+    asearch = getattr(client, "asearch", None)
+    if asearch is not None:
+        return await asearch(term)
+    return await asyncio.to_thread(client.search, term)
+
+
+async def avalidate_slots(
+    slots: SlotExtraction,
+    *,
+    category_client=None,
+    gazetteer_client=None,
+    max_concurrency: int = VALIDATION_MAX_CONCURRENCY,
+    timeout_s: Optional[float] = VALIDATION_TIMEOUT_S,
+) -> Dict[str, Any]:
+    """
+    Validate every category and place term in `slots` with concurrent searches.
+
+    At most `max_concurrency` lookups run at once for this request, and each is
+    bounded by `timeout_s`, so the report arrives after roughly the slowest
+    single lookup. A lookup that times out or errors is reported but does not
+    fail validation; only a lookup that returns no results does.
+    """
+    if category_client is None or gazetteer_client is None:
+        default_cat, default_gaz = _default_clients()
+        category_client = category_client or default_cat
+        gazetteer_client = gazetteer_client or default_gaz
+
+    lookups = lookups_for(slots)
+    sem = asyncio.Semaphore(max(1, max_concurrency))
+    t0 = time.perf_counter()
+
+    async def one(lk: Lookup) -> Dict[str, Any]:
+        client = category_client if lk.kind == "category" else gazetteer_client
+        async with sem:
+            start = time.perf_counter()
+            detail: Dict[str, Any] = {"slot": lk.slot, "kind": lk.kind, "term": lk.term}
+            try:
+                res = await asyncio.wait_for(_search(client, lk.term), timeout_s)
+                results = (res or {}).get("results", [])
+                detail.update(status="ok" if results else "not_found", results=results)
+            except asyncio.TimeoutError:
+                detail.update(status="timeout", results=[])
+            except Exception as e:
+                detail.update(status="error", results=[], error=str(e))
+            detail["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            return detail
+
+    details = list(await asyncio.gather(*(one(lk) for lk in lookups)))
+    return {
+        "passed": all(d["status"] != "not_found" for d in details),
+        "degraded": any(d["status"] in ("timeout", "error") for d in details),
+        "details": details,
+        "elapsed_ms": round((time.perf_counter() - t0) * 1000, 1),
+    }
+
+
+def validate_slots_batch(slots: SlotExtraction, **kwargs) -> Dict[str, Any]:
+    """Sync wrapper around `avalidate_slots` for callers without an event loop."""
+    return asyncio.run(avalidate_slots(slots, **kwargs))
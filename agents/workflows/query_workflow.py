@@ -1,30 +1,111 @@
 # backend/agents/slot_agent.py
-import os, yaml
-from typing import Dict, Any, Optional
-from ..components.slot_extractor import extract_slots_genai
+import os
+import logging
+from typing import Dict, Any, Iterable, Optional
+from ..components.slot_schema import SlotExtraction
+from ..components.slot_extractor import aextract_slots_traced, extract_slots_traced
+from ..components.slot_cache import normalize_query
+from ..components.single_flight import SingleFlight
+from ..components.ontology_store import OntologySnapshot, OntologyStore
 from ..components.validator_search import validate_slots as best_term_match  # placeholder
 
+logger = logging.getLogger(__name__)
+
 ONTOLOGY_FILE = os.getenv("ONTOLOGY_FILE", "shared/schemas/ontology/categories.yaml")
-ONTOLOGY: Dict[str, Any] = yaml.safe_load(open(ONTOLOGY_FILE, "r"))
+# Loaded on first use and swapped in the background when the YAML changes
+ONTOLOGY_STORE = OntologyStore(ONTOLOGY_FILE)
 
-def resolve_category(term: str) -> Optional[str]:
-    if term in ONTOLOGY:
-        return term
-    for logical, cfg in ONTOLOGY.items():
+def get_ontology() -> OntologySnapshot:
+    return ONTOLOGY_STORE.current()
+
+def _remote_match(term: str, ontology: Dict[str, Any]) -> Optional[str]:
+    for logical, cfg in ontology.items():
         syns = cfg.get("synonyms", [])
         if best_term_match(term, [logical] + syns):
             return logical
     return None
 
-def run_slot_agent(user_text: str) -> Dict[str, Any]:
-    slots = extract_slots_genai(user_text)
+def resolve_categories(terms: Iterable[str]) -> Dict[str, Optional[str]]:
+    """
+    Resolve several category terms at once. Exact, normalized and fuzzy hits are
+    local dict/array probes; whatever is left is scored against the ontology
+    embeddings in one matrix multiply, and only terms that still miss fall back
+    to the search-backed matcher.
+    """
+    # one snapshot for the whole batch, even if a reload lands mid-request
+    snap = get_ontology()
+    out: Dict[str, Optional[str]] = {}
+    pending = []
+    for term in dict.fromkeys(terms):
+        if term in snap.ontology:
+            out[term] = term
+            continue
+        # O(1) exact / normalized hit; the search-backed matcher only runs on a miss
+        hit = snap.index.lookup(term)
+        if hit is None:
+            # misspellings ("cofee shop") are caught locally before any remote call
+            fuzzy = snap.fuzzy.best(term)
+            hit = fuzzy.category if fuzzy else None
+        if hit is None:
+            pending.append(term)
+        out[term] = hit
+    # variants sharing n-grams with a synonym ("espresso bars") resolve locally; real paraphrases fall through
+    for term, hit in snap.embeddings.resolve_batch(pending).items():
+        out[term] = hit if hit is not None else _remote_match(term, snap.ontology)
+    return out
+
+def resolve_category(term: str) -> Optional[str]:
+    return resolve_categories([term])[term]
+
+def _resolve_slots(slots: SlotExtraction) -> Dict[str, Any]:
+    cat_filters = [f for f in slots.filters if f.field in ("category", "amenity")]
+    terms = [f.value for f in cat_filters]
     if slots.target_category:
-        rc = resolve_category(slots.target_category)
-        if rc:
-            slots.target_category = rc
-    for f in slots.filters:
-        if f.field in ("category", "amenity"):
-            rc = resolve_category(f.value)
-            if rc:
-                f.value = rc
+        terms.append(slots.target_category)
+    resolved = resolve_categories(terms)
+    if slots.target_category and resolved.get(slots.target_category):
+        slots.target_category = resolved[slots.target_category]
+    for f in cat_filters:
+        if resolved.get(f.value):
+            f.value = resolved[f.value]
     return slots.model_dump()
+
+def _run_slot_agent(user_text: str) -> Dict[str, Any]:
+    slots, path = extract_slots_traced(user_text)
+    logger.info("slot extraction served by %s", path)
+    return _resolve_slots(slots)
+
+async def _arun_slot_agent(user_text: str, deadline_s: Optional[float]) -> Dict[str, Any]:
+    slots, path = await aextract_slots_traced(user_text, deadline_s=deadline_s)
+    logger.info("slot extraction served by %s", path)
+    return _resolve_slots(slots)
+
+# Identical questions in flight at the same time (dashboard refreshes) share one extraction
+_INFLIGHT = SingleFlight()
+
+def run_slot_agent(user_text: str) -> Dict[str, Any]:
+    return _INFLIGHT.do(normalize_query(user_text), lambda: _run_slot_agent(user_text))
+
+def _deadline_bucket(deadline_s: Optional[float]) -> str:
+    # callers only share work (and its deadline failures) with callers on a similar deadline
+    return "default" if deadline_s is None else f"{round(deadline_s * 4) / 4:g}s"
+
+async def arun_slot_agent(user_text: str, *, deadline_s: Optional[float] = None) -> Dict[str, Any]:
+    key = f"{normalize_query(user_text)}|{_deadline_bucket(deadline_s)}"
+    return await _INFLIGHT.ado(key, lambda: _arun_slot_agent(user_text, deadline_s))
+
+def run_query(user_text: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    # context is reserved for conversation state; extraction is stateless today
+    return run_slot_agent(user_text)
+
+async def arun_query(
+    user_text: str, context: Optional[Dict[str, Any]] = None, *, deadline_s: Optional[float] = None
+) -> Dict[str, Any]:
+    return await arun_slot_agent(user_text, deadline_s=deadline_s)
+
+def ontology_stats() -> Dict[str, Any]:
+    return ONTOLOGY_STORE.stats()
+
+def coalescing_stats() -> Dict[str, Any]:
+    """Calls, leaders and the share of requests that piggy-backed on an in-flight twin."""
+    return _INFLIGHT.stats()
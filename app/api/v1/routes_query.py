@@ -1,7 +1,18 @@
-from fastapi import APIRouter
-from agents.workflows.query_workflow import run_query
+import asyncio
+import os
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from agents.workflows.query_workflow import arun_query
+
+# Per-request budget for slot extraction: within it short queries go to the fast model and slow calls are hedged
+QUERY_DEADLINE_S = float(os.getenv("QUERY_DEADLINE_S", "3.0"))
 
 router = APIRouter()
 @router.post("/query")
-def query(q: str):
-    return run_query(q, context={})
+async def query(q: str, deadline_s: Optional[float] = Query(None, gt=0, le=30)):
+    budget = deadline_s or QUERY_DEADLINE_S
+    try:
+        return await arun_query(q, context={}, deadline_s=budget)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail=f"Slot extraction exceeded its {budget:g}s deadline") from None
@@ -0,0 +1,16 @@
+from typing import Optional
+
+from fastapi import APIRouter, Query
+from shared.clients.suggest_index import get_suggest_service
+
+router = APIRouter()
+@router.get("/suggest")
+def suggest(
+    q: str = Query(..., min_length=1),
+    k: int = Query(10, ge=1, le=50),
+    locality: Optional[str] = None,
+    postcode: Optional[str] = None,
+):
+    # sync on purpose: a lookup is sub-millisecond and never awaits
+    hits = get_suggest_service().suggest(q, k=k, locality=locality, postcode=postcode)
+    return {"query": q, "suggestions": [h.to_dict() for h in hits]}
@@ -2,8 +2,12 @@
 from fastapi import FastAPI, Query
 from agents.workflows.query_workflow import run_query
 from agents.components.slot_extractor import extract_slots  # direct extractor endpoint
+from app.api.v1.routes_query import router as query_router
+from app.api.v1.routes_suggest import router as suggest_router
 
 app = FastAPI(title="GeoMarket Insight API")
+app.include_router(query_router, prefix="/v1")
+app.include_router(suggest_router, prefix="/v1")
 
 @app.get("/extract_slots")
 def extract_slots_endpoint(q: str = Query(...)):
@@ -0,0 +1,92 @@
+import argparse
+import os
+import random
+import string
+import time
+from typing import Dict, List
+
+import yaml
+
+from agents.components.fuzzy_matcher import ONTOLOGY_FUZZY_CUTOFF, TrigramIndex
+
+_WORDS = (
+    "coffee tea bakery bar grill pizza sushi taco noodle burger juice smoothie bagel donut "
+    "wine beer brew pub deli market grocery pharmacy salon barber gym yoga dental clinic "
+    "vet pet book music art gallery florist hardware auto repair laundry tailor bank hotel"
+).split()
+
+
+def _pseudo_word(rng: random.Random) -> str:
+    # consonant/vowel alternation gives word-like trigram statistics
+    n = rng.randint(4, 9)
+    return "".join(rng.choice("bcdfghjklmnprstvwz" if i % 2 == 0 else "aeiouy") for i in range(n))
+
+
+def _synthetic_ontology(base: Dict[str, dict], size: int, rng: random.Random) -> Dict[str, dict]:
+    """Pad the real ontology with plausible multi-word categories up to `size` entries."""
+    onto = dict(base)
+    vocab = _WORDS + [_pseudo_word(rng) for _ in range(max(50, size // 4))]
+    while len(onto) < size:
+        words = rng.sample(vocab, rng.randint(2, 3))
+        key = "_".join(words) + f"_{len(onto)}"
+        onto[key] = {"synonyms": [" ".join(reversed(words)), " ".join(words) + " shop"]}
+    return onto
+
+
+def _misspell(term: str, rng: random.Random) -> str:
+    chars = list(term)
+    i = rng.randrange(len(chars))
+    op = rng.choice(("drop", "swap", "sub"))
+    if op == "drop" and len(chars) > 3:
+        del chars[i]
+    elif op == "swap" and i < len(chars) - 1:
+        chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    else:
+        chars[i] = rng.choice(string.ascii_lowercase)
+    return "".join(chars)
+
+
+def _pct(vals: List[float], p: float) -> float:
+    vals = sorted(vals)
+    return vals[min(len(vals) - 1, int(p / 100 * len(vals)))]
+
+
+def main():
+    p = argparse.ArgumentParser("Benchmark local fuzzy category matching as the ontology grows")
+    p.add_argument("--ontology", default=os.getenv("ONTOLOGY_FILE", "shared/schemas/ontology/categories.yaml"))
+    p.add_argument("--sizes", default="10,100,1000,5000,20000", help="Comma-separated ontology sizes")
+    p.add_argument("--queries", type=int, default=2000)
+    p.add_argument("--seed", type=int, default=7)
+    p.add_argument("--cutoff", type=float, default=ONTOLOGY_FUZZY_CUTOFF)
+    args = p.parse_args()
+
+    with open(args.ontology, "r", encoding="utf-8") as f:
+        base = yaml.safe_load(f) or {}
+
+    print(f"{'categories':>10} {'terms':>7} {'build_ms':>9} {'mean_us':>8} {'p50_us':>8} {'p99_us':>8} {'top1_acc':>8}")
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        rng = random.Random(args.seed)
+        onto = _synthetic_ontology(base, size, rng)
+
+        t0 = time.perf_counter()
+        index = TrigramIndex.from_ontology(onto)
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        targets = [(logical, rng.choice([logical.replace("_", " ")] + cfg.get("synonyms", [])))
+                   for logical, cfg in rng.choices(list(onto.items()), k=args.queries)]
+        lat, correct = [], 0
+        for logical, term in targets:
+            q = _misspell(term, rng)
+            t0 = time.perf_counter()
+            best = index.best(q, cutoff=args.cutoff)
+            lat.append((time.perf_counter() - t0) * 1e6)
+            correct += int(best is not None and best.category == logical)
+
+        print(
+            f"{len(onto):>10} {len(index):>7} {build_ms:>9.1f} {sum(lat) / len(lat):>8.1f} "
+            f"{_pct(lat, 50):>8.1f} {_pct(lat, 99):>8.1f} {correct / len(lat):>8.2%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from agents.components.slot_extractor import aextract_slots_genai
+
+
+# --------------------------
+# Input / resume helpers
+# --------------------------
+
+def _resume_key(qid: Any) -> str:
+    # JSON keeps 7 and "7" apart; either spelling of an id counts as done
+    return str(qid)
+
+
+def _read_done_ids(path: str, id_field: str) -> Set[str]:
+    """Resume keys of IDs already written successfully; failed rows are retried on the next run."""
+    done: Set[str] = set()
+    if not os.path.isfile(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line from a crash
+            if "slots" in row and row.get(id_field) is not None:
+                done.add(_resume_key(row[id_field]))
+    return done
+
+
+def _truncate_torn_tail(path: str, chunk: int = 64 * 1024) -> None:
+    """Drop a partial last line left by a crash, so appended rows start on a fresh line."""
+    if not os.path.isfile(path):
+        return
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(0, pos - chunk)
+            f.seek(start)
+            nl = f.read(pos - start).rfind(b"\n")
+            if nl >= 0:
+                keep = start + nl + 1
+                break
+            pos = start
+        else:
+            keep = 0
+        if keep < end:
+            f.truncate(keep)
+
+
+def _iter_queries(path: str, id_field: str, text_field: str) -> Iterator[Tuple[Any, str]]:
+    """(id as it appears in the input, or the line number; query text)"""
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            row = json.loads(line)
+            text = row.get(text_field)
+            if not text:
+                print(f"⚠️ Skipping line {lineno}: missing '{text_field}'", file=sys.stderr)
+                continue
+            yield row.get(id_field, lineno), text
+
+
+def _percentile(sorted_vals: List[float], pct: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    idx = min(len(sorted_vals) - 1, max(0, math.ceil(pct / 100.0 * len(sorted_vals)) - 1))
+    return sorted_vals[idx]
+
+
+# --------------------------
+# Rate limiting
+# --------------------------
+
+class RateLimiter:
+    """Token bucket shared by all workers; rps <= 0 disables it."""
+
+    def __init__(self, rps: float, burst: Optional[int] = None):
+        self.rps = rps
+        self.capacity = float(burst or max(1, int(rps or 1)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rps <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rps)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rps)
+
+
+# --------------------------
+# Runner
+# --------------------------
+
+async def run_bulk(
+    input_path: str,
+    output_path: str,
+    *,
+    id_field: str = "id",
+    text_field: str = "query",
+    concurrency: int = 8,
+    rps: float = 0.0,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    _truncate_torn_tail(output_path)
+    done = _read_done_ids(output_path, id_field)
+    limiter = RateLimiter(rps)
+    queue: "asyncio.Queue[Optional[Tuple[Any, str]]]" = asyncio.Queue(maxsize=concurrency * 4)
+    latencies: List[float] = []
+    counts = {"ok": 0, "failed": 0, "skipped": 0}
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    out = open(output_path, "a", encoding="utf-8")
+
+    def write(row: Dict[str, Any]) -> None:
+        out.write(json.dumps(row, ensure_ascii=False) + "\n")
+        out.flush()
+
+    async def worker() -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            qid, text = item
+            await limiter.acquire()
+            t0 = time.perf_counter()
+            try:
+                slots = await aextract_slots_genai(text, use_cache=use_cache)
+                ms = (time.perf_counter() - t0) * 1000
+                latencies.append(ms)
+                counts["ok"] += 1
+                write({id_field: qid, "query": text, "slots": slots.model_dump(), "latency_ms": round(ms, 2)})
+            except Exception as e:
+                counts["failed"] += 1
+                write({id_field: qid, "query": text, "error": f"{type(e).__name__}: {e}"})
+
+    started = time.perf_counter()
+    workers = [asyncio.create_task(worker()) for _ in range(max(concurrency, 1))]
+    try:
+        for qid, text in _iter_queries(input_path, id_field, text_field):
+            if _resume_key(qid) in done:
+                counts["skipped"] += 1
+                continue
+            await queue.put((qid, text))
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        out.close()
+
+    elapsed = time.perf_counter() - started
+    lat = sorted(latencies)
+    return {
+        **counts,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_qps": round(counts["ok"] / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": round(_percentile(lat, 50), 2),
+        "p90_ms": round(_percentile(lat, 90), 2),
+        "p99_ms": round(_percentile(lat, 99), 2),
+        "max_ms": round(lat[-1], 2) if lat else 0.0,
+    }
+
+
+def main():
+    p = argparse.ArgumentParser("Bulk slot extraction over a JSONL query corpus")
+    p.add_argument("input", help="JSONL file, one query object per line")
+    p.add_argument("--output", required=True, help="JSONL results file (appended to; enables resume)")
+    p.add_argument("--id-field", default="id")
+    p.add_argument("--text-field", default="query")
+    p.add_argument("--concurrency", type=int, default=int(os.getenv("GENAI_MAX_CONCURRENCY", "8")))
+    p.add_argument("--rps", type=float, default=0.0, help="Max requests per second (0 = unlimited)")
+    p.add_argument("--no-cache", action="store_true", help="Bypass the slot cache (no warming)")
+    args = p.parse_args()
+
+    if not os.path.isfile(args.input):
+        p.error(f"Input file not found: {args.input}")
+
+    stats = asyncio.run(run_bulk(
+        args.input,
+        args.output,
+        id_field=args.id_field,
+        text_field=args.text_field,
+        concurrency=args.concurrency,
+        rps=args.rps,
+        use_cache=not args.no_cache,
+    ))
+    print(
+        f"✅ {stats['ok']} ok, {stats['failed']} failed, {stats['skipped']} skipped (already done) "
+        f"in {stats['elapsed_s']}s → {stats['throughput_qps']} q/s"
+    )
+    print(f"   latency p50={stats['p50_ms']}ms p90={stats['p90_ms']}ms p99={stats['p99_ms']}ms max={stats['max_ms']}ms")
+    return 0 if stats["failed"] == 0 else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+# data/pipelines/budget.py
+from __future__ import annotations
+
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+_UNITS = {"": 1, "B": 1, "KB": 2**10, "MB": 2**20, "GB": 2**30, "TB": 2**40, "KIB": 2**10, "MIB": 2**20, "GIB": 2**30, "TIB": 2**40}
+_SIZE = re.compile(r"^\s*([\d.]+)\s*([a-zA-Z]*)\s*$")
+
+
+def parse_bytes(value: Optional[str]) -> Optional[int]:
+    """'50GB' / '1.5 TiB' / '1073741824' → bytes (binary units). Empty / '0' / None → no cap."""
+    if value is None or str(value).strip() in ("", "0"):
+        return None
+    m = _SIZE.match(str(value))
+    unit = (m.group(2) if m else "").upper()
+    if not m or unit not in _UNITS:
+        raise ValueError(f"Unrecognized byte size: {value!r} (use e.g. 500MB, 50GB, 1TB)")
+    return int(float(m.group(1)) * _UNITS[unit])
+
+
+def format_bytes(n: Optional[int]) -> str:
+    if n is None:
+        return "?"
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if n < 1024 or unit == "TiB":
+            return f"{n} {unit}" if unit == "B" else f"{n:.2f} {unit}"
+        n /= 1024
+
+
+# Per-job cap for real runs; BigQuery fails a job whose estimate exceeds it without running it
+MATERIALIZE_MAX_BYTES_BILLED = parse_bytes(os.getenv("MATERIALIZE_MAX_BYTES_BILLED", "1TB"))
+
+
+def query_config(max_bytes_billed: Optional[int] = None, dry_run: bool = False):
+    from google.cloud import bigquery
+
+    cfg = bigquery.QueryJobConfig(dry_run=dry_run, use_query_cache=False)
+    if max_bytes_billed and not dry_run:
+        cfg.maximum_bytes_billed = int(max_bytes_billed)
+    return cfg
+
+
+def dry_run_bytes(client, sql: str) -> int:
+    """Bytes the statement would process. Dry runs are free and don't touch any data."""
+    job = client.query(sql, job_config=query_config(dry_run=True))
+    return int(job.total_bytes_processed or 0)
+
+
+def plan(client, steps: Iterable[Any], max_bytes_billed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Dry-run every step's SQL. A step whose inputs don't exist yet (first refresh,
+    upstream not built) can't be estimated and is reported with the error.
+    """
+    rows: List[Dict[str, Any]] = []
+    for step in steps:
+        row: Dict[str, Any] = {"step": step.name, "estimated_bytes": None, "error": None, "over_cap": False}
+        try:
+            row["estimated_bytes"] = dry_run_bytes(client, step.payload)
+            row["over_cap"] = bool(max_bytes_billed and row["estimated_bytes"] > max_bytes_billed)
+        except Exception as e:
+            row["error"] = f"{type(e).__name__}: {getattr(e, 'message', None) or e}"
+        rows.append(row)
+    return rows
+
+
+def plan_report(rows: List[Dict[str, Any]], max_bytes_billed: Optional[int] = None) -> str:
+    name_w = max([len(r["step"]) for r in rows] + [5])
+    lines = [f"{'step':<{name_w}}  {'estimated':>12}  note"]
+    total = 0
+    for r in rows:
+        total += r["estimated_bytes"] or 0
+        note = r["error"] or ("OVER CAP" if r["over_cap"] else "")
+        lines.append(f"{r['step']:<{name_w}}  {format_bytes(r['estimated_bytes']):>12}  {note}".rstrip())
+    unknown = sum(1 for r in rows if r["estimated_bytes"] is None)
+    suffix = f" (+{unknown} step(s) not estimable)" if unknown else ""
+    lines.append(f"{'total':<{name_w}}  {format_bytes(total):>12}{suffix}")
+    lines.append(f"per-job cap: {format_bytes(max_bytes_billed) if max_bytes_billed else 'none'}")
+    return "\n".join(lines)
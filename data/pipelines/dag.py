@@ -0,0 +1,174 @@
+# data/pipelines/dag.py
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+PENDING, RUNNING, SUCCEEDED, FAILED, SKIPPED = "pending", "running", "succeeded", "failed", "skipped"
+
+
+@dataclass(frozen=True)
+class Step:
+    name: str
+    payload: Any = None                 # e.g. the SQL for a BigQuery step
+    deps: Tuple[str, ...] = ()
+
+
+@dataclass
+class NodeStatus:
+    name: str
+    state: str = PENDING
+    started_s: Optional[float] = None   # offsets from the start of the run
+    finished_s: Optional[float] = None
+    result: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def duration_s(self) -> Optional[float]:
+        if self.started_s is None or self.finished_s is None:
+            return None
+        return self.finished_s - self.started_s
+
+
+class DagFailed(RuntimeError):
+    def __init__(self, result: "DagResult"):
+        self.result = result
+        failed = [n for n in result.nodes.values() if n.state == FAILED]
+        skipped = [n.name for n in result.nodes.values() if n.state == SKIPPED]
+        lines = [f"{n.name}: {type(n.error).__name__}: {n.error}" for n in failed]
+        if skipped:
+            lines.append(f"skipped: {', '.join(skipped)}")
+        super().__init__("DAG failed\n  " + "\n  ".join(lines))
+
+
+@dataclass
+class DagResult:
+    nodes: Dict[str, NodeStatus]
+    elapsed_s: float
+    order: List[str] = field(default_factory=list)   # declaration order, for stable output
+
+    @property
+    def ok(self) -> bool:
+        return all(n.state == SUCCEEDED for n in self.nodes.values())
+
+    def raise_for_failure(self) -> "DagResult":
+        if not self.ok:
+            raise DagFailed(self)
+        return self
+
+    def timeline(self, width: int = 40) -> str:
+        """One line per step: state, start/end offsets and a bar on a shared time axis."""
+        total = max(self.elapsed_s, 1e-9)
+        name_w = max((len(n) for n in self.order), default=4)
+        lines = []
+        for name in self.order:
+            n = self.nodes[name]
+            if n.started_s is None:
+                lines.append(f"{name:<{name_w}}  {n.state:<9} {'':>15}  |{' ' * width}|")
+                continue
+            end = n.finished_s if n.finished_s is not None else self.elapsed_s
+            a = int(n.started_s / total * width)
+            b = max(a + 1, int(round(end / total * width)))
+            bar = " " * a + "█" * (b - a) + " " * (width - b)
+            lines.append(f"{name:<{name_w}}  {n.state:<9} {n.started_s:6.1f}s–{end:6.1f}s  |{bar[:width]}|")
+        lines.append(f"{'total':<{name_w}}  {'':<9} {self.elapsed_s:15.1f}s")
+        return "\n".join(lines)
+
+
+class Dag:
+    """
+    A set of named steps with dependencies, run with as much parallelism as the
+    edges allow: a step starts as soon as all of its deps have succeeded.
+
+    Fail-fast: after the first failure nothing new is started; steps already
+    running are allowed to finish and everything not started is marked skipped.
+    With `fail_fast=False` only the failed step's dependents are skipped and
+    independent branches (e.g. other shards) run to completion.
+    """
+
+    def __init__(self, steps: Iterable[Step]):
+        self.steps: Dict[str, Step] = {}
+        for s in steps:
+            if s.name in self.steps:
+                raise ValueError(f"duplicate step: {s.name}")
+            self.steps[s.name] = s
+        for s in self.steps.values():
+            unknown = [d for d in s.deps if d not in self.steps]
+            if unknown:
+                raise ValueError(f"step {s.name!r} depends on unknown step(s): {', '.join(unknown)}")
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        state: Dict[str, int] = {}
+
+        def visit(name: str, path: List[str]) -> None:
+            if state.get(name) == 1:
+                raise ValueError(f"dependency cycle: {' -> '.join(path + [name])}")
+            if state.get(name) == 2:
+                return
+            state[name] = 1
+            for d in self.steps[name].deps:
+                visit(d, path + [name])
+            state[name] = 2
+
+        for name in self.steps:
+            visit(name, [])
+
+    async def arun(
+        self,
+        runner: Callable[[Step], Awaitable[Any]],
+        max_parallel: int = 8,
+        fail_fast: bool = True,
+    ) -> DagResult:
+        t0 = time.monotonic()
+        nodes = {name: NodeStatus(name) for name in self.steps}
+        waiting = {name: set(s.deps) for name, s in self.steps.items()}
+        dependents: Dict[str, List[str]] = {name: [] for name in self.steps}
+        for s in self.steps.values():
+            for d in s.deps:
+                dependents[d].append(s.name)
+
+        ready = [name for name, deps in waiting.items() if not deps]
+        running: Dict[asyncio.Task, str] = {}
+        failed = False
+
+        async def run_one(name: str) -> Any:
+            return await runner(self.steps[name])
+
+        while ready or running:
+            while ready and not (failed and fail_fast) and len(running) < max(1, max_parallel):
+                name = ready.pop(0)
+                nodes[name].state = RUNNING
+                nodes[name].started_s = time.monotonic() - t0
+                running[asyncio.ensure_future(run_one(name))] = name
+            if not running:
+                break
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = running.pop(task)
+                node = nodes[name]
+                node.finished_s = time.monotonic() - t0
+                if task.exception() is not None:
+                    node.state, node.error = FAILED, task.exception()
+                    failed = True
+                    continue
+                node.state, node.result = SUCCEEDED, task.result()
+                for child in dependents[name]:
+                    waiting[child].discard(name)
+                    if not waiting[child]:
+                        ready.append(child)
+
+        for node in nodes.values():
+            if node.state == PENDING:
+                node.state = SKIPPED
+        return DagResult(nodes, time.monotonic() - t0, order=list(self.steps))
+
+    def run(
+        self,
+        runner: Callable[[Step], Awaitable[Any]],
+        max_parallel: int = 8,
+        fail_fast: bool = True,
+    ) -> DagResult:
+        return asyncio.run(self.arun(runner, max_parallel, fail_fast))
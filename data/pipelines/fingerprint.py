@@ -0,0 +1,105 @@
+# data/pipelines/fingerprint.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+FINGERPRINT_LABEL = os.getenv("MATERIALIZE_FINGERPRINT_LABEL", "materialize_fp")
+
+_TARGET = re.compile(r"CREATE\s+(?:OR\s+REPLACE\s+)?(?:TABLE|VIEW)\s+`?([\w.-]+)`?", re.I)
+_SOURCE = re.compile(r"\b(?:FROM|JOIN)\s+`?([\w-]+\.[\w-]+\.[\w-]+)`?", re.I)
+_COMMENT = re.compile(r"--[^\n]*")
+
+
+def target_table(sql: str) -> Optional[str]:
+    m = _TARGET.search(_COMMENT.sub("", sql))
+    return m.group(1) if m else None
+
+
+def source_tables(sql: str) -> List[str]:
+    """Fully-qualified tables read by `sql` (FROM / JOIN), excluding the table it creates."""
+    target = target_table(sql)
+    return sorted({t for t in _SOURCE.findall(_COMMENT.sub("", sql)) if t != target})
+
+
+def _normalize_sql(sql: str) -> str:
+    # comment/whitespace edits should not force a rebuild
+    return " ".join(_COMMENT.sub("", sql).split())
+
+
+def fingerprint(sql: str, source_versions: Iterable[Tuple[str, Optional[int]]]) -> str:
+    """
+    sha256 over the normalized SQL and each source table's last-modified time.
+    Truncated to 32 hex chars so it fits a BigQuery label value.
+    """
+    h = hashlib.sha256(_normalize_sql(sql).encode("utf-8"))
+    for table, modified in sorted(source_versions):
+        h.update(f"\n{table}@{modified}".encode("utf-8"))
+    return h.hexdigest()[:32]
+
+
+def _modified_ms(table) -> Optional[int]:
+    modified = getattr(table, "modified", None)
+    return int(modified.timestamp() * 1000) if modified is not None else None
+
+
+def bigquery_fingerprint(client, sql: str) -> str:
+    """Fingerprint `sql` using `get_table` metadata calls only (no bytes scanned)."""
+    return fingerprint(sql, [(t, _modified_ms(client.get_table(t))) for t in source_tables(sql)])
+
+
+# --------------------------
+# Where fingerprints are kept
+# --------------------------
+
+class LabelFingerprintStore:
+    """Fingerprint stored as a label on the target table, so it travels with the table."""
+
+    def __init__(self, client, label: str = FINGERPRINT_LABEL):
+        self.client = client
+        self.label = label
+
+    def get(self, table_id: str) -> Optional[str]:
+        from google.api_core import exceptions
+
+        try:
+            return (self.client.get_table(table_id).labels or {}).get(self.label)
+        except exceptions.NotFound:
+            return None
+
+    def put(self, table_id: str, fp: str) -> None:
+        table = self.client.get_table(table_id)
+        table.labels = {**(table.labels or {}), self.label: fp}
+        self.client.update_table(table, ["labels"])
+
+
+class FileFingerprintStore:
+    """Fingerprints in a local JSON file, for datasets where labels can't be written."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, str]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, table_id: str) -> Optional[str]:
+        return self._load().get(table_id)
+
+    def put(self, table_id: str, fp: str) -> None:
+        with self._lock:
+            state = self._load()
+            state[table_id] = fp
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
@@ -0,0 +1,202 @@
+# data/pipelines/operations.py
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+LRO_INITIAL_DELAY_S = float(os.getenv("LRO_INITIAL_DELAY_S", "1.0"))
+LRO_MAX_DELAY_S = float(os.getenv("LRO_MAX_DELAY_S", "30.0"))
+LRO_MULTIPLIER = float(os.getenv("LRO_MULTIPLIER", "1.5"))
+# done() is a blocking RPC; cap how many run at once on the default thread pool
+LRO_MAX_CONCURRENT_POLLS = int(os.getenv("LRO_MAX_CONCURRENT_POLLS", "8"))
+
+_DE_PROGRESS_FIELDS = ("success_count", "failure_count", "total_count", "create_time", "update_time")
+_BQ_PROGRESS_FIELDS = ("job_id", "state", "total_bytes_processed", "total_bytes_billed", "slot_millis")
+
+
+# --------------------------
+# Adapters
+# --------------------------
+
+def _is_bigquery_job(op: Any) -> bool:
+    return hasattr(op, "job_id") and hasattr(op, "reload")
+
+
+def _metadata(op: Any) -> Any:
+    md = getattr(op, "metadata", None)
+    return md() if callable(md) else md
+
+
+def operation_name(op: Any) -> str:
+    if _is_bigquery_job(op):
+        return f"bigquery:{op.job_id}"
+    name = getattr(getattr(op, "operation", None), "name", None) or getattr(op, "name", None)
+    return str(name or f"operation@{id(op):x}")
+
+
+def operation_progress(op: Any) -> Dict[str, Any]:
+    """Whatever progress the operation exposes: import counters for Discovery Engine, bytes/state for BigQuery."""
+    src, fields = (op, _BQ_PROGRESS_FIELDS) if _is_bigquery_job(op) else (_metadata(op), _DE_PROGRESS_FIELDS)
+    out: Dict[str, Any] = {}
+    if src is None:
+        return out
+    for f in fields:
+        v = getattr(src, f, None)
+        if v is not None:
+            out[f] = v if isinstance(v, (int, float, str)) else str(v)
+    return out
+
+
+# --------------------------
+# Handles / manager
+# --------------------------
+
+class OperationHandle:
+    """Awaitable view of one running operation; `await handle` gives `op.result()`."""
+
+    def __init__(self, op: Any, label: Optional[str] = None):
+        self.op = op
+        self.name = operation_name(op)
+        self.label = label or self.name
+        self.progress: Dict[str, Any] = {}
+        self.polls = 0
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def done(self) -> bool:
+        return self._task is not None and self._task.done()
+
+    @property
+    def elapsed_s(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def __await__(self):
+        return self._task.__await__()
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = "running"
+        if self.done:
+            state = "failed" if self._task.cancelled() or self._task.exception() else "done"
+        return {
+            "label": self.label,
+            "name": self.name,
+            "state": state,
+            "polls": self.polls,
+            "elapsed_s": round(self.elapsed_s, 2),
+            "progress": dict(self.progress),
+        }
+
+
+class OperationManager:
+    """
+    Polls Discovery Engine LROs and BigQuery jobs concurrently from one event loop.
+
+    Each operation gets its own polling task with jittered exponential backoff
+    (`initial_delay_s` × `multiplier`ⁿ, capped at `max_delay_s`). The blocking
+    `done()` RPCs run on worker threads, at most `max_concurrent_polls` at once.
+    """
+
+    def __init__(
+        self,
+        initial_delay_s: float = LRO_INITIAL_DELAY_S,
+        max_delay_s: float = LRO_MAX_DELAY_S,
+        multiplier: float = LRO_MULTIPLIER,
+        max_concurrent_polls: int = LRO_MAX_CONCURRENT_POLLS,
+    ):
+        self.initial_delay_s = initial_delay_s
+        self.max_delay_s = max_delay_s
+        self.multiplier = multiplier
+        self.max_concurrent_polls = max(1, max_concurrent_polls)
+        self._sem: Optional[asyncio.Semaphore] = None
+        self.handles: List[OperationHandle] = []
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.max_concurrent_polls)
+        return self._sem
+
+    def submit(
+        self,
+        op: Any,
+        *,
+        label: Optional[str] = None,
+        timeout_s: Optional[float] = None,
+        on_progress: Optional[Callable[[OperationHandle], None]] = None,
+    ) -> OperationHandle:
+        """Start polling `op`. Must be called from a running event loop."""
+        handle = OperationHandle(op, label)
+        handle._task = asyncio.get_running_loop().create_task(self._poll(handle, timeout_s, on_progress))
+        self.handles.append(handle)
+        return handle
+
+    async def _poll(
+        self,
+        handle: OperationHandle,
+        timeout_s: Optional[float],
+        on_progress: Optional[Callable[[OperationHandle], None]],
+    ) -> Any:
+        op = handle.op
+        delay = self.initial_delay_s
+        deadline = None if timeout_s is None else handle.started_at + timeout_s
+        try:
+            while True:
+                async with self._semaphore():
+                    finished = await asyncio.to_thread(op.done)
+                    handle.polls += 1
+                    progress = await asyncio.to_thread(operation_progress, op)
+                if progress != handle.progress:
+                    handle.progress = progress
+                    if on_progress is not None:
+                        on_progress(handle)
+                if finished:
+                    break
+                if deadline is not None and time.monotonic() + delay > deadline:
+                    raise TimeoutError(f"{handle.label} still running after {timeout_s:.0f}s")
+                # full jitter keeps many operations from polling in lockstep
+                await asyncio.sleep(random.uniform(delay / 2, delay))
+                delay = min(delay * self.multiplier, self.max_delay_s)
+            # done() is true, so result() returns (or raises the operation error) without waiting
+            return await asyncio.to_thread(op.result)
+        finally:
+            handle.finished_at = time.monotonic()
+
+    async def wait_all(self, handles: Optional[Iterable[OperationHandle]] = None, return_exceptions: bool = False) -> List[Any]:
+        handles = list(self.handles if handles is None else handles)
+        return await asyncio.gather(*(h._task for h in handles), return_exceptions=return_exceptions)
+
+    def progress(self) -> List[Dict[str, Any]]:
+        return [h.snapshot() for h in self.handles]
+
+
+def wait_for_operations(
+    ops: Iterable[Any],
+    *,
+    timeout_s: Optional[float] = None,
+    on_progress: Optional[Callable[[OperationHandle], None]] = None,
+    manager: Optional[OperationManager] = None,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """
+    Blocking helper for scripts: wait on several operations at once and return
+    their results in order. Call from synchronous code only.
+    """
+    manager = manager or OperationManager()
+
+    async def run() -> List[Any]:
+        handles = [manager.submit(op, timeout_s=timeout_s, on_progress=on_progress) for op in ops]
+        return await manager.wait_all(handles, return_exceptions=return_exceptions)
+
+    return asyncio.run(run())
+
+
+async def gather_operations(ops: Iterable[Any], **kwargs) -> List[Any]:
+    """Async counterpart of `wait_for_operations` for callers already on an event loop."""
+    manager: OperationManager = kwargs.pop("manager", None) or OperationManager()
+    return_exceptions = kwargs.pop("return_exceptions", False)
+    handles = [manager.submit(op, **kwargs) for op in ops]
+    return await manager.wait_all(handles, return_exceptions=return_exceptions)
@@ -1,22 +1,19 @@
 # tools/engines.py
 from __future__ import annotations
 
-from typing import Iterable, List, Tuple, Union, Dict
+from typing import Any, Iterable, List, Optional, Tuple, Union, Dict
 
 from google.api_core import exceptions
-from google.api_core.client_options import ClientOptions
 from google.cloud import discoveryengine_v1 as de
 
+from data.pipelines.operations import operation_progress, wait_for_operations
+from shared.clients.registry import discovery_client
+
 
 # --------------------------
 # Helpers
 # --------------------------
 
-def _endpoint_for(location: str) -> str:
-    loc = (location or "global").lower()
-    return "discoveryengine.googleapis.com" if loc == "global" else f"{loc}-discoveryengine.googleapis.com"
-
-
 def _engine_name(project_id: str, location: str, collection_id: str, engine_id: str) -> str:
     return (
         f"projects/{project_id}/locations/{location}"
@@ -28,7 +25,7 @@ def _engine_name(project_id: str, location: str, collection_id: str, engine_id:
 # Engine ensure / update
 # --------------------------
 
-def ensure_engine_with_datastores(
+def start_ensure_engine_with_datastores(
     *,
     project_id: str,
     location: str,
@@ -38,13 +35,13 @@ def ensure_engine_with_datastores(
     data_store_ids: list[str] | None = None,
     solution_type: de.SolutionType = de.SolutionType.SOLUTION_TYPE_SEARCH,
     industry_vertical: de.IndustryVertical = de.IndustryVertical.GENERIC,
-) -> de.Engine:
+) -> Tuple[de.Engine, Optional[Any]]:
     """
-    Idempotently create an Engine (if missing) and ensure it is linked to the given datastores.
+    Start creating the Engine (if missing) or relinking its datastores, without waiting.
+    Returns (engine, LRO); the LRO is None when the engine is already up to date.
     """
     loc = (location or "global").lower()
-    endpoint = _endpoint_for(loc)
-    client = de.EngineServiceClient(client_options=ClientOptions(api_endpoint=endpoint))
+    client = discovery_client("EngineServiceClient", loc)
     parent = f"projects/{project_id}/locations/{loc}/collections/{collection_id}"
     name = f"{parent}/engines/{engine_id}"
 
@@ -57,17 +54,26 @@ def ensure_engine_with_datastores(
             solution_type=solution_type,
             data_store_ids=list(data_store_ids or []),
         )
-        op = client.create_engine(parent=parent, engine=engine, engine_id=engine_id)
-        return op.result()
+        return engine, client.create_engine(parent=parent, engine=engine, engine_id=engine_id)
 
     # Update linked datastores if different
     want = set(data_store_ids or [])
     have = set(engine.data_store_ids)
     if want and want != have:
         engine.data_store_ids[:] = list(want)
-        op = client.update_engine(engine=engine)
-        engine = op.result()
+        return engine, client.update_engine(engine=engine)
+
+    return engine, None
 
+
+def ensure_engine_with_datastores(*, timeout: Optional[float] = None, **kwargs) -> de.Engine:
+    """
+    Idempotently create an Engine (if missing) and ensure it is linked to the given datastores.
+    """
+    engine, op = start_ensure_engine_with_datastores(**kwargs)
+    if op is None:
+        return engine
+    (engine,) = wait_for_operations([op], timeout_s=timeout)
     return engine
 
 
@@ -103,10 +109,9 @@ def import_to_engine_from_gcs(
     """
     uris = _normalize_uris(gcs_uris)
     loc = (location or "global").lower()
-    endpoint = _endpoint_for(loc)
 
     # 1) Resolve engine and attached datastores
-    eng_client = de.EngineServiceClient(client_options=ClientOptions(api_endpoint=endpoint))
+    eng_client = discovery_client("EngineServiceClient", loc)
     engine_path = _engine_name(project_id, loc, collection_id, engine_id)
     try:
         engine = eng_client.get_engine(name=engine_path)
@@ -117,11 +122,11 @@ def import_to_engine_from_gcs(
         raise ValueError(f"Engine '{engine_id}' has no linked data_store_ids; nothing to import into.")
 
     # 2) GCS source
-    doc_client = de.DocumentServiceClient(client_options=ClientOptions(api_endpoint=endpoint))
+    doc_client = discovery_client("DocumentServiceClient", loc)
     gcs_source = de.GcsSource(input_uris=uris)
 
-    # 3) Import into each attached datastore's branch
-    results: List[Dict[str, object]] = []
+    # 3) Start the import into every attached datastore's branch, then wait on all of them together
+    ops = []
     for ds_id in engine.data_store_ids:
         parent = (
             f"projects/{project_id}/locations/{loc}/collections/{collection_id}"
@@ -133,14 +138,20 @@ def import_to_engine_from_gcs(
             gcs_source=gcs_source,
             reconciliation_mode=reconciliation_mode,
         )
-        op = doc_client.import_documents(request=req)
-        # Wait for completion
-        _ = op.result(timeout=timeout)
-
-        # Get counts from operation metadata (not response)
-        md = op.metadata() if callable(getattr(op, "metadata", None)) else getattr(op, "metadata", None)
-        success = getattr(md, "success_count", None)
-        failure = getattr(md, "failure_count", None)
+        ops.append(doc_client.import_documents(request=req))
+
+    def _report(handle):
+        p = handle.progress
+        print(f"   … {handle.label}: success={p.get('success_count')}, failure={p.get('failure_count')}")
+
+    wait_for_operations(ops, timeout_s=timeout, on_progress=_report)
+
+    # Get counts from operation metadata (not response)
+    results: List[Dict[str, object]] = []
+    for ds_id, op in zip(engine.data_store_ids, ops):
+        progress = operation_progress(op)
+        success = progress.get("success_count")
+        failure = progress.get("failure_count")
 
         results.append({
             "data_store_id": ds_id,
@@ -1,21 +1,12 @@
 # src/search/datastores.py
-from typing import Iterable, Optional
+from typing import Any, Iterable, Optional, Tuple
 from google.api_core import exceptions
-from google.api_core.client_options import ClientOptions
 from google.cloud import discoveryengine_v1 as de
 
-
-def _endpoint_for(location: str) -> str:
-    # Discovery Engine uses regional endpoints except for some "global" flows.
-    # If you’re using "global", default endpoint works.
-    return (
-        "discoveryengine.googleapis.com"
-        if location == "global"
-        else f"{location}-discoveryengine.googleapis.com"
-    )
+from shared.clients.registry import discovery_client
 
 
-def create_or_replace_datastore(
+def start_create_or_replace_datastore(
     project_id: str,
     location: str,
     collection_id: str,
@@ -29,14 +20,13 @@ def create_or_replace_datastore(
     client: Optional[de.DataStoreServiceClient] = None,
     overwrite: bool = True,
     timeout: float = 600.0,
-) -> de.DataStore:
+) -> Tuple[Optional[de.DataStore], Any]:
     """
-    Idempotently create a Discovery Engine DataStore.
-    If an existing DataStore is found and overwrite=True, it is deleted then recreated.
+    Start creating a DataStore without waiting for it.
+    Returns (existing, None) when it already exists and overwrite=False, else (None, create LRO).
+    A replaced DataStore's delete is waited on here, since the create cannot start before it.
     """
-    client = client or de.DataStoreServiceClient(
-        client_options=ClientOptions(api_endpoint=_endpoint_for(location))
-    )
+    client = client or discovery_client("DataStoreServiceClient", location)
 
     parent = f"projects/{project_id}/locations/{location}/collections/{collection_id}"
     name = f"{parent}/dataStores/{data_store_id}"
@@ -44,7 +34,7 @@ def create_or_replace_datastore(
     try:
         existing = client.get_data_store(name=name)
         if not overwrite:
-            return existing
+            return existing, None
         op = client.delete_data_store(name=name)
         op.result(timeout=timeout)
     except exceptions.NotFound:
@@ -62,4 +52,23 @@ def create_or_replace_datastore(
         data_store=ds,
         data_store_id=data_store_id,
     )
-    return op.result(timeout=timeout)
+    return None, op
+
+
+def create_or_replace_datastore(
+    project_id: str,
+    location: str,
+    collection_id: str,
+    data_store_id: str,
+    *,
+    timeout: float = 600.0,
+    **kwargs,
+) -> de.DataStore:
+    """
+    Idempotently create a Discovery Engine DataStore.
+    If an existing DataStore is found and overwrite=True, it is deleted then recreated.
+    """
+    existing, op = start_create_or_replace_datastore(
+        project_id, location, collection_id, data_store_id, timeout=timeout, **kwargs
+    )
+    return existing if op is None else op.result(timeout=timeout)
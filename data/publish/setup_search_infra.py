@@ -6,10 +6,13 @@ import os
 from typing import List
 
 from shared.config.settings import get_config
-from tools.datastores import create_or_replace_datastore
-from tools.schemas import create_or_update_schema  # <-- uses your existing helper
+from data.pipelines.operations import wait_for_operations
+from tools.datastores import start_create_or_replace_datastore
+from tools.schemas import start_create_or_update_schema  # <-- uses your existing helper
 from google.cloud import discoveryengine_v1 as de
 
+LRO_TIMEOUT_S = float(os.getenv("SEARCH_INFRA_TIMEOUT_S", "600"))
+
 
 # --------------------------
 # Validation / helpers
@@ -61,6 +64,7 @@ def main():
     search_location = (os.getenv("SEARCH_LOCATION", "global") or "global").lower()
     collection_id = os.getenv("SEARCH_COLLECTION_ID", "default_collection")
 
+    specs = []
     for path in files:
         if not os.path.isfile(path):
             raise ValueError(f"[setup_search_infra] Schema file not found: {path}")
@@ -73,12 +77,13 @@ def main():
         if not ds_id or not schema_id:
             print(f"⚠️ Skipping {path}: need SEARCH_DATASTORE and SCHEMA_ID")
             continue
+        specs.append((ds_id, schema_id, s))
 
-        print(f"\n=== Infra for {path} ===")
-
-        # a) Ensure DataStore exists
+    # a) Ensure DataStores exist: start every create, then wait on them together
+    ds_ops = []
+    for ds_id in dict.fromkeys(ds_id for ds_id, _, _ in specs):
         print(f"→ Ensuring datastore {ds_id}")
-        ds = create_or_replace_datastore(
+        existing, op = start_create_or_replace_datastore(
             project_id=project_id,
             location=search_location,
             collection_id=collection_id,
@@ -89,22 +94,30 @@ def main():
             content_config=de.DataStore.ContentConfig.NO_CONTENT,
             overwrite=False,
         )
-        print(f"   {ds.name}")
-
-        # b) Create/Update Schema for that DataStore
-        json_schema = _build_json_schema(s)
+        if op is None:
+            print(f"   {existing.name}")
+        else:
+            ds_ops.append(op)
+    for ds in wait_for_operations(ds_ops, timeout_s=LRO_TIMEOUT_S):
+        print(f"   created {ds.name}")
+
+    # b) Create/Update Schemas (each needs its DataStore, so they start once all of those exist)
+    schema_ops = []
+    for ds_id, schema_id, s in specs:
         print(f"→ Upserting schema {schema_id} on datastore {ds_id}")
-        _ = create_or_update_schema(
+        schema_ops.append(start_create_or_update_schema(
             project_id=project_id,
             location=search_location,
             collection_id=collection_id,
             data_store_id=ds_id,
             schema_id=schema_id,
-            schema_def=json_schema,
+            schema_def=_build_json_schema(s),
             use_json_schema=True,
             # optional: preserve existing to avoid “removing fields” errors
             preserve_existing_on_update=True,
-        )
+        ))
+    wait_for_operations(schema_ops, timeout_s=LRO_TIMEOUT_S)
+    for _, schema_id, _ in specs:
         print(f"   schema upserted: {schema_id}")
 
     print("\n✅ setup_search_infra completed.")
@@ -9,6 +9,7 @@ from shared.config.settings import get_config
 from tools.create_bucket import ensure_bucket
 from tools.export_to_gcs import export_table_to_jsonl  # or export_bq_table_as_de_documents if you added it
 from tools.datastore_engines import ensure_engine_with_datastores, import_from_config
+from shared.clients.search_cache import invalidate_search_caches
 
 
 # --------------------------
@@ -135,6 +136,8 @@ def main():
                     f"   {engine_id} @ {r['data_store_id']}: "
                     f"success={r['success_count']}, failure={r['failure_count']}"
                 )
+            # new documents: cached search results (incl. cached misses) are now wrong
+            invalidate_search_caches()
         except Exception as e:
             print(f"   ⚠️ Engine import failed for {engine_id}: {e}")
 
@@ -0,0 +1,93 @@
+# data/quality/area_assignments.py
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Any, Dict, Iterable, List
+
+from shared.clients.registry import bigquery_client
+from shared.config.settings import get_config
+
+CHECKS = ("match", "mismatch", "no_postcode", "no_polygon")
+
+
+def summary_sql(dataset_id: str) -> str:
+    return f"""
+        SELECT entity_type, postcode_check, COUNT(*) AS n
+        FROM `{dataset_id}.area_assignments`
+        GROUP BY entity_type, postcode_check"""
+
+
+def mismatches_sql(dataset_id: str, limit: int = 20) -> str:
+    """Rows whose containing polygon disagrees with their postcode, with the name and raw postcode."""
+    return f"""
+        SELECT a.entity_type, a.entity_id, COALESCE(p.name, o.name) AS name,
+               COALESCE(p.postcode, o.postcode) AS postcode, a.area_id, a.containing_areas
+        FROM `{dataset_id}.area_assignments` AS a
+        LEFT JOIN `{dataset_id}.poi_entities` AS p ON a.entity_type = 'poi' AND p.id = a.entity_id
+        LEFT JOIN `{dataset_id}.org_locations` AS o ON a.entity_type = 'org' AND o.id = a.entity_id
+        WHERE a.postcode_check = 'mismatch'
+        ORDER BY a.entity_type, a.area_id, a.entity_id
+        LIMIT {int(limit)}"""
+
+
+def summarize(rows: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Per entity type: count per check, and the mismatch rate among rows where both sides are known."""
+    out: Dict[str, Dict[str, Any]] = {}
+    for r in rows:
+        counts = out.setdefault(r["entity_type"], {c: 0 for c in CHECKS})
+        counts[r["postcode_check"]] = counts.get(r["postcode_check"], 0) + int(r["n"])
+    for counts in out.values():
+        comparable = counts["match"] + counts["mismatch"]
+        counts["mismatch_rate"] = round(counts["mismatch"] / comparable, 4) if comparable else None
+    return out
+
+
+def report(summary: Dict[str, Dict[str, Any]], mismatches: List[Dict[str, Any]]) -> str:
+    lines = [f"{'entity':<8} " + " ".join(f"{c:>12}" for c in CHECKS) + f" {'mismatch %':>11}"]
+    for entity, counts in sorted(summary.items()):
+        rate = f"{counts['mismatch_rate']:.1%}" if counts["mismatch_rate"] is not None else "-"
+        lines.append(f"{entity:<8} " + " ".join(f"{counts[c]:>12}" for c in CHECKS) + f" {rate:>11}")
+    if mismatches:
+        lines.append("")
+        lines.append("spatial area ≠ postcode:")
+        for m in mismatches:
+            lines.append(
+                f"  {m['entity_type']:<4} {m['entity_id']:<24} {str(m['name'])[:32]:<32} "
+                f"postcode={m['postcode']!s:<10} area={m['area_id']}"
+            )
+    return "\n".join(lines)
+
+
+def check(client, dataset_id: str, limit: int = 20, job_config=None):
+    """Run the summary and mismatch queries; `job_config` (e.g. budget.query_config) applies to both."""
+    summary = summarize(dict(r) for r in client.query(summary_sql(dataset_id), job_config=job_config).result())
+    mismatches = (
+        [dict(r) for r in client.query(mismatches_sql(dataset_id, limit), job_config=job_config).result()]
+        if limit else []
+    )
+    return summary, mismatches
+
+
+def main():
+    p = argparse.ArgumentParser("Compare point-in-polygon area assignments with the postcode on each row")
+    p.add_argument("--limit", type=int, default=20, help="Mismatching rows to list (0 for counts only)")
+    p.add_argument("--max-mismatch-rate", type=float, default=None,
+                   help="Exit non-zero when any entity type's mismatch rate is above this (e.g. 0.05)")
+    args = p.parse_args()
+
+    cfg = get_config()
+    client = bigquery_client(cfg.PROJECT_ID)
+    dataset_id = f"{cfg.PROJECT_ID}.{cfg.DATASET_NAME}"
+    summary, mismatches = check(client, dataset_id, args.limit)
+    print(report(summary, mismatches))
+
+    if args.max_mismatch_rate is not None:
+        over = [e for e, c in summary.items() if (c["mismatch_rate"] or 0) > args.max_mismatch_rate]
+        if over:
+            print(f"❌ Mismatch rate above {args.max_mismatch_rate:.1%} for: {', '.join(over)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
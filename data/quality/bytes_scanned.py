@@ -0,0 +1,104 @@
+# data/quality/bytes_scanned.py
+from __future__ import annotations
+
+import argparse
+import json
+from typing import Dict, List, Tuple
+
+from shared.clients.registry import bigquery_client
+from shared.config.settings import get_config
+
+# Filters the agent actually issues: spatial radius, postcode and category lookups.
+# Dry runs only give an upper bound (no cluster pruning), so these run for real with
+# the result cache off; each touches a handful of rows, so billing stays at the minimum.
+_POINT = "ST_GEOGPOINT(-122.2712, 37.8044)"   # downtown Oakland
+
+
+def representative_queries(dataset_id: str) -> List[Tuple[str, str]]:
+    return [
+        ("poi_category_near_point", f"""
+            SELECT COUNT(*) FROM `{dataset_id}.poi_entities`
+            WHERE primary_category = 'coffee_shop' AND ST_DWITHIN(geometry, {_POINT}, 2000)"""),
+        ("poi_by_postcode", f"""
+            SELECT COUNT(*) FROM `{dataset_id}.poi_entities` WHERE postcode = '94607'"""),
+        ("org_near_point", f"""
+            SELECT COUNT(*) FROM `{dataset_id}.org_locations` WHERE ST_DWITHIN(geometry, {_POINT}, 5000)"""),
+        ("area_indicators_by_id", f"""
+            SELECT total_pop, median_income FROM `{dataset_id}.area_indicators` WHERE area_id = '94607'"""),
+        ("area_containing_point", f"""
+            SELECT area_id FROM `{dataset_id}.area_boundaries` WHERE ST_CONTAINS(geometry, {_POINT})"""),
+        ("gap_from_area_features", f"""
+            SELECT area_id FROM `{dataset_id}.area_features`
+            WHERE median_income > 70000 AND coffee_shop_within_1km = 0
+            ORDER BY total_pop DESC LIMIT 20"""),
+    ]
+
+
+def measure(client, dataset_id: str) -> Dict[str, Dict[str, int]]:
+    """Bytes processed / billed per representative query."""
+    from google.cloud import bigquery
+
+    cfg = bigquery.QueryJobConfig(use_query_cache=False)
+    out: Dict[str, Dict[str, int]] = {}
+    for name, sql in representative_queries(dataset_id):
+        job = client.query(sql, job_config=cfg)
+        job.result()
+        out[name] = {
+            "bytes_processed": int(job.total_bytes_processed or 0),
+            "bytes_billed": int(job.total_bytes_billed or 0),
+        }
+    return out
+
+
+def compare(before: Dict[str, Dict[str, int]], after: Dict[str, Dict[str, int]]) -> List[Dict[str, object]]:
+    rows = []
+    for name in after:
+        b = (before.get(name) or {}).get("bytes_processed")
+        a = after[name]["bytes_processed"]
+        rows.append({
+            "query": name,
+            "before": b,
+            "after": a,
+            "reduction": round(1 - a / b, 4) if b else None,
+        })
+    return rows
+
+
+def _fmt_bytes(n) -> str:
+    if n is None:
+        return "-"
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if abs(n) < 1024 or unit == "TB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def main():
+    p = argparse.ArgumentParser("Bytes scanned by representative queries, before/after a layout change")
+    p.add_argument("--save", help="Write this run's measurements to a JSON file (e.g. before a change)")
+    p.add_argument("--baseline", help="Compare against measurements saved earlier with --save")
+    args = p.parse_args()
+
+    cfg = get_config()
+    client = bigquery_client(cfg.PROJECT_ID)
+    dataset_id = f"{cfg.PROJECT_ID}.{cfg.DATASET_NAME}"
+    current = measure(client, dataset_id)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"✅ Saved measurements → {args.save}")
+
+    before = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            before = json.load(f)
+
+    print(f"{'query':<26} {'before':>10} {'after':>10} {'reduction':>10}")
+    for row in compare(before, current):
+        red = f"{row['reduction']:.1%}" if row["reduction"] is not None else "-"
+        print(f"{row['query']:<26} {_fmt_bytes(row['before']):>10} {_fmt_bytes(row['after']):>10} {red:>10}")
+
+
+if __name__ == "__main__":
+    main()
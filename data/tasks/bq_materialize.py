@@ -1,58 +1,154 @@
+import argparse
+import asyncio
+import os
+import re
+from typing import List, Sequence, Tuple
+
+from google.api_core import exceptions
 from google.cloud import bigquery
 from shared.config.settings import get_config
+from data.pipelines.budget import MATERIALIZE_MAX_BYTES_BILLED, parse_bytes, plan, plan_report, query_config
+from data.pipelines.dag import Dag, Step
+from data.pipelines.fingerprint import (
+    FileFingerprintStore,
+    LabelFingerprintStore,
+    bigquery_fingerprint,
+    target_table,
+)
+from data.pipelines.operations import OperationManager
+from data.quality.area_assignments import check as check_area_assignments, report as area_assignments_report
+from shared.clients.registry import bigquery_client
+from shared.schemas.adapters import layout_ddl
+
+US_STATES = (
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "DC", "FL", "GA", "HI", "ID", "IL", "IN", "IA", "KS",
+    "KY", "LA", "ME", "MD", "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC",
+    "ND", "OH", "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY",
+)
+_REGION = re.compile(r"^[A-Z]{2}$")
+
+
+def parse_regions(value: str) -> Tuple[str, ...]:
+    """'CA,NY' / 'all' → state codes, in order and de-duplicated. Codes are spliced into SQL, so they are validated."""
+    if value.strip().lower() == "all":
+        return US_STATES
+    out: List[str] = []
+    for code in (c.strip().upper() for c in value.split(",")):
+        if not code:
+            continue
+        if not _REGION.match(code):
+            raise ValueError(f"Invalid region code: {code!r} (expected a two-letter state code such as CA)")
+        if code not in out:
+            out.append(code)
+    if not out:
+        raise ValueError("No regions given")
+    return tuple(out)
+
+
+# One shard per state; OVERTURE_REGION is the older single-region setting
+MATERIALIZE_REGIONS = parse_regions(os.getenv("MATERIALIZE_REGIONS", os.getenv("OVERTURE_REGION", "CA")))
+MATERIALIZE_MAX_PARALLEL = int(os.getenv("MATERIALIZE_MAX_PARALLEL", "8"))
+
+# Tables built per state into `<table>_<state>` and exposed under `<table>` as a UNION ALL view
+SHARDED_TABLES = ("poi_entities", "org_locations", "area_indicators", "area_boundaries")
+
+
+def shard_table(name: str, region: str) -> str:
+    return f"{name}_{region.lower()}"
+
+
+# Café categories kept in poi_entities; the org brand is excluded there and kept in org_locations
+POI_CATEGORIES = ("cafe", "coffee_roastery", "coffee_shop", "hong_kong_style_cafe", "internet_cafe")
+ORG_BRAND = "Blue Bottle Coffee"
+
+# Distance rings (km) counted per area in area_features; nearest-distance search stops at AREA_FEATURE_MAX_KM
+FEATURE_RINGS_KM = (0.5, 1, 2, 5)
+AREA_FEATURE_MAX_KM = float(os.getenv("AREA_FEATURE_MAX_KM", "50"))
+
 
 # --- Paste your full SQL (no ellipses) into these strings ---
-def poi_entities_sql(dataset_id: str) -> str:
+def overture_staging_sql(dataset_id: str, regions: Sequence[str] = MATERIALIZE_REGIONS) -> str:
+    # a place is in a region if any of its addresses is; the address columns come from that address
+    in_regions = f"element.country = 'US' AND element.region IN ({_sql_list(regions)})"
     return f"""
-    -- CREATE OR REPLACE poi_entities (cafes in California, excluding Blue Bottle Coffee)
-    CREATE OR REPLACE TABLE `{dataset_id}.poi_entities` AS 
+    -- CREATE OR REPLACE overture_places_staging: the only scan of overture_maps.place per refresh.
+    -- Café-category places and the org brand with a US address in any of the regions (the only rows
+    -- poi_entities and org_locations read), flattened to the first such address; the per-state shards
+    -- filter this on region, which the table is clustered by.
+    CREATE OR REPLACE TABLE `{dataset_id}.overture_places_staging`
+    {layout_ddl("overture_places_staging")}
+    AS
     SELECT
     id,
     geometry,
-    names.primary AS name,
-    categories.primary AS primary_category,
-    IF
-    (categories.alternate IS NULL, NULL, TO_JSON_STRING((
+    name,
+    primary_category,
+    alternate_category,
+    address.freeform AS freeform,
+    address.locality AS locality,
+    address.postcode AS postcode,
+    address.region AS region,
+    address.country AS country
+    FROM (
+    SELECT
+        id,
+        geometry,
+        names.primary AS name,
+        categories.primary AS primary_category,
+        IF
+        (categories.alternate IS NULL, NULL, TO_JSON_STRING((
+            SELECT
+                ARRAY_AGG(DISTINCT ELEMENT)
+            FROM
+                UNNEST(categories.alternate.list)))) AS alternate_category,
+        (
         SELECT
-            ARRAY_AGG(DISTINCT ELEMENT)
+            element
         FROM
-            UNNEST(categories.alternate.list)))) AS alternate_category,
-    IF
-    (ARRAY_LENGTH(addresses.list)>0, addresses.list[
-    OFFSET
-        (0)].element.freeform, NULL) AS freeform,
-    IF
-    (ARRAY_LENGTH(addresses.list)>0, addresses.list[
-    OFFSET
-        (0)].element.locality, NULL) AS locality,
-    IF
-    (ARRAY_LENGTH(addresses.list)>0, addresses.list[
-    OFFSET
-        (0)].element.postcode, NULL) AS postcode,
-    IF
-    (ARRAY_LENGTH(addresses.list)>0, addresses.list[
-    OFFSET
-        (0)].element.region, NULL) AS region,
-    IF
-    (ARRAY_LENGTH(addresses.list)>0, addresses.list[
-    OFFSET
-        (0)].element.country, NULL) AS country
+            UNNEST(addresses.list) WITH OFFSET AS i
+        WHERE
+            {in_regions}
+        ORDER BY
+            i
+        LIMIT
+            1) AS address
     FROM
-    bigquery-public-data.overture_maps.place
+        bigquery-public-data.overture_maps.place
     WHERE
-    EXISTS (
+        (categories.primary IN ({_sql_list(POI_CATEGORIES)}) OR names.primary = '{ORG_BRAND}')
+        AND EXISTS (
+        SELECT
+            1
+        FROM
+            UNNEST(addresses.list)
+        WHERE
+            {in_regions}))
+    """
+
+def _sql_list(values) -> str:
+    return ", ".join(f'"{v}"' for v in values)
+
+def poi_entities_sql(dataset_id: str, region: str) -> str:
+    return f"""
+    -- CREATE OR REPLACE poi_entities shard (cafes in one state, excluding Blue Bottle Coffee)
+    CREATE OR REPLACE TABLE `{dataset_id}.{shard_table("poi_entities", region)}`
+    {layout_ddl("poi_entities")}
+    AS
     SELECT
-        1
-    FROM
-        UNNEST(addresses.list)
-    WHERE
-        element.region='CA')
-    AND categories.primary IN ("cafe",
-        "coffee_roastery",
-        "coffee_shop",
-        "hong_kong_style_cafe",
-        "internet_cafe")
-    AND names.primary <> 'Blue Bottle Coffee'
+    id,
+    geometry,
+    name,
+    primary_category,
+    alternate_category,
+    freeform,
+    locality,
+    postcode,
+    region,
+    country
+    FROM `{dataset_id}.overture_places_staging`
+    WHERE region = '{region}'
+    AND primary_category IN ({_sql_list(POI_CATEGORIES)})
+    AND name <> '{ORG_BRAND}'
     """
 def poi_entities_search_view_sql(dataset_id: str) -> str:
     return f"""
@@ -69,83 +165,100 @@ def poi_entities_search_view_sql(dataset_id: str) -> str:
     FROM
     `{dataset_id}.poi_entities`;
     """
-def area_indicators_sql(dataset_id: str) -> str:
+def zip_areas_staging_sql(dataset_id: str, regions: Sequence[str] = MATERIALIZE_REGIONS) -> str:
     return f"""
-    -- CREATE OR REPLACE area_indicators by joining ACS to ZIP geometries (California)
-    CREATE OR REPLACE TABLE `{dataset_id}.area_indicators` AS
+    -- CREATE OR REPLACE zip_areas_staging: the only scan of the ZIP boundaries and ACS per refresh.
+    -- Every ZIP in the regions with its geometry and (when ACS has it) demographics; the
+    -- area_indicators and area_boundaries shards filter this on state_code, which it is clustered by.
+    CREATE OR REPLACE TABLE `{dataset_id}.zip_areas_staging`
+    {layout_ddl("zip_areas_staging")}
+    AS
     SELECT
       b.zip_code AS area_id,
-      b.zip_code_geom AS geometry,
+      b.state_code,
       b.city,
       b.county,
+      b.zip_code_geom AS geometry,
+      a.geo_id IS NOT NULL AS has_acs,
       a.total_pop,
       a.households,
       a.median_income
-    FROM `bigquery-public-data.census_bureau_acs.zip_codes_2018_5yr` AS a
-    LEFT JOIN `bigquery-public-data.geo_us_boundaries.zip_codes` AS b
+    FROM `bigquery-public-data.geo_us_boundaries.zip_codes` AS b
+    LEFT JOIN `bigquery-public-data.census_bureau_acs.zip_codes_2018_5yr` AS a
       ON a.geo_id = b.zip_code
-    WHERE b.state_name = 'California'
+    WHERE b.state_code IN ({_sql_list(regions)})
     ;
     """
 
-def area_boundaries_sql(dataset_id: str) -> str:
+def area_indicators_sql(dataset_id: str, region: str) -> str:
     return f"""
-    -- CREATE OR REPLACE area_boundaries (ZIP envelopes + subarea aggregation)
-    CREATE OR REPLACE TABLE `{dataset_id}.area_boundaries` AS
+    -- CREATE OR REPLACE area_indicators shard: one state's ZIPs that have ACS demographics
+    CREATE OR REPLACE TABLE `{dataset_id}.{shard_table("area_indicators", region)}`
+    {layout_ddl("area_indicators")}
+    AS
     SELECT
-      a.zip_code AS area_id,
-      a.city,
-      a.county,
-      a.zip_code_geom AS geometry
-    FROM `bigquery-public-data.geo_us_boundaries.zip_codes` AS a
-    WHERE a.state_name = 'California'
+      area_id,
+      geometry,
+      city,
+      county,
+      total_pop,
+      households,
+      median_income
+    FROM `{dataset_id}.zip_areas_staging`
+    WHERE state_code = '{region}'
+    AND has_acs
     ;
     """
 
-def org_locations_sql(dataset_id: str) -> str:
+def area_boundaries_sql(dataset_id: str, region: str) -> str:
     return f"""
-    -- CREATE OR REPLACE area_boundaries (ZIP envelopes + subarea aggregation)
-    CREATE OR REPLACE TABLE `{dataset_id}.org_locations` AS
+    -- CREATE OR REPLACE area_boundaries shard (one state's ZIP envelopes + subarea aggregation)
+    CREATE OR REPLACE TABLE `{dataset_id}.{shard_table("area_boundaries", region)}`
+    {layout_ddl("area_boundaries")}
+    AS
+    SELECT
+      area_id,
+      city,
+      county,
+      geometry
+    FROM `{dataset_id}.zip_areas_staging`
+    WHERE state_code = '{region}'
+    ;
+    """
+
+def org_locations_sql(dataset_id: str, region: str) -> str:
+    return f"""
+    -- CREATE OR REPLACE org_locations shard (first-party stores in one state, synthetic KPIs)
+    CREATE OR REPLACE TABLE `{dataset_id}.{shard_table("org_locations", region)}`
+    {layout_ddl("org_locations")}
+    AS
     SELECT
     id,
     geometry,
-    names.primary AS name,
+    name,
     cast(ROUND(40000 + RAND() * (100000 - 40000)) as INT64) as revenue_last_year,
     DATE_ADD(
             PARSE_DATE('%Y-%m-%d', '2000-01-01'),
             INTERVAL CAST(FLOOR(RAND() * (DATE_DIFF(PARSE_DATE('%Y-%m-%d', '2024-12-31'), PARSE_DATE('%Y-%m-%d', '2020-01-01'), DAY) + 1)) AS INT64) DAY
         ) AS open_date,
-    IF
-    (ARRAY_LENGTH(addresses.list)>0, addresses.list[
-    OFFSET
-        (0)].element.freeform, NULL) AS freeform,
-    IF
-    (ARRAY_LENGTH(addresses.list)>0, addresses.list[
-    OFFSET
-        (0)].element.locality, NULL) AS locality,
-    IF
-    (ARRAY_LENGTH(addresses.list)>0, addresses.list[
-    OFFSET
-        (0)].element.postcode, NULL) AS postcode,
-    IF
-    (ARRAY_LENGTH(addresses.list)>0, addresses.list[
-    OFFSET
-        (0)].element.region, NULL) AS region,
-    IF
-    (ARRAY_LENGTH(addresses.list)>0, addresses.list[
-    OFFSET
-        (0)].element.country, NULL) AS country
-    FROM
-    bigquery-public-data.overture_maps.place
-    WHERE
-    EXISTS (
-    SELECT
-        1
-    FROM
-        UNNEST(addresses.list)
-    WHERE
-        element.region='CA')
-    AND names.primary = 'Blue Bottle Coffee'
+    freeform,
+    locality,
+    postcode,
+    region,
+    country
+    FROM `{dataset_id}.overture_places_staging`
+    WHERE region = '{region}'
+    AND name = '{ORG_BRAND}'
+    """
+
+def union_view_sql(dataset_id: str, name: str, regions: Sequence[str]) -> str:
+    shards = "\n    UNION ALL\n    ".join(
+        f"SELECT * FROM `{dataset_id}.{shard_table(name, r)}`" for r in regions
+    )
+    return f"""
+    -- CREATE OR REPLACE {name} as the union of its per-state shards
+    CREATE OR REPLACE VIEW `{dataset_id}.{name}` AS
+    {shards}
     """
 
 def org_locations_search_view_sql(dataset_id: str) -> str:
@@ -163,33 +276,290 @@ def org_locations_search_view_sql(dataset_id: str) -> str:
     ;
     """
 
+def area_assignments_sql(dataset_id: str) -> str:
+    return f"""
+    -- CREATE OR REPLACE area_assignments: containing ZIP polygon for every POI and store, by geometry.
+    -- Query-time area joins use this mapping instead of ST_CONTAINS or the free-text postcode.
+    CREATE OR REPLACE TABLE `{dataset_id}.area_assignments`
+    {layout_ddl("area_assignments")}
+    AS
+    WITH entities AS (
+      SELECT 'poi' AS entity_type, id AS entity_id, geometry, postcode FROM `{dataset_id}.poi_entities`
+      UNION ALL
+      SELECT 'org' AS entity_type, id AS entity_id, geometry, postcode FROM `{dataset_id}.org_locations`
+    ),
+    contained AS (
+      -- a point on a shared edge can fall in two polygons; keep the lowest area_id and count them
+      SELECT e.entity_type, e.entity_id, MIN(b.area_id) AS area_id, COUNT(*) AS containing_areas
+      FROM entities AS e
+      JOIN `{dataset_id}.area_boundaries` AS b
+        ON ST_CONTAINS(b.geometry, e.geometry)
+      GROUP BY e.entity_type, e.entity_id
+    ),
+    assigned AS (
+      SELECT
+        e.entity_type,
+        e.entity_id,
+        c.area_id,
+        IFNULL(c.containing_areas, 0) AS containing_areas,
+        REGEXP_EXTRACT(e.postcode, r'^\\s*(\\d{{5}})') AS postcode_area_id
+      FROM entities AS e
+      LEFT JOIN contained AS c
+        USING (entity_type, entity_id)
+    )
+    SELECT
+      *,
+      CASE
+        WHEN area_id IS NULL THEN 'no_polygon'
+        WHEN postcode_area_id IS NULL THEN 'no_postcode'
+        WHEN postcode_area_id = area_id THEN 'match'
+        ELSE 'mismatch'
+      END AS postcode_check
+    FROM assigned
+    """
+
+def _ring(km: float) -> str:
+    return f"{km:g}".replace(".", "_") + "km"
+
+
+def area_feature_columns() -> List[str]:
+    """Ring-count columns of area_features, in table order: all competitors, then per POI category."""
+    cols = [f"competitors_within_{_ring(km)}" for km in FEATURE_RINGS_KM]
+    cols += [f"{cat}_within_{_ring(km)}" for cat in POI_CATEGORIES for km in FEATURE_RINGS_KM]
+    return cols
+
+
+def area_features_sql(dataset_id: str, max_km: float = AREA_FEATURE_MAX_KM) -> str:
+    counts = [f"COUNTIF(d <= {km * 1000:g}) AS competitors_within_{_ring(km)}" for km in FEATURE_RINGS_KM]
+    counts += [
+        f"COUNTIF(primary_category = '{cat}' AND d <= {km * 1000:g}) AS {cat}_within_{_ring(km)}"
+        for cat in POI_CATEGORIES for km in FEATURE_RINGS_KM
+    ]
+    count_cols = ",\n        ".join(counts)
+    ring_cols = ",\n      ".join(f"IFNULL(f.{c}, 0) AS {c}" for c in area_feature_columns())
+    return f"""
+    -- CREATE OR REPLACE area_features: per-area competitor density and nearest distances joined to ACS,
+    -- so gap/rank questions are a filter + sort instead of a distance join per question.
+    -- Distances are to the ZIP polygon (0 inside it), in metres; NULL means nothing within {max_km:g} km.
+    CREATE OR REPLACE TABLE `{dataset_id}.area_features`
+    {layout_ddl("area_features")}
+    AS
+    WITH areas AS (
+      SELECT area_id, geometry, city, county, total_pop, households, median_income
+      FROM `{dataset_id}.area_indicators`
+      WHERE geometry IS NOT NULL
+    ),
+    -- ring counts only need pairs out to the largest ring
+    poi_pairs AS (
+      SELECT a.area_id, p.primary_category, ST_DISTANCE(a.geometry, p.geometry) AS d
+      FROM areas AS a
+      JOIN `{dataset_id}.poi_entities` AS p
+        ON ST_DWITHIN(a.geometry, p.geometry, {max(FEATURE_RINGS_KM) * 1000:g})
+    ),
+    poi_features AS (
+      SELECT
+        area_id,
+        {count_cols}
+      FROM poi_pairs
+      GROUP BY area_id
+    ),
+    poi_nearest AS (
+      SELECT a.area_id, MIN(ST_DISTANCE(a.geometry, p.geometry)) AS nearest_competitor_m
+      FROM areas AS a
+      JOIN `{dataset_id}.poi_entities` AS p
+        ON ST_DWITHIN(a.geometry, p.geometry, {max_km * 1000:g})
+      GROUP BY a.area_id
+    ),
+    org_features AS (
+      SELECT a.area_id, MIN(ST_DISTANCE(a.geometry, o.geometry)) AS nearest_org_m
+      FROM areas AS a
+      JOIN `{dataset_id}.org_locations` AS o
+        ON ST_DWITHIN(a.geometry, o.geometry, {max_km * 1000:g})
+      GROUP BY a.area_id
+    )
+    SELECT
+      a.area_id,
+      a.city,
+      a.county,
+      a.total_pop,
+      a.households,
+      a.median_income,
+      {ring_cols},
+      n.nearest_competitor_m,
+      o.nearest_org_m
+    FROM areas AS a
+    LEFT JOIN poi_features AS f USING (area_id)
+    LEFT JOIN poi_nearest AS n USING (area_id)
+    LEFT JOIN org_features AS o USING (area_id)
+    """
+
 def ensure_dataset(client: bigquery.Client, dataset_id: str, location: str):
     ds = bigquery.Dataset(dataset_id)
     ds.location = location
     return client.create_dataset(ds, exists_ok=True)
 
 
-def run_query(client: bigquery.Client, sql: str, label: str):
-    job = client.query(sql)
-    job.result()
-    print(f"✅ {label}")
+# sharded table → (per-state SQL generator, steps each shard depends on)
+_SHARD_BUILDERS = {
+    "poi_entities": (poi_entities_sql, ("overture_places_staging",)),
+    "org_locations": (org_locations_sql, ("overture_places_staging",)),
+    "area_indicators": (area_indicators_sql, ("zip_areas_staging",)),
+    "area_boundaries": (area_boundaries_sql, ("zip_areas_staging",)),
+}
+
+
+def materialize_steps(dataset_id: str, regions: Sequence[str] = MATERIALIZE_REGIONS) -> List[Step]:
+    """
+    Overture and the ZIP/ACS sources are each scanned once (for all regions) into a
+    staging table. Each sharded table is built per state as `<table>_<state>` from
+    its staging table, and `<table>` is a view over its shards.
+    Each *_search table only needs its base view; area_assignments and
+    area_features join the POI and store views to the area views.
+    """
+    steps = [
+        Step("overture_places_staging", overture_staging_sql(dataset_id, regions)),
+        Step("zip_areas_staging", zip_areas_staging_sql(dataset_id, regions)),
+    ]
+    for name in SHARDED_TABLES:
+        build, deps = _SHARD_BUILDERS[name]
+        shards = [shard_table(name, r) for r in regions]
+        steps += [Step(shard, build(dataset_id, r), deps=deps) for shard, r in zip(shards, regions)]
+        steps.append(Step(name, union_view_sql(dataset_id, name, regions), deps=tuple(shards)))
+    steps += [
+        Step("poi_entities_search", poi_entities_search_view_sql(dataset_id), deps=("poi_entities",)),
+        Step("org_locations_search", org_locations_search_view_sql(dataset_id), deps=("org_locations",)),
+        Step(
+            "area_assignments",
+            area_assignments_sql(dataset_id),
+            deps=("poi_entities", "org_locations", "area_boundaries"),
+        ),
+        Step(
+            "area_features",
+            area_features_sql(dataset_id),
+            deps=("area_indicators", "poi_entities", "org_locations"),
+        ),
+    ]
+    return steps
+
+
+_CREATE_VIEW = re.compile(r"^\s*CREATE\s+(?:OR\s+REPLACE\s+)?VIEW\b", re.I | re.M)
+
+
+def _drop_table_in_way_of_view(client: bigquery.Client, table_id: str) -> None:
+    """Before sharding, the base names were tables; BigQuery won't replace a table with a view."""
+    try:
+        existing = client.get_table(table_id)
+    except exceptions.NotFound:
+        return
+    if getattr(existing, "table_type", None) == "TABLE":
+        client.delete_table(table_id)
+        print(f"🗑️  Dropped table {table_id} to replace it with a view over its shards")
+
+
+def bigquery_runner(
+    client: bigquery.Client,
+    manager: OperationManager = None,
+    store=None,
+    force: bool = False,
+    max_bytes_billed: int = MATERIALIZE_MAX_BYTES_BILLED,
+):
+    """
+    DAG runner that submits each step's SQL as a BigQuery job and polls it without blocking.
+
+    With a fingerprint `store`, a step whose SQL and source tables' last-modified
+    times match the stored fingerprint is skipped (metadata calls only) unless
+    `force` is set. The fingerprint is recorded after a successful build.
+
+    Every job carries `maximum_bytes_billed`, so BigQuery rejects a step whose
+    estimate exceeds the cap before it reads anything.
+
+    A failed shard has no fingerprint recorded, so rerunning rebuilds just that
+    shard (and what depends on it); shards that succeeded are skipped.
+    """
+    manager = manager or OperationManager()
+
+    async def run(step: Step):
+        target = target_table(step.payload)
+        fp = None
+        if store is not None and target:
+            # computed when the step starts, so upstream tables rebuilt earlier in this run are seen
+            fp = await asyncio.to_thread(bigquery_fingerprint, client, step.payload)
+            if not force and await asyncio.to_thread(store.get, target) == fp:
+                print(f"⏭️  {step.name} unchanged ({fp[:12]})")
+                return {"status": "unchanged", "fingerprint": fp, "bytes_billed": 0}
+        if target and _CREATE_VIEW.search(step.payload):
+            await asyncio.to_thread(_drop_table_in_way_of_view, client, target)
+
+        job = await asyncio.to_thread(
+            client.query,
+            step.payload,
+            job_config=query_config(max_bytes_billed),
+            job_id_prefix=f"materialize_{step.name}_",
+        )
+        await manager.submit(job, label=step.name)
+        if fp is not None:
+            await asyncio.to_thread(store.put, target, fp)
+        billed = int(job.total_bytes_billed or 0)
+        print(f"✅ {step.name} created ({job.job_id}, {billed / 2**30:.2f} GiB billed)")
+        return {"status": "built", "fingerprint": fp, "job_id": job.job_id, "bytes_billed": billed}
+
+    return run
+
+
+def bytes_billed_report(result) -> str:
+    """Per-step status and bytes billed for a finished run, with the total."""
+    lines = [f"{'step':<26} {'status':<10} {'GiB billed':>10}"]
+    total = 0
+    for name in result.order:
+        r = result.nodes[name].result
+        if r is None:   # failed or skipped under --keep-going
+            lines.append(f"{name:<26} {result.nodes[name].state:<10} {'-':>10}")
+            continue
+        total += r["bytes_billed"]
+        lines.append(f"{name:<26} {r['status']:<10} {r['bytes_billed'] / 2**30:>10.2f}")
+    lines.append(f"{'total':<26} {'':<10} {total / 2**30:>10.2f}")
+    return "\n".join(lines)
+
 
 def main():
+    p = argparse.ArgumentParser("Materialize BigQuery tables, skipping steps whose inputs are unchanged")
+    p.add_argument("--force", action="store_true", help="Rebuild every table even if its fingerprint matches")
+    p.add_argument("--state-file", default=None, help="Keep fingerprints in this JSON file instead of table labels")
+    p.add_argument("--plan", action="store_true", help="Dry-run every step and print estimated bytes; builds nothing")
+    p.add_argument("--max-bytes-billed", type=parse_bytes, default=MATERIALIZE_MAX_BYTES_BILLED,
+                   help="Per-job cap such as 50GB; 0 disables (default from MATERIALIZE_MAX_BYTES_BILLED)")
+    p.add_argument("--regions", type=parse_regions, default=MATERIALIZE_REGIONS,
+                   help="Comma-separated state codes to build shards for, or 'all' (default from MATERIALIZE_REGIONS)")
+    p.add_argument("--max-parallel", type=int, default=MATERIALIZE_MAX_PARALLEL,
+                   help="Maximum BigQuery jobs running at once")
+    p.add_argument("--keep-going", action="store_true",
+                   help="Keep building other shards after a failure; rerun to retry only the failed ones")
+    args = p.parse_args()
+
     cfg = get_config()
-    client = bigquery.Client(project=cfg.PROJECT_ID)
+    client = bigquery_client(cfg.PROJECT_ID)
     dataset_id = f"{cfg.PROJECT_ID}.{cfg.DATASET_NAME}"
 
+    steps = materialize_steps(dataset_id, args.regions)
+    if args.plan:
+        print(plan_report(plan(client, steps, args.max_bytes_billed), args.max_bytes_billed))
+        return
+
     ensure_dataset(client, dataset_id, cfg.GOOGLE_CLOUD_LOCATION)
     print(f"✅ Dataset ready: {dataset_id} [{cfg.GOOGLE_CLOUD_LOCATION}]")
 
-    # Create/refresh the three core tables
-    run_query(client, poi_entities_sql(dataset_id), "poi_entities created")
-    run_query(client, poi_entities_search_view_sql(dataset_id), "poi_entities search view created")
-    run_query(client, area_indicators_sql(dataset_id), "area_indicators created")
-    run_query(client, area_boundaries_sql(dataset_id), "area_boundaries created")
-    run_query(client, org_locations_sql(dataset_id), "org_locations created")
-    run_query(client, org_locations_search_view_sql(dataset_id), "org_locations search view created")
-
+    store = FileFingerprintStore(args.state_file) if args.state_file else LabelFingerprintStore(client)
+    # Create/refresh the core tables; independent steps run as concurrent jobs
+    runner = bigquery_runner(client, store=store, force=args.force, max_bytes_billed=args.max_bytes_billed)
+    result = Dag(steps).run(runner, max_parallel=args.max_parallel, fail_fast=not args.keep_going)
+    print(result.timeline())
+    print(bytes_billed_report(result))
+    result.raise_for_failure()
+    # where the spatial assignment and the postcode disagree; only worth re-reading when it was rebuilt
+    assignments = result.nodes.get("area_assignments")
+    if assignments is not None and (assignments.result or {}).get("status") == "built":
+        checks = check_area_assignments(client, dataset_id, limit=10, job_config=query_config(args.max_bytes_billed))
+        print(area_assignments_report(*checks))
 
 
 if __name__ == "__main__":
@@ -1,4 +1,4 @@
-from google.cloud import storage
+from shared.clients.registry import storage_client
 
 def ensure_bucket(bucket_name: str, location: str = "US"):
     """
@@ -8,7 +8,7 @@ def ensure_bucket(bucket_name: str, location: str = "US"):
         bucket_name: name of the GCS bucket
         location: region (e.g., "US", "us-central1")
     """
-    client = storage.Client()
+    client = storage_client()
 
     try:
         bucket = client.get_bucket(bucket_name)
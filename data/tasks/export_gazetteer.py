@@ -0,0 +1,63 @@
+# data/tasks/export_gazetteer.py
+import argparse
+import json
+import os
+
+from shared.clients.gazetteer_search import GAZETTEER_SNAPSHOT_PATH
+from shared.clients.registry import bigquery_client
+from shared.config.settings import get_config
+
+
+def gazetteer_snapshot_sql(dataset_id: str) -> str:
+    return f"""
+    -- One row per area with its centroid and bbox, for the in-process gazetteer
+    SELECT
+      b.area_id,
+      b.city,
+      b.county,
+      ST_X(ST_CENTROID(b.geometry)) AS centroid_lng,
+      ST_Y(ST_CENTROID(b.geometry)) AS centroid_lat,
+      ST_BOUNDINGBOX(b.geometry).xmin AS xmin,
+      ST_BOUNDINGBOX(b.geometry).ymin AS ymin,
+      ST_BOUNDINGBOX(b.geometry).xmax AS xmax,
+      ST_BOUNDINGBOX(b.geometry).ymax AS ymax
+    FROM `{dataset_id}.area_boundaries` AS b
+    WHERE b.geometry IS NOT NULL
+    ORDER BY b.area_id
+    """
+
+
+def write_snapshot(rows, path: str) -> int:
+    """Write rows as JSONL and atomically replace `path`, so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    n = 0
+    with open(tmp, "w", encoding="utf-8") as f:
+        for r in rows:
+            f.write(json.dumps({
+                "area_id": str(r["area_id"]),
+                "city": r["city"],
+                "county": r["county"],
+                "centroid": [r["centroid_lng"], r["centroid_lat"]],
+                "bbox": [r["xmin"], r["ymin"], r["xmax"], r["ymax"]],
+            }) + "\n")
+            n += 1
+    os.replace(tmp, path)
+    return n
+
+
+def main():
+    p = argparse.ArgumentParser("Export area_boundaries to the local gazetteer snapshot")
+    p.add_argument("--out", default=GAZETTEER_SNAPSHOT_PATH)
+    args = p.parse_args()
+
+    cfg = get_config()
+    client = bigquery_client(cfg.PROJECT_ID)
+    dataset_id = f"{cfg.PROJECT_ID}.{cfg.DATASET_NAME}"
+    rows = client.query(gazetteer_snapshot_sql(dataset_id)).result()
+    n = write_snapshot(rows, args.out)
+    print(f"✅ gazetteer snapshot: {n} areas → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# data/tasks/export_suggest.py
+import argparse
+import json
+import os
+from typing import Iterable, List
+
+from shared.clients.registry import bigquery_client
+from shared.clients.suggest_index import SUGGEST_EXPORT_FILES
+from shared.config.settings import get_config
+
+
+def suggest_export_paths(spec: str = SUGGEST_EXPORT_FILES) -> List[str]:
+    return [p.strip() for p in spec.split(",") if p.strip()]
+
+
+def source_table(path: str) -> str:
+    """`.cache/search_exports/poi_entities_search.jsonl` → `poi_entities_search`."""
+    return os.path.basename(path).split(".")[0]
+
+
+def suggest_docs_sql(dataset_id: str, table: str) -> str:
+    return f"""
+    -- The fields /suggest indexes, in the same {{id, structData}} shape as the GCS search export
+    SELECT
+      id,
+      structData.name,
+      structData.street_address,
+      structData.locality,
+      structData.postcode
+    FROM `{dataset_id}.{table}`
+    """
+
+
+def write_docs(rows: Iterable, path: str) -> int:
+    """Write rows as JSONL and atomically replace `path`; the suggest service picks the new file up on its next check."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    n = 0
+    with open(tmp, "w", encoding="utf-8") as f:
+        for r in rows:
+            f.write(json.dumps({
+                "id": str(r["id"]),
+                "structData": {
+                    "name": r["name"],
+                    "street_address": r["street_address"],
+                    "locality": r["locality"],
+                    "postcode": r["postcode"],
+                },
+            }, ensure_ascii=False) + "\n")
+            n += 1
+    os.replace(tmp, path)
+    return n
+
+
+def main():
+    p = argparse.ArgumentParser("Export the *_search tables to the local files behind /v1/suggest")
+    p.add_argument("--files", default=SUGGEST_EXPORT_FILES,
+                   help="Comma-separated output files; each file's name is the table it is exported from")
+    args = p.parse_args()
+
+    cfg = get_config()
+    client = bigquery_client(cfg.PROJECT_ID)
+    dataset_id = f"{cfg.PROJECT_ID}.{cfg.DATASET_NAME}"
+    for path in suggest_export_paths(args.files):
+        table = source_table(path)
+        n = write_docs(client.query(suggest_docs_sql(dataset_id, table)).result(), path)
+        print(f"✅ suggest export: {n} docs from {table} → {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 # tools/export_to_gcs.py
 from __future__ import annotations
 from google.cloud import bigquery
-from google.api_core.client_info import ClientInfo
+from shared.clients.registry import bigquery_client
 
 def _normalize_path(p: str) -> str:
     # remove accidental leading slashes; GCS URIs must be gs://bucket/dir/file
@@ -36,11 +36,7 @@ def export_table_to_jsonl(
     table_id = f"{project_id}.{dataset}.{table}"
     destination_uri = f"gs://{gcs_bucket}/{gcs_path}"
 
-    client_kwargs = {}
-    if user_agent:
-        client_kwargs["client_info"] = ClientInfo(user_agent=user_agent)
-
-    client = bigquery.Client(project=project_id, **client_kwargs)
+    client = bigquery_client(project_id, user_agent=user_agent)
 
     job_config = bigquery.job.ExtractJobConfig(
         destination_format=bigquery.DestinationFormat.NEWLINE_DELIMITED_JSON
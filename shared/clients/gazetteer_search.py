@@ -1,5 +1,283 @@
+# shared/clients/gazetteer_search.py
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+GAZETTEER_SNAPSHOT_PATH = os.getenv("GAZETTEER_SNAPSHOT_PATH", ".cache/gazetteer.jsonl")
+GAZETTEER_REFRESH_S = float(os.getenv("GAZETTEER_REFRESH_S", "5"))
+
+_PUNCT = re.compile(r"[\W_]+", re.UNICODE)
+_KIND_ORDER = {"zip": 0, "city": 1, "county": 2}
+
+BBox = Tuple[float, float, float, float]   # min_lng, min_lat, max_lng, max_lat
+
+
+def _norm(text: str) -> str:
+    return " ".join(_PUNCT.sub(" ", (text or "").casefold()).split())
+
+
+@dataclass(frozen=True)
+class AreaRow:
+    """One `area_boundaries` row as exported to the snapshot (area_id is the ZIP)."""
+    area_id: str
+    city: Optional[str]
+    county: Optional[str]
+    centroid: Tuple[float, float]            # lng, lat
+    bbox: BBox
+
+    @classmethod
+    def from_json(cls, d: Dict[str, Any]) -> "AreaRow":
+        return cls(
+            area_id=str(d["area_id"]),
+            city=d.get("city") or None,
+            county=d.get("county") or None,
+            centroid=tuple(d["centroid"]),
+            bbox=tuple(d["bbox"]),
+        )
+
+    def keys(self) -> List[Tuple[str, str, str]]:
+        """(normalized key, kind, display name) for every way this row can be looked up."""
+        out = [(self.area_id, "zip", self.area_id)]
+        if self.city:
+            out.append((_norm(self.city), "city", self.city))
+        if self.county:
+            county = _norm(self.county)
+            out.append((county, "county", self.county))
+            if county.endswith(" county"):
+                out.append((county[: -len(" county")], "county", self.county))
+            else:
+                out.append((f"{county} county", "county", self.county))
+        return out
+
+
+@dataclass(frozen=True)
+class GazetteerHit:
+    kind: str                                # zip | city | county
+    name: str
+    area_ids: Tuple[str, ...]
+    centroid: Tuple[float, float]            # mean of member centroids
+    bbox: BBox                               # union of member bboxes
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "area_ids": list(self.area_ids),
+            "centroid": list(self.centroid),
+            "bbox": list(self.bbox),
+        }
+
+
+def _aggregate(kind: str, name: str, rows: List[AreaRow]) -> GazetteerHit:
+    rows = sorted(rows, key=lambda r: r.area_id)
+    n = len(rows)
+    return GazetteerHit(
+        kind=kind,
+        name=name,
+        area_ids=tuple(r.area_id for r in rows),
+        centroid=(sum(r.centroid[0] for r in rows) / n, sum(r.centroid[1] for r in rows) / n),
+        bbox=(
+            min(r.bbox[0] for r in rows),
+            min(r.bbox[1] for r in rows),
+            max(r.bbox[2] for r in rows),
+            max(r.bbox[3] for r in rows),
+        ),
+    )
+
+
+# --------------------------
+# Index
+# --------------------------
+
+class GazetteerIndex:
+    """
+    Immutable lookup tables over the area snapshot:
+
+    - `members`: (key, kind) → area_ids
+    - `hits`:    key → precomputed GazetteerHit list (exact lookups are one dict probe)
+    - `sorted_keys`: for prefix lookups by bisection
+
+    `apply` returns a new index built by copy-on-write, recomputing only the keys
+    touched by added, changed or removed rows.
+    """
+
+    def __init__(
+        self,
+        rows: Dict[str, AreaRow],
+        members: Dict[Tuple[str, str], FrozenSet[str]],
+        names: Dict[Tuple[str, str], str],
+        hits: Dict[str, Tuple[GazetteerHit, ...]],
+        sorted_keys: List[str],
+    ):
+        self.rows = rows
+        self._members = members
+        self._names = names
+        self._hits = hits
+        self._sorted_keys = sorted_keys
+
+    @classmethod
+    def empty(cls) -> "GazetteerIndex":
+        return cls({}, {}, {}, {}, [])
+
+    @classmethod
+    def build(cls, rows: List[AreaRow]) -> "GazetteerIndex":
+        return cls.empty().apply({r.area_id: r for r in rows})
+
+    def apply(self, new_rows: Dict[str, AreaRow]) -> "GazetteerIndex":
+        """Index for `new_rows`, reusing every entry whose rows did not change."""
+        changed = [aid for aid, r in new_rows.items() if self.rows.get(aid) != r]
+        removed = [aid for aid in self.rows if aid not in new_rows]
+        if not changed and not removed:
+            return self
+
+        members = dict(self._members)
+        names = dict(self._names)
+        touched = set()
+        for aid in changed + removed:
+            old = self.rows.get(aid)
+            if old is not None:
+                for key, kind, _ in old.keys():
+                    members[(key, kind)] = members[(key, kind)] - {aid}
+                    touched.add((key, kind))
+        for aid in changed:
+            for key, kind, name in new_rows[aid].keys():
+                members[(key, kind)] = members.get((key, kind), frozenset()) | {aid}
+                names[(key, kind)] = name
+                touched.add((key, kind))
+
+        hits = dict(self._hits)
+        for key in {k for k, _ in touched}:
+            per_key = []
+            for kind in _KIND_ORDER:
+                ids = members.get((key, kind))
+                if not ids:
+                    members.pop((key, kind), None)
+                    names.pop((key, kind), None)
+                    continue
+                per_key.append(_aggregate(kind, names[(key, kind)], [new_rows[a] for a in ids]))
+            if per_key:
+                hits[key] = tuple(per_key)
+            else:
+                hits.pop(key, None)
+
+        sorted_keys = self._sorted_keys
+        if set(hits) != set(self._hits):
+            sorted_keys = sorted(hits)
+        return GazetteerIndex(dict(new_rows), members, names, hits, sorted_keys)
+
+    def exact(self, text: str) -> List[GazetteerHit]:
+        return list(self._hits.get(_norm(text), ()))
+
+    def prefix(self, text: str, limit: int = 10) -> List[GazetteerHit]:
+        p = _norm(text)
+        if not p:
+            return []
+        out: List[GazetteerHit] = []
+        i = bisect.bisect_left(self._sorted_keys, p)
+        while i < len(self._sorted_keys) and len(out) < limit:
+            key = self._sorted_keys[i]
+            if not key.startswith(p):
+                break
+            out.extend(self._hits[key])
+            i += 1
+        return out[:limit]
+
+    def __len__(self) -> int:
+        return len(self._hits)
+
+
+def read_snapshot(path: str) -> Dict[str, AreaRow]:
+    rows: Dict[str, AreaRow] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                row = AreaRow.from_json(json.loads(line))
+                rows[row.area_id] = row
+    return rows
+
+
+# --------------------------
+# Client
+# --------------------------
+
 class GazetteerSearchClient:
-    def __init__(self, project_id: str, location: str):
+    """
+    Place lookups ("Oakland", "Santa Clara County", "94107") answered from an
+    in-memory index over the local area snapshot (see data/tasks/export_gazetteer.py).
+
+    The snapshot is stat()ed at most every `refresh_s`; when it was regenerated,
+    only the rows that differ are re-indexed and the new index replaces the old one
+    with a single reference swap, so readers never take a lock.
+    """
+
+    def __init__(
+        self,
+        project_id: str,
+        location: str,
+        snapshot_path: str = GAZETTEER_SNAPSHOT_PATH,
+        refresh_s: float = GAZETTEER_REFRESH_S,
+    ):
         self.project_id = project_id; self.location = location
+        self.snapshot_path = snapshot_path
+        self.refresh_s = refresh_s
+        self._index = GazetteerIndex.empty()
+        self._stat: Optional[Tuple[int, int]] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def _snapshot_stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.snapshot_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def refresh(self, force: bool = False) -> bool:
+        """Re-read the snapshot if it changed on disk. Returns True when the index changed."""
+        with self._lock:
+            self._next_check = time.monotonic() + self.refresh_s
+            stat = self._snapshot_stat()
+            if stat is None or (stat == self._stat and not force):
+                return False
+            rows = read_snapshot(self.snapshot_path)
+            old = self._index
+            self._index = old.apply(rows)
+            self._stat = stat
+            return self._index is not old
+
+    def _current(self) -> GazetteerIndex:
+        if time.monotonic() >= self._next_check:
+            self.refresh()
+        return self._index
+
+    def lookup(self, name: str) -> List[GazetteerHit]:
+        return self._current().exact(name)
+
+    def prefix(self, text: str, limit: int = 10) -> List[GazetteerHit]:
+        return self._current().prefix(text, limit)
+
     def search(self, query: str):
-        return {"results": [], "query": query}
+        """
+        Exact match on the whole query, else the longest word span of the query that
+        names a place ("coffee near downtown oakland" → Oakland), else prefix matches.
+        """
+        index = self._current()
+        hits = index.exact(query)
+        if not hits:
+            words = _norm(query).split()
+            for size in range(len(words), 0, -1):
+                for start in range(len(words) - size + 1):
+                    hits.extend(index.exact(" ".join(words[start:start + size])))
+                if hits:
+                    break
+        if not hits:
+            hits = index.prefix(query)
+        return {"results": [h.to_dict() for h in hits], "query": query}
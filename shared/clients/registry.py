@@ -0,0 +1,162 @@
+# shared/clients/registry.py
+from __future__ import annotations
+
+import atexit
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+Key = Tuple[str, Optional[str], Optional[str], Optional[str]]   # kind, project, endpoint/location, user agent
+
+
+def _close(client: Any) -> None:
+    """Best-effort release of a client's sockets / gRPC channel."""
+    for path in (("close",), ("transport", "close"), ("_http", "close")):
+        obj = client
+        try:
+            for attr in path:
+                obj = getattr(obj, attr)
+        except AttributeError:
+            continue
+        try:
+            obj()
+        except Exception:
+            pass
+        return
+    # google-genai keeps its httpx client on the private api client
+    api = getattr(client, "_api_client", None)
+    httpx_client = getattr(api, "_httpx_client", None) if api is not None else None
+    if httpx_client is not None:
+        try:
+            httpx_client.close()
+        except Exception:
+            pass
+
+
+class ClientRegistry:
+    """
+    Lazily builds one client per (kind, project, endpoint/location, user agent) and
+    hands the same instance to every caller. The Google clients used here are safe
+    to share across threads, and sharing them reuses auth and the HTTP/gRPC channel.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Key, Any] = {}
+        self._locks: Dict[Key, threading.Lock] = defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+        self._constructed: Dict[str, int] = defaultdict(int)
+        self._construct_s: Dict[str, float] = defaultdict(float)
+        self._hits: Dict[str, int] = defaultdict(int)
+
+    def get(
+        self,
+        kind: str,
+        factory: Callable[[], Any],
+        *,
+        project: Optional[str] = None,
+        location: Optional[str] = None,
+        user_agent: Optional[str] = None,
+    ) -> Any:
+        key: Key = (kind, project or None, location or None, user_agent or None)
+        client = self._clients.get(key)
+        if client is not None:
+            self._hits[kind] += 1
+            return client
+        with self._lock:
+            key_lock = self._locks[key]
+        with key_lock:
+            client = self._clients.get(key)
+            if client is None:
+                t0 = time.perf_counter()
+                client = factory()
+                with self._lock:
+                    self._constructed[kind] += 1
+                    self._construct_s[kind] += time.perf_counter() - t0
+                    self._clients[key] = client
+            else:
+                self._hits[kind] += 1
+        return client
+
+    def close(self, kind: Optional[Hashable] = None) -> int:
+        """Close and forget every client (or every client of `kind`). Returns how many."""
+        with self._lock:
+            keys = [k for k in self._clients if kind is None or k[0] == kind]
+            clients = [self._clients.pop(k) for k in keys]
+        for c in clients:
+            _close(c)
+        return len(clients)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            kinds = set(self._constructed) | set(self._hits)
+            live = defaultdict(int)
+            for k in self._clients:
+                live[k[0]] += 1
+            return {
+                kind: {
+                    "constructed": self._constructed[kind],
+                    "construct_ms": round(self._construct_s[kind] * 1000, 1),
+                    "reused": self._hits[kind],
+                    "live": live[kind],
+                }
+                for kind in sorted(kinds)
+            }
+
+
+REGISTRY = ClientRegistry()
+atexit.register(REGISTRY.close)
+
+
+def shutdown_clients() -> int:
+    return REGISTRY.close()
+
+
+def client_stats() -> Dict[str, Dict[str, Any]]:
+    return REGISTRY.stats()
+
+
+# --------------------------
+# Typed accessors
+# --------------------------
+
+def bigquery_client(project: Optional[str] = None, user_agent: Optional[str] = None, location: Optional[str] = None):
+    from google.cloud import bigquery
+
+    def build():
+        kwargs: Dict[str, Any] = {}
+        if user_agent:
+            from google.api_core.client_info import ClientInfo
+            kwargs["client_info"] = ClientInfo(user_agent=user_agent)
+        if location:
+            kwargs["location"] = location
+        return bigquery.Client(project=project, **kwargs)
+
+    return REGISTRY.get("bigquery", build, project=project, location=location, user_agent=user_agent)
+
+
+def storage_client(project: Optional[str] = None):
+    from google.cloud import storage
+
+    return REGISTRY.get("storage", lambda: storage.Client(project=project), project=project)
+
+
+def discovery_endpoint(location: Optional[str]) -> str:
+    # Discovery Engine uses regional endpoints except for "global"
+    loc = (location or "global").lower()
+    return "discoveryengine.googleapis.com" if loc == "global" else f"{loc}-discoveryengine.googleapis.com"
+
+
+def discovery_client(service: str, location: Optional[str] = None):
+    """`discovery_client("EngineServiceClient", "global")` – any discoveryengine_v1 service client."""
+    from google.api_core.client_options import ClientOptions
+    from google.cloud import discoveryengine_v1 as de
+
+    endpoint = discovery_endpoint(location)
+    cls = getattr(de, service)
+    return REGISTRY.get(
+        f"discoveryengine.{service}",
+        lambda: cls(client_options=ClientOptions(api_endpoint=endpoint)),
+        location=endpoint,
+    )
+
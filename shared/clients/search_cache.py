@@ -0,0 +1,200 @@
+# shared/clients/search_cache.py
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "10000"))
+SEARCH_CACHE_TTL_S = float(os.getenv("SEARCH_CACHE_TTL_S", "3600"))
+SEARCH_CACHE_NEGATIVE_TTL_S = float(os.getenv("SEARCH_CACHE_NEGATIVE_TTL_S", "300"))
+SEARCH_CACHE_STALE_S = float(os.getenv("SEARCH_CACHE_STALE_S", "600"))
+# Touched by `invalidate_search_caches`; every process drops its entries when it changes
+SEARCH_CACHE_GENERATION_FILE = os.getenv("SEARCH_CACHE_GENERATION_FILE", ".cache/search_cache.generation")
+_GENERATION_CHECK_S = 1.0
+
+
+def _key(query: str) -> str:
+    return " ".join((query or "").casefold().split())
+
+
+def _is_negative(value: Any) -> bool:
+    return not (value or {}).get("results")
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float      # fresh until
+    stale_until: float     # served (and refreshed in the background) until
+
+
+class SearchCache:
+    """
+    Bounded LRU of search responses keyed on the normalized query.
+
+    Hits get `ttl_s`, empty results `negative_ttl_s`. After expiry an entry is
+    still served for `stale_s` while a single background call refreshes it;
+    past that it is a miss again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = SEARCH_CACHE_SIZE,
+        ttl_s: float = SEARCH_CACHE_TTL_S,
+        negative_ttl_s: float = SEARCH_CACHE_NEGATIVE_TTL_S,
+        stale_s: float = SEARCH_CACHE_STALE_S,
+        generation_file: Optional[str] = SEARCH_CACHE_GENERATION_FILE,
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.negative_ttl_s = negative_ttl_s
+        self.stale_s = stale_s
+        self.generation_file = generation_file
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+        self._generation = self._read_generation()
+        self._next_generation_check = 0.0
+        self._counts = {"hits": 0, "negative_hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "evictions": 0}
+
+    # ---- invalidation ----
+
+    def _read_generation(self) -> Optional[int]:
+        if not self.generation_file:
+            return None
+        try:
+            return os.stat(self.generation_file).st_mtime_ns
+        except OSError:
+            return None
+
+    def _check_generation(self, now: float) -> None:
+        if now < self._next_generation_check:
+            return
+        self._next_generation_check = now + _GENERATION_CHECK_S
+        gen = self._read_generation()
+        if gen != self._generation:
+            self._generation = gen
+            self._entries.clear()
+
+    def invalidate(self, query: Optional[str] = None) -> None:
+        with self._lock:
+            if query is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(_key(query), None)
+
+    # ---- lookups ----
+
+    def _store(self, key: str, value: Any, now: float) -> None:
+        ttl = self.negative_ttl_s if _is_negative(value) else self.ttl_s
+        self._entries[key] = _Entry(value, now + ttl, now + ttl + self.stale_s)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counts["evictions"] += 1
+
+    def _refresh(self, key: str, loader: Callable[[], Any]) -> None:
+        try:
+            value = loader()
+        except Exception:
+            value = None    # keep serving the stale entry until it ages out
+        with self._lock:
+            self._refreshing.discard(key)
+            if value is not None:
+                self._store(key, value, time.monotonic())
+                self._counts["refreshes"] += 1
+
+    def get_or_load(self, query: str, loader: Callable[[], Any]) -> Any:
+        key = _key(query)
+        now = time.monotonic()
+        with self._lock:
+            self._check_generation(now)
+            entry = self._entries.get(key)
+            if entry is not None and now < entry.stale_until:
+                self._entries.move_to_end(key)
+                if now < entry.expires_at:
+                    self._counts["negative_hits" if _is_negative(entry.value) else "hits"] += 1
+                    return entry.value
+                self._counts["stale_hits"] += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    threading.Thread(target=self._refresh, args=(key, loader), daemon=True).start()
+                return entry.value
+            self._counts["misses"] += 1
+
+        value = loader()
+        with self._lock:
+            self._store(key, value, time.monotonic())
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            c = dict(self._counts)
+            size = len(self._entries)
+        served = c["hits"] + c["negative_hits"] + c["stale_hits"]
+        total = served + c["misses"]
+        return {"name": self.name, "size": size, **c, "hit_rate": round(served / total, 4) if total else 0.0}
+
+
+class CachedSearchClient:
+    """Wraps any client exposing `search(query)`; everything else passes through."""
+
+    def __init__(self, client, cache: SearchCache):
+        self._client = client
+        self.cache = cache
+
+    def search(self, query: str):
+        return self.cache.get_or_load(query, lambda: self._client.search(query))
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+# --------------------------
+# Process-wide registry
+# --------------------------
+
+_CACHES: Dict[str, SearchCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_search_cache(name: str) -> SearchCache:
+    with _CACHES_LOCK:
+        cache = _CACHES.get(name)
+        if cache is None:
+            cache = _CACHES[name] = SearchCache(name)
+        return cache
+
+
+def cached(client, name: str) -> CachedSearchClient:
+    """`cached(CategorySearchClient(...), "category")` – one shared cache per name."""
+    return CachedSearchClient(client, get_search_cache(name))
+
+
+def invalidate_search_caches(name: Optional[str] = None) -> None:
+    """
+    Drop cached search results, e.g. after a datastore import. Clears the named
+    (or every) cache in this process and, for a full flush, touches the generation
+    file so API workers in other processes drop theirs within a second.
+    """
+    with _CACHES_LOCK:
+        caches = [_CACHES[name]] if name and name in _CACHES else ([] if name else list(_CACHES.values()))
+    for c in caches:
+        c.invalidate()
+    if name is None and SEARCH_CACHE_GENERATION_FILE:
+        os.makedirs(os.path.dirname(SEARCH_CACHE_GENERATION_FILE) or ".", exist_ok=True)
+        with open(SEARCH_CACHE_GENERATION_FILE, "a", encoding="utf-8"):
+            pass
+        os.utime(SEARCH_CACHE_GENERATION_FILE, None)
+
+
+def search_cache_stats() -> Dict[str, Dict[str, Any]]:
+    with _CACHES_LOCK:
+        caches = list(_CACHES.values())
+    return {c.name: c.stats() for c in caches}
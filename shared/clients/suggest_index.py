@@ -0,0 +1,253 @@
+# shared/clients/suggest_index.py
+from __future__ import annotations
+
+import bisect
+import gzip
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Written by data/tasks/export_suggest.py
+SUGGEST_EXPORT_FILES = os.getenv(
+    "SUGGEST_EXPORT_FILES",
+    ".cache/search_exports/poi_entities_search.jsonl,.cache/search_exports/org_locations_search.jsonl",
+)
+SUGGEST_RELOAD_INTERVAL_S = float(os.getenv("SUGGEST_RELOAD_INTERVAL_S", "5"))
+
+_PUNCT = re.compile(r"[\W_]+", re.UNICODE)
+# a name match should outrank the same prefix inside an address or locality
+_FIELD_WEIGHTS = {"name": 3.0, "street_address": 1.5, "locality": 1.0}
+
+
+def _norm(text: Any) -> str:
+    return " ".join(_PUNCT.sub(" ", str(text or "").casefold()).split())
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    id: str
+    name: str
+    street_address: Optional[str]
+    locality: Optional[str]
+    postcode: Optional[str]
+    source: str
+    matched_field: str
+    score: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.__dict__.copy()
+
+
+def _read_docs(path: str) -> Iterable[Dict[str, Any]]:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+class SuggestIndex:
+    """
+    Sorted-array prefix index over the exported search documents.
+
+    Every word-start suffix of name / street_address / locality is a key ("blue
+    bottle coffee", "bottle coffee", "coffee"), so typing any word of a field
+    matches. Keys live in one sorted list; entry doc ids and scores are parallel
+    NumPy arrays, so a prefix is two bisections plus a vectorized top-k over the
+    matching slice.
+
+    Score = field weight × (1 + log1p(popularity)), where popularity is how many
+    docs share the name (chain size). The *_search exports carry no popularity
+    field (their Discovery Engine schemas don't allow extra properties), so that is
+    what ranks in practice; a doc with its own numeric `popularity` overrides it.
+
+    Files come from `data.tasks.export_suggest` (same {id, structData} shape as
+    the GCS search export, or flat rows).
+    """
+
+    def __init__(self, docs: List[Dict[str, Any]], sources: List[str]):
+        self._docs = docs
+        self._sources = sources
+        localities = sorted({_norm(d.get("locality")) for d in docs} - {""})
+        self._locality_codes = {loc: i for i, loc in enumerate(localities)}
+        self._doc_locality = np.array(
+            [self._locality_codes.get(_norm(d.get("locality")), -1) for d in docs], dtype=np.int32
+        )
+        postcodes = sorted({str(d.get("postcode") or "") for d in docs} - {""})
+        self._postcode_codes = {pc: i for i, pc in enumerate(postcodes)}
+        self._doc_postcode = np.array(
+            [self._postcode_codes.get(str(d.get("postcode") or ""), -1) for d in docs], dtype=np.int32
+        )
+
+        name_counts = Counter(_norm(d.get("name")) for d in docs)
+        entries: List[Tuple[str, int, float, int]] = []
+        fields = list(_FIELD_WEIGHTS)
+        for i, d in enumerate(docs):
+            pop = d.get("popularity")
+            pop = float(pop) if isinstance(pop, (int, float)) else float(name_counts[_norm(d.get("name"))])
+            boost = 1.0 + math.log1p(pop)
+            for f_idx, field in enumerate(fields):
+                words = _norm(d.get(field)).split()
+                for w in range(len(words)):
+                    entries.append((" ".join(words[w:]), i, _FIELD_WEIGHTS[field] * boost, f_idx))
+        entries.sort(key=lambda e: e[0])
+
+        self._fields = fields
+        self._keys = [e[0] for e in entries]
+        self._entry_doc = np.array([e[1] for e in entries], dtype=np.int32)
+        self._entry_score = np.array([e[2] for e in entries], dtype=np.float32)
+        self._entry_field = np.array([e[3] for e in entries], dtype=np.int8)
+
+    @classmethod
+    def from_files(cls, paths: Sequence[str]) -> "SuggestIndex":
+        docs: List[Dict[str, Any]] = []
+        sources: List[str] = []
+        for path in paths:
+            source = os.path.basename(path).split(".")[0]
+            for raw in _read_docs(path):
+                # exports are {"id", "structData": {...}}; accept flat rows too
+                data = dict(raw.get("structData") or raw)
+                data["id"] = str(raw.get("id", data.get("id", "")))
+                docs.append(data)
+                sources.append(source)
+        return cls(docs, sources)
+
+    def suggest(
+        self,
+        prefix: str,
+        k: int = 10,
+        locality: Optional[str] = None,
+        postcode: Optional[str] = None,
+    ) -> List[Suggestion]:
+        p = _norm(prefix)
+        if not p or k <= 0:
+            return []
+        lo = bisect.bisect_left(self._keys, p)
+        hi = bisect.bisect_left(self._keys, p + "\uffff", lo)
+        if lo == hi:
+            return []
+
+        docs = self._entry_doc[lo:hi]
+        scores = self._entry_score[lo:hi].copy()
+        if locality:
+            code = self._locality_codes.get(_norm(locality), -2)
+            scores[self._doc_locality[docs] != code] = -1.0
+        if postcode:
+            code = self._postcode_codes.get(str(postcode), -2)
+            scores[self._doc_postcode[docs] != code] = -1.0
+
+        # over-fetch so duplicates (one doc matching on several keys) still leave k
+        want = min(len(scores), k * 4)
+        top = np.argpartition(-scores, want - 1)[:want] if want < len(scores) else np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        out: List[Suggestion] = []
+        seen = set()
+        for j in top:
+            if scores[j] < 0:
+                break
+            d = int(docs[j])
+            if d in seen:
+                continue
+            seen.add(d)
+            doc = self._docs[d]
+            out.append(Suggestion(
+                id=doc["id"],
+                name=doc.get("name") or "",
+                street_address=doc.get("street_address"),
+                locality=doc.get("locality"),
+                postcode=doc.get("postcode"),
+                source=self._sources[d],
+                matched_field=self._fields[int(self._entry_field[lo + j])],
+                score=round(float(scores[j]), 4),
+            ))
+            if len(out) >= k:
+                break
+        return out
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+
+class SuggestService:
+    """
+    Owns the current `SuggestIndex`. Export files are stat()ed at most every
+    `reload_interval_s`; when any changed, a background thread builds a new index
+    and swaps it in with one assignment, so requests never wait on a rebuild.
+    """
+
+    def __init__(self, paths: Optional[Sequence[str]] = None, reload_interval_s: float = SUGGEST_RELOAD_INTERVAL_S):
+        self.paths = list(paths) if paths is not None else [p.strip() for p in SUGGEST_EXPORT_FILES.split(",") if p.strip()]
+        self.reload_interval_s = reload_interval_s
+        self._index: Optional[SuggestIndex] = None
+        self._stat: Optional[tuple] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self._reloading: Optional[threading.Thread] = None
+
+    def _files_stat(self) -> tuple:
+        out = []
+        for p in self.paths:
+            try:
+                st = os.stat(p)
+                out.append((p, st.st_mtime_ns, st.st_size))
+            except OSError:
+                out.append((p, None, None))
+        return tuple(out)
+
+    def _build(self) -> None:
+        stat = self._files_stat()
+        existing = [p for p, mtime, _ in stat if mtime is not None]
+        try:
+            index = SuggestIndex.from_files(existing)
+        except (OSError, ValueError):
+            # a half-written export: keep the old index and retry on the next check
+            logger.exception("suggest index rebuild failed")
+            return
+        self._index, self._stat = index, stat
+
+    def index(self) -> SuggestIndex:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._build()
+                    self._next_check = time.monotonic() + self.reload_interval_s
+            return self._index or SuggestIndex([], [])
+        if time.monotonic() >= self._next_check:
+            with self._lock:
+                self._next_check = time.monotonic() + self.reload_interval_s
+                busy = self._reloading is not None and self._reloading.is_alive()
+                if not busy and self._files_stat() != self._stat:
+                    self._reloading = threading.Thread(target=self._build, name="suggest-reload", daemon=True)
+                    self._reloading.start()
+        return self._index
+
+    def wait_for_reload(self, timeout: Optional[float] = None) -> None:
+        t = self._reloading
+        if t is not None:
+            t.join(timeout)
+
+    def suggest(self, prefix: str, k: int = 10, locality: Optional[str] = None, postcode: Optional[str] = None):
+        return self.index().suggest(prefix, k=k, locality=locality, postcode=postcode)
+
+
+_SERVICE: Optional[SuggestService] = None
+
+
+def get_suggest_service() -> SuggestService:
+    global _SERVICE
+    if _SERVICE is None:
+        _SERVICE = SuggestService()
+    return _SERVICE
@@ -24,6 +24,7 @@ class Settings(BaseSettings):
 
     # Gemini
     GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+    GEMINI_FAST_MODEL: str = os.getenv("GEMINI_FAST_MODEL", "gemini-2.5-flash-lite")
 
     # ADK (legacy envs still expect this)
     ADK_LOCATION: str = os.getenv("ADK_LOCATION", SEARCH_LOCATION)
@@ -0,0 +1,60 @@
+# shared/schemas/adapters.py
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+ADAPTERS_DIR = os.getenv("YAML_ADAPTERS_DIR", os.path.join(os.path.dirname(__file__), "yaml_adapters"))
+
+# BigQuery allows at most four clustering columns
+_MAX_CLUSTER_COLS = 4
+
+
+@lru_cache(maxsize=None)
+def load_adapters(adapters_dir: str = ADAPTERS_DIR) -> Dict[str, Dict[str, Any]]:
+    """All adapters by id. A file may hold one mapping or a list of them; the first definition of an id wins."""
+    out: Dict[str, Dict[str, Any]] = {}
+    for fname in sorted(os.listdir(adapters_dir)):
+        if not fname.endswith((".yaml", ".yml")):
+            continue
+        with open(os.path.join(adapters_dir, fname), "r", encoding="utf-8") as f:
+            doc = yaml.safe_load(f) or []
+        # prefer the entry matching the file name, so a stray copy elsewhere can't shadow it
+        entries = doc if isinstance(doc, list) else [doc]
+        stem = os.path.splitext(fname)[0]
+        entries.sort(key=lambda a: (a or {}).get("id") != stem)
+        for adapter in entries:
+            if isinstance(adapter, dict) and adapter.get("id"):
+                out.setdefault(adapter["id"], adapter)
+    return out
+
+
+def get_adapter(adapter_id: str) -> Dict[str, Any]:
+    try:
+        return load_adapters()[adapter_id]
+    except KeyError:
+        raise KeyError(f"No YAML adapter with id '{adapter_id}' in {ADAPTERS_DIR}") from None
+
+
+def physical_layout(adapter_id: str) -> Dict[str, Any]:
+    layout = dict(get_adapter(adapter_id).get("physical_layout") or {})
+    cluster_by: List[str] = list(layout.get("cluster_by") or [])
+    if len(cluster_by) > _MAX_CLUSTER_COLS:
+        raise ValueError(f"[{adapter_id}] cluster_by has {len(cluster_by)} columns; BigQuery allows {_MAX_CLUSTER_COLS}")
+    return {"cluster_by": cluster_by, "partition_by": layout.get("partition_by") or None}
+
+
+def layout_ddl(adapter_id: Optional[str]) -> str:
+    """`PARTITION BY … CLUSTER BY …` clause for a CREATE TABLE, or '' when the adapter declares none."""
+    if not adapter_id:
+        return ""
+    layout = physical_layout(adapter_id)
+    parts = []
+    if layout["partition_by"]:
+        parts.append(f"PARTITION BY {layout['partition_by']}")
+    if layout["cluster_by"]:
+        parts.append(f"CLUSTER BY {', '.join(layout['cluster_by'])}")
+    return "\n    ".join(parts)
@@ -2,11 +2,13 @@
 from __future__ import annotations
 
 import json
-from typing import Optional, Union
+from typing import Any, Optional, Union
 from google.api_core import exceptions
 from google.cloud import discoveryengine_v1 as de
 
-def create_or_update_schema(
+from shared.clients.registry import discovery_client
+
+def start_create_or_update_schema(
     *,
     project_id: str,
     location: str,
@@ -17,9 +19,9 @@ def create_or_update_schema(
     use_json_schema: bool = True,
     preserve_existing_on_update: bool = True,   # <--- add this
     client: Optional[de.SchemaServiceClient] = None,
-    timeout: float = 600.0,
-) -> de.Schema:
-    client = client or de.SchemaServiceClient()
+) -> Any:
+    """Start creating (or updating, if it exists) a schema; returns the LRO without waiting."""
+    client = client or discovery_client("SchemaServiceClient", location)
     parent = f"projects/{project_id}/locations/{location}/collections/{collection_id}/dataStores/{data_store_id}"
     name = f"{parent}/schemas/{schema_id}"
 
@@ -36,8 +38,7 @@ def create_or_update_schema(
         schema_msg = de.Schema(struct_schema=schema_def)
 
     try:
-        op = client.create_schema(parent=parent, schema=schema_msg, schema_id=schema_id)
-        return op.result(timeout=timeout)
+        return client.create_schema(parent=parent, schema=schema_msg, schema_id=schema_id)
     except exceptions.AlreadyExists:
         update_body = (
             de.Schema(name=name, json_schema=schema_msg.json_schema)
@@ -45,5 +46,9 @@ def create_or_update_schema(
             else de.Schema(name=name, struct_schema=schema_msg.struct_schema)
         )
         req = de.UpdateSchemaRequest(schema=update_body)
-        op = client.update_schema(request=req)
-        return op.result(timeout=timeout)
+        return client.update_schema(request=req)
+
+
+def create_or_update_schema(*, timeout: float = 600.0, **kwargs) -> de.Schema:
+    op = start_create_or_update_schema(**kwargs)
+    return op.result(timeout=timeout)
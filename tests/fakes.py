@@ -0,0 +1,96 @@
+# tests/fakes.py
+"""In-memory stand-ins for BigQuery shared by the pipeline unit tests."""
+import datetime as dt
+import types
+
+from google.api_core import exceptions
+
+from data.pipelines.fingerprint import source_tables, target_table
+
+MiB = 2**20
+
+
+class FakeJob:
+    """Shaped like bigquery.QueryJob: job_id, state, byte counters, reload(), done(), result()."""
+
+    def __init__(self, job_id="job_1", sql="", client=None, estimate=None, cap=None, polls_needed=1, rows=()):
+        self.job_id = job_id
+        self.sql, self.client = sql, client
+        self.estimate, self.cap = estimate, cap
+        self.polls_needed, self.polls = polls_needed, 0
+        self.rows = list(rows)
+        self.state = "RUNNING"
+        self.total_bytes_processed = None
+        self.total_bytes_billed = None
+        self.ran = False
+
+    def reload(self):
+        pass
+
+    def done(self):
+        self.polls += 1
+        if self.polls >= self.polls_needed:
+            self.state, self.total_bytes_processed = "DONE", self.estimate
+        return self.state == "DONE"
+
+    def result(self):
+        # BigQuery checks the estimate against maximum_bytes_billed before reading anything
+        if self.cap and self.estimate and self.estimate > self.cap:
+            raise exceptions.BadRequest(f"Query exceeded limit for bytes billed: {self.cap}")
+        if self.client is not None:
+            self.client.finish(self)
+        self.ran = True
+        self.total_bytes_billed = self.estimate
+        return self.rows
+
+
+class FakeBigQuery:
+    """
+    Query jobs and table metadata. Estimates are per target table name (10 MiB unless given);
+    dry runs reading a table in `missing` fail, and jobs building a table in `fail` fail.
+    Building a table bumps its last-modified time; public tables exist from the first lookup.
+    """
+
+    def __init__(self, estimates=None, missing=(), default_estimate=10 * MiB):
+        self.estimates, self.missing = dict(estimates or {}), set(missing)
+        self.default_estimate = default_estimate
+        self.tables = {}
+        self.jobs = []
+        self.queries = []
+        self.clock = 0
+        self.fail = set()
+
+    def touch(self, table_id):
+        self.clock += 1
+        t = self.tables.setdefault(table_id, types.SimpleNamespace(labels={}))
+        t.modified = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc) + dt.timedelta(seconds=self.clock)
+
+    def get_table(self, table_id):
+        if table_id.startswith("bigquery-public-data.") and table_id not in self.tables:
+            self.touch(table_id)
+        if table_id not in self.tables:
+            raise exceptions.NotFound(table_id)
+        return self.tables[table_id]
+
+    def update_table(self, table, fields):
+        return table
+
+    def query(self, sql, job_config=None, job_id_prefix=""):
+        name = target_table(sql).split(".")[-1]
+        estimate = self.estimates.get(name, self.default_estimate)
+        if job_config is not None and job_config.dry_run:
+            deps = [t for t in source_tables(sql) if t.split(".")[-1] in self.missing]
+            if deps:
+                raise exceptions.NotFound(f"Table {deps[0]} was not found")
+            return types.SimpleNamespace(total_bytes_processed=estimate)
+        self.queries.append(job_id_prefix)
+        cap = getattr(job_config, "maximum_bytes_billed", None)
+        job = FakeJob(f"job_{name}", sql, client=self, estimate=estimate, cap=cap)
+        self.jobs.append(job)
+        return job
+
+    def finish(self, job):
+        target = target_table(job.sql)
+        if target in self.fail:
+            raise exceptions.InternalServerError("backend error")
+        self.touch(target)
@@ -0,0 +1,41 @@
+import pytest
+
+from data.quality.bytes_scanned import compare
+from data.tasks.bq_materialize import materialize_steps
+from shared.schemas.adapters import layout_ddl, load_adapters, physical_layout
+
+
+def test_adapters_declare_layouts_for_materialized_tables():
+    adapters = load_adapters()
+    assert adapters["area_indicators"]["table"].endswith(".area_indicators")
+    assert physical_layout("poi_entities")["cluster_by"] == ["primary_category", "geometry", "postcode"]
+    assert layout_ddl("org_locations") == "CLUSTER BY geometry, postcode"
+    assert layout_ddl(None) == ""
+    with pytest.raises(KeyError):
+        layout_ddl("nope")
+
+
+def test_materialization_sql_carries_cluster_by():
+    sql = {s.name: s.payload for s in materialize_steps("p.d")}
+    for name in ("poi_entities_ca", "org_locations_ca", "area_indicators_ca", "area_boundaries_ca"):
+        head = sql[name].split("AS\n", 1)[0]
+        assert f"`p.d.{name}`" in head and "CLUSTER BY" in head
+    assert "CLUSTER BY" not in sql["poi_entities_search"]
+    assert "CLUSTER BY" not in sql["poi_entities"]          # the union view
+
+
+def test_compare_reports_reduction():
+    before = {"q": {"bytes_processed": 1000, "bytes_billed": 10485760}}
+    after = {"q": {"bytes_processed": 250, "bytes_billed": 10485760}, "new": {"bytes_processed": 5}}
+    assert compare(before, after) == [
+        {"query": "q", "before": 1000, "after": 250, "reduction": 0.75},
+        {"query": "new", "before": None, "after": 5, "reduction": None},
+    ]
+
+
+def test_overture_is_scanned_once_by_the_staging_step():
+    steps = {s.name: s for s in materialize_steps("p.d")}
+    readers = [n for n, s in steps.items() if "overture_maps.place" in s.payload]
+    assert readers == ["overture_places_staging"]
+    assert steps["poi_entities_ca"].deps == steps["org_locations_ca"].deps == ("overture_places_staging",)
+    assert "FROM `p.d.overture_places_staging`" in steps["org_locations_ca"].payload
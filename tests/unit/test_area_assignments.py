@@ -0,0 +1,51 @@
+import types
+
+from data.quality.area_assignments import check, mismatches_sql, report, summarize
+from data.tasks.bq_materialize import materialize_steps
+
+
+def test_assignment_step_joins_by_geometry_after_the_base_views():
+    steps = {s.name: s for s in materialize_steps("p.d", ("CA", "NY"))}
+    step = steps["area_assignments"]
+    assert step.deps == ("poi_entities", "org_locations", "area_boundaries")
+    assert "ON ST_CONTAINS(b.geometry, e.geometry)" in step.payload
+    assert "CLUSTER BY area_id, entity_type, entity_id" in step.payload
+    assert "= b.area_id" not in step.payload                  # no postcode join
+    assert r"r'^\s*(\d{5})'" in step.payload
+
+
+def test_summary_counts_and_mismatch_rate():
+    rows = [
+        {"entity_type": "poi", "postcode_check": "match", "n": 90},
+        {"entity_type": "poi", "postcode_check": "mismatch", "n": 10},
+        {"entity_type": "poi", "postcode_check": "no_polygon", "n": 3},
+        {"entity_type": "org", "postcode_check": "no_postcode", "n": 2},
+    ]
+    summary = summarize(rows)
+    assert summary["poi"] == {"match": 90, "mismatch": 10, "no_postcode": 0, "no_polygon": 3, "mismatch_rate": 0.1}
+    assert summary["org"]["mismatch_rate"] is None
+
+    mismatch = {"entity_type": "poi", "entity_id": "p1", "name": "Cafe", "postcode": "94612", "area_id": "94607"}
+    text = report(summary, [mismatch])
+    assert "10.0%" in text and "postcode=94612" in text and "area=94607" in text
+
+
+def test_mismatch_listing_is_bounded():
+    sql = mismatches_sql("p.d", limit=5)
+    assert "postcode_check = 'mismatch'" in sql and sql.rstrip().endswith("LIMIT 5")
+
+
+def test_check_runs_both_queries_with_the_job_config():
+    class FakeClient:
+        def __init__(self):
+            self.configs = []
+
+        def query(self, sql, job_config=None):
+            self.configs.append(job_config)
+            rows = [{"entity_type": "poi", "postcode_check": "match", "n": 1}] if "GROUP BY" in sql else []
+            return types.SimpleNamespace(result=lambda: rows)
+
+    client, config = FakeClient(), object()
+    summary, mismatches = check(client, "p.d", limit=5, job_config=config)
+    assert summary["poi"]["match"] == 1 and mismatches == []
+    assert client.configs == [config, config]
@@ -0,0 +1,26 @@
+from data.tasks.bq_materialize import area_feature_columns, area_features_sql, materialize_steps
+from shared.schemas.adapters import get_adapter
+
+
+def test_feature_step_depends_on_the_area_and_poi_views():
+    steps = {s.name: s for s in materialize_steps("p.d", ("CA", "NY"))}
+    assert steps["area_features"].deps == ("area_indicators", "poi_entities", "org_locations")
+
+
+def test_rings_counts_and_nearest_distances():
+    sql = area_features_sql("p.d", max_km=25)
+    assert "COUNTIF(d <= 500) AS competitors_within_0_5km" in sql
+    assert "COUNTIF(primary_category = 'coffee_shop' AND d <= 1000) AS coffee_shop_within_1km" in sql
+    assert "IFNULL(f.coffee_shop_within_5km, 0) AS coffee_shop_within_5km" in sql
+    assert sql.count("ST_DWITHIN(a.geometry, p.geometry, 5000)") == 1          # rings: largest ring only
+    assert sql.count("ST_DWITHIN(a.geometry, p.geometry, 25000)") == 1         # nearest: no category carried
+    assert "MIN(ST_DISTANCE(a.geometry, p.geometry)) AS nearest_competitor_m" in sql and "AS nearest_org_m" in sql
+
+
+def test_adapter_lists_every_generated_column():
+    cols = area_feature_columns()
+    assert cols[:4] == [
+        "competitors_within_0_5km", "competitors_within_1km", "competitors_within_2km", "competitors_within_5km",
+    ]
+    numeric = get_adapter("area_features")["numeric_cols"]
+    assert numeric == ["total_pop", "households", "median_income"] + cols + ["nearest_competitor_m", "nearest_org_m"]
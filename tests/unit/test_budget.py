@@ -0,0 +1,47 @@
+import pytest
+
+from data.pipelines.budget import format_bytes, parse_bytes, plan, plan_report
+from data.pipelines.dag import Dag, DagFailed
+from data.pipelines.operations import OperationManager
+from data.tasks.bq_materialize import bigquery_runner, materialize_steps
+from tests.fakes import FakeBigQuery
+
+GiB = 2**30
+
+
+def test_parse_and_format_bytes():
+    assert parse_bytes("50GB") == 50 * GiB
+    assert parse_bytes("1.5 TiB") == int(1.5 * 2**40)
+    assert parse_bytes("0") is None and parse_bytes("") is None
+    with pytest.raises(ValueError):
+        parse_bytes("lots")
+    assert format_bytes(512) == "512 B" and format_bytes(3 * GiB) == "3.00 GiB"
+
+
+def test_plan_dry_runs_every_step_and_totals():
+    client = FakeBigQuery({"overture_places_staging": 120 * GiB, "poi_entities_ca": 2 * GiB}, missing={"org_locations"})
+    rows = plan(client, materialize_steps("p.d"), max_bytes_billed=100 * GiB)
+    by_step = {r["step"]: r for r in rows}
+
+    assert by_step["overture_places_staging"]["over_cap"]
+    assert by_step["poi_entities_ca"]["estimated_bytes"] == 2 * GiB
+    assert by_step["org_locations_search"]["error"].startswith("NotFound")
+    assert by_step["area_assignments"]["error"].startswith("NotFound")
+    assert client.jobs == []                                  # nothing actually ran
+    report = plan_report(rows, 100 * GiB)
+    assert "OVER CAP" in report
+    assert "(+3 step(s) not estimable)" in report
+
+
+def test_real_run_applies_cap_and_aborts_over_budget_step():
+    client = FakeBigQuery({"overture_places_staging": 500 * GiB})
+    runner = bigquery_runner(client, manager=OperationManager(initial_delay_s=0.001), max_bytes_billed=100 * GiB)
+    result = Dag(materialize_steps("p.d")).run(runner)
+
+    assert all(j.cap == 100 * GiB for j in client.jobs)
+    staging = next(j for j in client.jobs if j.job_id == "job_overture_places_staging")
+    assert not staging.ran
+    assert result.nodes["overture_places_staging"].state == "failed"
+    assert result.nodes["poi_entities_ca"].state == "skipped"
+    with pytest.raises(DagFailed, match="exceeded limit for bytes billed"):
+        result.raise_for_failure()
@@ -0,0 +1,45 @@
+import threading
+
+from shared.clients.registry import ClientRegistry
+
+
+class FakeClient:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_one_client_per_key_across_threads():
+    reg = ClientRegistry()
+    built = []
+
+    def factory():
+        built.append(1)
+        return FakeClient()
+
+    out = []
+    threads = [threading.Thread(target=lambda: out.append(reg.get("bigquery", factory, project="p"))) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(built) == 1
+    assert all(c is out[0] for c in out)
+    assert reg.get("bigquery", factory, project="other") is not out[0]
+    stats = reg.stats()["bigquery"]
+    assert (stats["constructed"], stats["reused"], stats["live"]) == (2, 15, 2)
+
+
+def test_close_by_kind_and_shutdown():
+    reg = ClientRegistry()
+    bq = reg.get("bigquery", FakeClient, project="p")
+    gcs = reg.get("storage", FakeClient)
+
+    assert reg.close("bigquery") == 1
+    assert bq.closed and not gcs.closed
+    assert reg.get("bigquery", FakeClient, project="p") is not bq
+    assert reg.close() == 2
+    assert gcs.closed
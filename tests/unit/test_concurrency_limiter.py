@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+from google.genai import errors
+
+from agents.components.concurrency_limiter import AdaptiveLimiter, call_with_retries, is_overload
+
+
+def _quota_error():
+    return errors.ClientError(429, {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED", "message": "quota"}})
+
+
+def test_is_overload():
+    assert is_overload(_quota_error())
+    assert is_overload(asyncio.TimeoutError())
+    assert not is_overload(errors.ClientError(400, {"error": {"code": 400, "status": "INVALID_ARGUMENT"}}))
+    assert not is_overload(ValueError("bad json"))
+
+
+def test_aimd_shrinks_on_overload_and_grows_on_success():
+    lim = AdaptiveLimiter(initial=8, min_limit=1, max_limit=10)
+    with pytest.raises(errors.ClientError):
+        with lim.slot():
+            raise _quota_error()
+    assert lim.limit == 4
+    for _ in range(8):
+        with lim.slot():
+            pass
+    assert 5 < lim.limit < 6.5
+    with pytest.raises(ValueError):
+        with lim.slot():
+            raise ValueError("not an overload")
+    assert lim.snapshot()["overloads"] == 1
+
+
+def test_async_slots_respect_limit():
+    lim = AdaptiveLimiter(initial=2, max_limit=2)
+    peak = {"now": 0, "max": 0}
+
+    async def work():
+        async with lim.aslot():
+            peak["now"] += 1
+            peak["max"] = max(peak["max"], peak["now"])
+            await asyncio.sleep(0.01)
+            peak["now"] -= 1
+
+    async def run():
+        await asyncio.gather(*(work() for _ in range(8)))
+
+    asyncio.run(run())
+    assert peak["max"] == 2
+    assert lim.snapshot()["in_flight"] == 0
+
+
+def test_shared_state_file_caps_across_limiters(tmp_path):
+    path = str(tmp_path / "limiter.json")
+    a = AdaptiveLimiter(initial=1, max_limit=1, state_file=path)
+    b = AdaptiveLimiter(initial=1, max_limit=1, state_file=path)
+    with a.slot():
+        assert not b._try_acquire()
+        assert a.snapshot()["shared"]["in_flight"] == 1
+    assert b._try_acquire()
+    b._release()
+
+
+def test_retries_only_overloads(monkeypatch):
+    monkeypatch.setattr("agents.components.concurrency_limiter.time.sleep", lambda s: None)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise _quota_error()
+        return "ok"
+
+    assert call_with_retries(flaky, retries=3) == "ok"
+    with pytest.raises(ValueError):
+        call_with_retries(lambda: (_ for _ in ()).throw(ValueError("x")), retries=3)
+
+
+def test_deadline_cancellation_shrinks_but_hedge_loss_does_not():
+    from agents.components.slot_hedging import Hedger
+
+    lim = AdaptiveLimiter(initial=8, max_limit=8)
+
+    async def generate(q, model):
+        async with lim.aslot():
+            await asyncio.sleep(0.3 if "slow" in q else 0.01)
+            return q
+
+    async def run(q, deadline_s):
+        h = Hedger(generate, "m", fast_model="")
+        try:
+            return await h.run(q, deadline_s=deadline_s)
+        finally:
+            await asyncio.sleep(0.02)     # let cancelled calls unwind
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(run("slow", 0.05))
+    assert lim.snapshot()["overloads"] == 2 and lim.limit == 2   # primary + hedge both cut off
+
+    lim2 = AdaptiveLimiter(initial=8, max_limit=8)
+    task = None
+
+    async def race():
+        nonlocal task
+        async def call():
+            async with lim2.aslot():
+                await asyncio.sleep(1)
+        task = asyncio.ensure_future(call())
+        await asyncio.sleep(0.01)
+        task.cancel()                      # a plain cancel, e.g. a hedge race loser
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(race())
+    assert lim2.limit == 8 and lim2.snapshot()["overloads"] == 0
+
+
+def test_async_shared_state_io_runs_off_the_event_loop(tmp_path, monkeypatch):
+    import threading
+
+    lim = AdaptiveLimiter(initial=2, max_limit=2, state_file=str(tmp_path / "limiter.json"))
+    threads = []
+    real = lim._shared.try_acquire
+    monkeypatch.setattr(lim._shared, "try_acquire", lambda d: threads.append(threading.current_thread()) or real(d))
+
+    async def run():
+        async with lim.aslot():
+            pass
+
+    asyncio.run(run())
+    assert threads and threading.main_thread() not in threads
+    assert lim.snapshot()["shared"]["in_flight"] == 0
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from data.pipelines.dag import Dag, DagFailed, Step
+from data.tasks.bq_materialize import materialize_steps
+
+
+def _runner(durations, fail=(), log=None):
+    log = [] if log is None else log
+
+    async def run(step):
+        log.append(("start", step.name))
+        await asyncio.sleep(durations.get(step.name, 0.05))
+        if step.name in fail:
+            raise RuntimeError(f"{step.name} exploded")
+        log.append(("end", step.name))
+        return step.name.upper()
+    return run
+
+
+def test_independent_steps_run_in_parallel_and_dependents_start_early():
+    log = []
+    dag = Dag(materialize_steps("p.d"))
+    res = dag.run(_runner({"poi_entities": 0.05, "org_locations": 0.2}, log=log))
+
+    assert res.ok
+    assert res.elapsed_s < 0.4                       # serial would be ≥ 0.55 s
+    # poi_entities_search starts before the slow org_locations finishes
+    assert log.index(("start", "poi_entities_search")) < log.index(("end", "org_locations"))
+    assert log.index(("start", "org_locations_search")) > log.index(("end", "org_locations"))
+    assert res.nodes["poi_entities"].result == "POI_ENTITIES"
+    assert "org_locations_search" in res.timeline()
+
+
+def test_fail_fast_skips_downstream_and_unstarted_steps():
+    steps = [Step("a"), Step("b", deps=("a",)), Step("c"), Step("d", deps=("c",))]
+    res = Dag(steps).run(_runner({"a": 0.01, "c": 0.1}, fail={"a"}), max_parallel=2)
+
+    states = {n: s.state for n, s in res.nodes.items()}
+    assert states == {"a": "failed", "b": "skipped", "c": "succeeded", "d": "skipped"}
+    with pytest.raises(DagFailed, match="a: RuntimeError: a exploded"):
+        res.raise_for_failure()
+
+
+def test_keep_going_only_skips_dependents_of_the_failure():
+    steps = [Step("a"), Step("b", deps=("a",)), Step("c"), Step("d", deps=("c",))]
+    res = Dag(steps).run(_runner({"a": 0.01, "c": 0.1}, fail={"a"}), max_parallel=2, fail_fast=False)
+
+    states = {n: s.state for n, s in res.nodes.items()}
+    assert states == {"a": "failed", "b": "skipped", "c": "succeeded", "d": "succeeded"}
+    assert not res.ok
+
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError, match="unknown"):
+        Dag([Step("a", deps=("missing",))])
+    with pytest.raises(ValueError, match="cycle"):
+        Dag([Step("a", deps=("b",)), Step("b", deps=("a",))])
@@ -0,0 +1,49 @@
+import numpy as np
+import yaml
+
+from agents.components.embedding_resolver import EmbeddingResolver, HashingVectorizer
+
+ONTOLOGY = {
+    "coffee_shop": {"synonyms": ["cafe", "espresso bar"]},
+    "grocery_store": {"synonyms": ["supermarket", "grocer"]},
+    "gym": {"synonyms": ["fitness center", "health club"]},
+}
+
+
+def test_vectors_are_unit_norm_and_stable():
+    vec = HashingVectorizer(dim=512)
+    a = vec.transform(["coffee shop", ""])
+    assert np.isclose(np.linalg.norm(a[0]), 1.0)
+    assert not a[1].any()
+    assert np.array_equal(a, vec.transform(["coffee shop", ""]))
+
+
+def test_resolve_batch_scores_all_terms_at_once():
+    r = EmbeddingResolver.from_ontology(ONTOLOGY, dim=1024)
+    out = r.resolve_batch(["espresso bars", "fitness centre", "gas station"])
+    assert out == {"espresso bars": "coffee_shop", "fitness centre": "gym", "gas station": None}
+    assert r.top_k("supermarkets", k=2)[0][0] == "grocery_store"
+
+
+def test_paraphrase_without_shared_ngrams_is_left_for_the_remote_matcher():
+    r = EmbeddingResolver.from_ontology(ONTOLOGY, dim=1024)
+    assert r.resolve_batch(["third wave roastery"]) == {"third wave roastery": None}
+
+
+def test_load_or_build_memory_maps_matching_artifact(tmp_path):
+    path = tmp_path / "categories.yaml"
+    path.write_text(yaml.safe_dump(ONTOLOGY))
+
+    built = EmbeddingResolver.load_or_build(str(path), ONTOLOGY, dim=256)
+    assert not isinstance(built.matrix, np.memmap)
+    loaded = EmbeddingResolver.load_or_build(str(path), ONTOLOGY, dim=256)
+    assert isinstance(loaded.matrix, np.memmap)
+    assert loaded.categories == built.categories
+    assert np.allclose(loaded.matrix, built.matrix)
+
+    # editing the YAML invalidates the artifact
+    changed = dict(ONTOLOGY, bakery={"synonyms": ["patisserie"]})
+    path.write_text(yaml.safe_dump(changed))
+    rebuilt = EmbeddingResolver.load_or_build(str(path), changed, dim=256)
+    assert not isinstance(rebuilt.matrix, np.memmap)
+    assert "bakery" in rebuilt.categories
@@ -0,0 +1,56 @@
+import asyncio
+import json
+
+import cli.extract_slots_bulk as bulk
+from agents.components.slot_schema import SlotExtraction
+
+
+def _write_corpus(path, n):
+    path.write_text("".join(json.dumps({"id": i, "query": f"q{i}"}) + "\n" for i in range(n)))
+
+
+def test_bulk_writes_results_and_resumes(monkeypatch, tmp_path):
+    seen, flaky = [], {"q3"}
+
+    async def fake_extract(text, use_cache=True):
+        seen.append(text)
+        if text in flaky:
+            raise RuntimeError("boom")
+        return SlotExtraction(intent="aggregate")
+
+    monkeypatch.setattr(bulk, "aextract_slots_genai", fake_extract)
+    src, out = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    _write_corpus(src, 5)
+
+    stats = asyncio.run(bulk.run_bulk(str(src), str(out), concurrency=2))
+    assert (stats["ok"], stats["failed"]) == (4, 1)
+
+    # second run only retries the failed id
+    seen.clear()
+    flaky.clear()
+    stats = asyncio.run(bulk.run_bulk(str(src), str(out), concurrency=2))
+    assert seen == ["q3"]
+    assert (stats["ok"], stats["skipped"]) == (1, 4)
+    ok_ids = {r["id"] for r in map(json.loads, out.read_text().splitlines()) if "slots" in r}
+    assert ok_ids == {0, 1, 2, 3, 4}                    # ids keep their input type
+
+
+def test_resume_drops_torn_last_line(monkeypatch, tmp_path):
+    async def fake_extract(text, use_cache=True):
+        return SlotExtraction(intent="aggregate")
+
+    monkeypatch.setattr(bulk, "aextract_slots_genai", fake_extract)
+    src, out = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    _write_corpus(src, 3)
+    out.write_text(json.dumps({"id": "0", "query": "q0", "slots": {}}) + "\n" + '{"id": "1", "que')
+
+    stats = asyncio.run(bulk.run_bulk(str(src), str(out), concurrency=1))
+    assert (stats["ok"], stats["skipped"]) == (2, 1)
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [r["id"] for r in rows] == ["0", 1, 2]      # a string id from an older run still counts as done
+
+
+def test_percentile_nearest_rank():
+    vals = [float(v) for v in range(1, 101)]
+    assert bulk._percentile(vals, 50) == 50.0
+    assert bulk._percentile(vals, 99) == 99.0
@@ -0,0 +1,90 @@
+from data.pipelines.dag import Dag
+from data.pipelines.fingerprint import (
+    FileFingerprintStore,
+    LabelFingerprintStore,
+    fingerprint,
+    source_tables,
+    target_table,
+)
+from data.pipelines.operations import OperationManager
+from data.tasks.bq_materialize import bigquery_runner, bytes_billed_report, materialize_steps
+from tests.fakes import FakeBigQuery
+
+
+def _attempt(client, regions=("CA",), fail_fast=True, **kw):
+    runner = bigquery_runner(client, manager=OperationManager(initial_delay_s=0.001), **kw)
+    return Dag(materialize_steps("p.d", regions)).run(runner, fail_fast=fail_fast)
+
+
+def _run(client, **kw):
+    return _attempt(client, **kw).raise_for_failure()
+
+
+def _built(result):
+    return sorted(n for n, s in result.nodes.items() if s.result and s.result["status"] == "built")
+
+
+def test_sources_and_fingerprint_ignore_comments():
+    sql = "-- FROM a.b.c\nCREATE OR REPLACE TABLE `p.d.t` AS SELECT * FROM `x.y.z` JOIN p.d.u ON TRUE"
+    assert source_tables(sql) == ["p.d.u", "x.y.z"]
+    assert fingerprint(sql, [("x.y.z", 1)]) == fingerprint(sql.replace("-- FROM a.b.c", "-- edited"), [("x.y.z", 1)])
+    assert fingerprint(sql, [("x.y.z", 1)]) != fingerprint(sql, [("x.y.z", 2)])
+
+
+def test_second_run_is_metadata_only_until_a_source_changes():
+    client = FakeBigQuery()
+    first = _run(client, store=LabelFingerprintStore(client))
+    assert len(client.queries) == 14
+    assert all(n.result["status"] == "built" for n in first.nodes.values())
+
+    second = _run(client, store=LabelFingerprintStore(client))
+    assert len(client.queries) == 14
+    assert all(n.result["status"] == "unchanged" for n in second.nodes.values())
+
+    # the ACS source was refreshed: only the ZIP/ACS staging table and what is built from it rebuild
+    client.touch("bigquery-public-data.census_bureau_acs.zip_codes_2018_5yr")
+    third = _run(client, store=LabelFingerprintStore(client))
+    assert _built(third) == [
+        "area_assignments", "area_boundaries", "area_boundaries_ca", "area_features",
+        "area_indicators", "area_indicators_ca", "zip_areas_staging",
+    ]
+
+    # a rebuilt base table changes its search table's fingerprint too
+    client.touch("bigquery-public-data.overture_maps.place")
+    fourth = _run(client, store=LabelFingerprintStore(client))
+    assert sorted(n for n, s in fourth.nodes.items() if s.result["status"] == "built") == [
+        "area_assignments", "area_features", "org_locations", "org_locations_ca", "org_locations_search",
+        "overture_places_staging", "poi_entities", "poi_entities_ca", "poi_entities_search",
+    ]
+
+    _run(client, store=LabelFingerprintStore(client), force=True)
+    assert len(client.queries) == 14 + 7 + 9 + 14
+
+
+def test_rerun_retries_only_the_failed_shard():
+    client = FakeBigQuery()
+    client.fail = {"p.d.area_boundaries_ny"}
+    first = _attempt(client, regions=("CA", "NY", "TX"), fail_fast=False, store=LabelFingerprintStore(client))
+    assert first.nodes["area_boundaries_ny"].state == "failed"
+    assert first.nodes["area_boundaries"].state == "skipped"
+    assert first.nodes["area_boundaries_tx"].state == "succeeded"     # other shards kept going
+    assert "area_boundaries_ny" not in _built(first)
+
+    client.fail = set()
+    second = _run(client, regions=("CA", "NY", "TX"), store=LabelFingerprintStore(client))
+    assert _built(second) == ["area_assignments", "area_boundaries", "area_boundaries_ny"]
+
+
+def test_file_store(tmp_path):
+    client = FakeBigQuery()
+    store = FileFingerprintStore(str(tmp_path / "state" / "fp.json"))
+    _run(client, store=store)
+    assert store.get("p.d.poi_entities")
+    assert all(n.result["status"] == "unchanged" for n in _run(client, store=store).nodes.values())
+
+
+def test_bytes_billed_report_totals_steps():
+    client = FakeBigQuery()
+    report = bytes_billed_report(_run(client))
+    assert "overture_places_staging" in report
+    assert report.splitlines()[-1].split()[-1] == f"{14 * 10 / 1024:.2f}"
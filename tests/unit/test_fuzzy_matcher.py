@@ -0,0 +1,27 @@
+from agents.components.fuzzy_matcher import TrigramIndex, trigrams
+
+ONTOLOGY = {
+    "coffee_shop": {"synonyms": ["cafe", "coffee", "espresso bar"]},
+    "bakery": {"synonyms": ["patisserie", "bread shop"]},
+    "income": {"synonyms": ["median income", "household income"]},
+}
+
+
+def test_trigrams_are_padded_and_normalized():
+    assert trigrams("Cafe") == trigrams("  cafe ") == {"  c", " ca", "caf", "afe", "fe "}
+
+
+def test_misspellings_rank_the_right_category_first():
+    idx = TrigramIndex.from_ontology(ONTOLOGY)
+    assert idx.best("cofee shop").category == "coffee_shop"
+    assert idx.best("expresso bar").category == "coffee_shop"
+    assert idx.best("houshold incme").category == "income"
+    assert idx.best("patiserie").term == "patisserie"
+
+
+def test_ranked_candidates_and_cutoff():
+    idx = TrigramIndex.from_ontology(ONTOLOGY)
+    hits = idx.match("bread cafe", k=3)
+    assert len({h.category for h in hits}) == len(hits)
+    assert [h.score for h in hits] == sorted((h.score for h in hits), reverse=True)
+    assert idx.best("laundromat") is None
@@ -0,0 +1,65 @@
+import json
+import os
+
+from shared.clients.gazetteer_search import GazetteerIndex, GazetteerSearchClient, read_snapshot
+
+ROWS = [
+    {"area_id": "94607", "city": "Oakland", "county": "Alameda County", "centroid": [-122.29, 37.80], "bbox": [-122.33, 37.79, -122.26, 37.82]},
+    {"area_id": "94612", "city": "Oakland", "county": "Alameda County", "centroid": [-122.27, 37.81], "bbox": [-122.28, 37.80, -122.25, 37.82]},
+    {"area_id": "95050", "city": "Santa Clara", "county": "Santa Clara County", "centroid": [-121.95, 37.35], "bbox": [-121.98, 37.33, -121.93, 37.37]},
+]
+
+
+def _write(path, rows):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.writelines(json.dumps(r) + "\n" for r in rows)
+    os.replace(tmp, path)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def _snap(tmp_path):
+    path = str(tmp_path / "gazetteer.jsonl")
+    _write(path, ROWS)
+    return path
+
+
+def test_exact_and_prefix_lookups(tmp_path):
+    idx = GazetteerIndex.build(list(read_snapshot(_snap(tmp_path)).values()))
+
+    oakland = idx.exact("oakland")
+    assert [(h.kind, h.area_ids) for h in oakland] == [("city", ("94607", "94612"))]
+    assert oakland[0].bbox == (-122.33, 37.79, -122.25, 37.82)
+    assert [h.kind for h in idx.exact("Santa Clara")] == ["city", "county"]
+    assert idx.exact("santa clara county")[0].area_ids == ("95050",)
+    assert idx.exact("94107") == []
+    assert [h.name for h in idx.prefix("946")] == ["94607", "94612"]
+
+
+def test_client_search_finds_place_inside_query(tmp_path):
+    client = GazetteerSearchClient("p", "global", snapshot_path=_snap(tmp_path))
+    res = client.search("coffee near downtown oakland")
+    assert [r["area_ids"] for r in res["results"]] == [["94607", "94612"]]
+    assert client.search("95050")["results"][0]["kind"] == "zip"
+
+
+def test_refresh_reindexes_only_changed_keys(tmp_path):
+    path = _snap(tmp_path)
+    client = GazetteerSearchClient("p", "global", snapshot_path=path, refresh_s=3600)
+    before = client._current()
+    santa_clara = before.exact("santa clara")
+
+    rows = [dict(r) for r in ROWS[:2]] + [dict(ROWS[2]), {"area_id": "94107", "city": "San Francisco", "county": "San Francisco County", "centroid": [-122.39, 37.77], "bbox": [-122.40, 37.76, -122.38, 37.78]}]
+    rows[1]["city"] = "Piedmont"
+    _write(path, rows)
+
+    assert client.refresh()
+    after = client._current()
+    assert after.exact("oakland")[0].area_ids == ("94607",)
+    assert after.exact("piedmont")[0].area_ids == ("94612",)
+    assert after.exact("san francisco county")[0].area_ids == ("94107",)
+    assert after.exact("santa clara") == santa_clara
+    assert after._hits["santa clara"] is before._hits["santa clara"]   # untouched key reused
+    assert before.exact("oakland")[0].area_ids == ("94607", "94612")   # old readers unaffected
+    assert not client.refresh()
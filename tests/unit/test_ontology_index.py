@@ -0,0 +1,29 @@
+from agents.components.ontology_index import OntologyIndex, normalize_term, term_variants
+
+ONTOLOGY = {
+    "coffee_shop": {"synonyms": ["cafe", "coffeeshop", "espresso bar"]},
+    "bakery": {"synonyms": ["patisserie", "cafe"]},
+    "income": {"synonyms": ["median income"]},
+}
+
+
+def test_normalize_and_variants():
+    assert normalize_term("  Coffee-Shop!! ") == "coffee shop"
+    assert {"coffee shop", "coffee shops", "coffeeshop"} <= term_variants("Coffee Shops")
+    assert "bakery" in term_variants("bakeries")
+
+
+def test_lookup_hits_keys_synonyms_and_variants():
+    idx = OntologyIndex.build(ONTOLOGY)
+    assert idx.lookup("coffee_shop") == "coffee_shop"
+    assert idx.lookup("Coffee Shops") == "coffee_shop"
+    assert idx.lookup("espresso-bars") == "coffee_shop"
+    assert idx.lookup("Bakeries") == "bakery"
+    assert idx.lookup("Median  INCOME") == "income"
+    assert idx.lookup("tea room") is None
+
+
+def test_first_category_keeps_shared_synonym():
+    idx = OntologyIndex.build(ONTOLOGY)
+    assert idx.lookup("cafes") == "coffee_shop"
+    assert idx.ambiguous["cafe"] == ["coffee_shop", "bakery"]
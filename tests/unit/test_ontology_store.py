@@ -0,0 +1,61 @@
+import os
+import time
+
+import yaml
+
+from agents.components.ontology_store import OntologyStore, load_snapshot, snapshot_path
+
+
+def _write(path, ontology, bump_ns=0):
+    path.write_text(yaml.safe_dump(ontology))
+    if bump_ns:
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump_ns))
+
+
+def test_snapshot_reused_only_when_yaml_unchanged(tmp_path):
+    path = tmp_path / "categories.yaml"
+    _write(path, {"coffee_shop": {"synonyms": ["cafe"]}})
+
+    first = load_snapshot(str(path))
+    assert not first.from_snapshot
+    assert os.path.exists(snapshot_path(str(path)))
+    again = load_snapshot(str(path))
+    assert again.from_snapshot
+    assert again.index.lookup("cafes") == "coffee_shop"
+
+    # same bytes, new mtime: rebuilt rather than trusted
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    assert not load_snapshot(str(path)).from_snapshot
+
+
+def test_store_is_lazy_and_swaps_in_background(tmp_path):
+    path = tmp_path / "categories.yaml"
+    _write(path, {"coffee_shop": {"synonyms": ["cafe"]}})
+    store = OntologyStore(str(path), check_interval_s=0)
+    assert not store.stats()["loaded"]
+
+    v1 = store.current()
+    assert v1.index.lookup("gym") is None
+
+    _write(path, {"coffee_shop": {"synonyms": ["cafe"]}, "gym": {"synonyms": ["fitness center"]}}, bump_ns=10**9)
+    assert store.current() is v1          # never blocks on the rebuild
+    store.wait_for_reload(5)
+    v2 = store.current()
+    assert v2.version != v1.version
+    assert v2.index.lookup("fitness centers") == "gym"
+    assert v1.index.lookup("gym") is None  # old readers keep a consistent view
+
+
+def test_broken_edit_keeps_last_good_version(tmp_path):
+    path = tmp_path / "categories.yaml"
+    _write(path, {"coffee_shop": {"synonyms": ["cafe"]}})
+    store = OntologyStore(str(path), check_interval_s=0)
+    v1 = store.current()
+
+    path.write_text("coffee_shop: [unclosed\n")
+    os.utime(path, ns=(0, time.time_ns() + 10**9))
+    store.current()
+    store.wait_for_reload(5)
+    assert store.current() is v1
+    assert store.stats()["reload_errors"] == 1
@@ -0,0 +1,124 @@
+import asyncio
+import time
+import types
+
+import pytest
+
+from data.pipelines.operations import OperationManager, operation_progress, wait_for_operations
+from tests.fakes import FakeJob
+
+
+class FakeLRO:
+    """Shaped like google.api_core.operation.Operation: done(), metadata, result()."""
+
+    def __init__(self, name, polls_needed, result=None, error=None, rpc_s=0.0):
+        self.operation = types.SimpleNamespace(name=name)
+        self.polls_needed = polls_needed
+        self.polls = 0
+        self._result, self._error = result, error
+        self.rpc_s = rpc_s
+        self.metadata = types.SimpleNamespace(success_count=0, failure_count=0)
+
+    def done(self):
+        time.sleep(self.rpc_s)       # blocking RPC, like the real client
+        self.polls += 1
+        self.metadata = types.SimpleNamespace(success_count=self.polls * 10, failure_count=0)
+        return self.polls >= self.polls_needed
+
+    def result(self, timeout=None):
+        if self._error:
+            raise self._error
+        return self._result
+
+
+def _fast():
+    return OperationManager(initial_delay_s=0.01, max_delay_s=0.02)
+
+
+def test_operations_are_polled_concurrently_with_progress():
+    ops = [FakeLRO(f"op{i}", polls_needed=3, result=i, rpc_s=0.05) for i in range(4)] + [FakeJob(polls_needed=2, estimate=1024, rows=["row"])]
+    seen = []
+    t0 = time.perf_counter()
+    out = wait_for_operations(ops, manager=_fast(), on_progress=lambda h: seen.append((h.label, dict(h.progress))))
+    elapsed = time.perf_counter() - t0
+
+    assert out == [0, 1, 2, 3, ["row"]]
+    assert elapsed < 0.4                        # 4 × 3 polls × 50 ms would be 0.6 s serially
+    assert ("op0", {"success_count": 30, "failure_count": 0}) in seen
+    assert operation_progress(ops[-1]) == {
+        "job_id": "job_1", "state": "DONE", "total_bytes_processed": 1024, "total_bytes_billed": 1024,
+    }
+
+
+def test_handles_are_awaitable_and_report_failures():
+    mgr = _fast()
+
+    async def run():
+        ok = mgr.submit(FakeLRO("ok", 1, result="fine"))
+        bad = mgr.submit(FakeLRO("bad", 2, error=RuntimeError("import failed")), label="poi import")
+        assert await ok == "fine"
+        with pytest.raises(RuntimeError):
+            await bad
+        return mgr.progress()
+
+    states = {s["label"]: s["state"] for s in asyncio.run(run())}
+    assert states == {"ok": "done", "poi import": "failed"}
+
+
+def test_timeout_and_backoff():
+    mgr = OperationManager(initial_delay_s=0.01, max_delay_s=0.04, multiplier=2)
+    op = FakeLRO("slow", polls_needed=10**6)
+    with pytest.raises(TimeoutError):
+        wait_for_operations([op], manager=mgr, timeout_s=0.2)
+    assert 3 <= op.polls <= 12                  # backoff, not a busy loop
+
+
+def test_setup_search_infra_starts_every_lro_before_waiting(monkeypatch, tmp_path):
+    import json
+
+    import data.publish.datastores as datastores
+    import data.publish.setup_search_infra as infra
+    import shared.schemas.helpers as schemas
+    from google.api_core import exceptions
+
+    events = []
+
+    class TracedLRO(FakeLRO):
+        def __init__(self, label, result):
+            super().__init__(label, polls_needed=1, result=result)
+            self.label = label
+
+        def result(self, timeout=None):
+            events.append(f"done {self.label}")
+            return super().result(timeout)
+
+    class FakeDE:
+        def get_data_store(self, name):
+            raise exceptions.NotFound(name)
+
+        def create_data_store(self, parent, data_store, data_store_id):
+            events.append(f"start ds {data_store_id}")
+            return TracedLRO(f"ds {data_store_id}", types.SimpleNamespace(name=data_store_id))
+
+        def create_schema(self, parent, schema, schema_id):
+            events.append(f"start schema {schema_id}")
+            return TracedLRO(f"schema {schema_id}", schema_id)
+
+    monkeypatch.setattr(datastores, "discovery_client", lambda *a: FakeDE())
+    monkeypatch.setattr(schemas, "discovery_client", lambda *a: FakeDE())
+    monkeypatch.setattr(infra, "get_config", lambda: types.SimpleNamespace(PROJECT_ID="p", SEARCH_LOCATION="global"))
+    files = []
+    for name in ("poi", "org"):
+        path = tmp_path / f"{name}.json"
+        path.write_text(json.dumps({"SEARCH_DATASTORE": f"{name}_ds", "SCHEMA_ID": f"{name}_schema", "PROPERTIES": {}}))
+        files.append(str(path))
+    monkeypatch.setenv("SCHEMA_FILES", ",".join(files))
+
+    infra.main()
+
+    starts = [i for i, e in enumerate(events) if e.startswith("start ds")]
+    waits = [i for i, e in enumerate(events) if e.startswith("done ds")]
+    assert len(starts) == 2 and max(starts) < min(waits)
+    schema_starts = [i for i, e in enumerate(events) if e.startswith("start schema")]
+    schema_waits = [i for i, e in enumerate(events) if e.startswith("done schema")]
+    assert len(schema_starts) == 2 and max(waits) < min(schema_starts) and max(schema_starts) < min(schema_waits)
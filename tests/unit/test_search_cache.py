@@ -0,0 +1,63 @@
+import time
+
+from shared.clients.search_cache import CachedSearchClient, SearchCache
+
+
+class FakeClient:
+    def __init__(self, known=()):
+        self.known = set(known)
+        self.calls = []
+
+    def search(self, query):
+        self.calls.append(query)
+        return {"results": [{"id": query}] if query in self.known else [], "query": query}
+
+
+def _cache(**kw):
+    kw.setdefault("generation_file", None)
+    return SearchCache("test", **kw)
+
+
+def test_hits_and_negative_results_are_cached_with_own_ttl():
+    client = FakeClient(known={"cafe"})
+    c = CachedSearchClient(client, _cache(ttl_s=60, negative_ttl_s=0.05, stale_s=0))
+    c.search("cafe"); c.search(" Cafe "); c.search("cofee"); c.search("cofee")
+    assert client.calls == ["cafe", "cofee"]
+    time.sleep(0.06)
+    c.search("cofee"); c.search("cafe")
+    assert client.calls == ["cafe", "cofee", "cofee"]
+    s = c.cache.stats()
+    assert (s["hits"], s["negative_hits"], s["misses"]) == (2, 1, 3)
+
+
+def test_stale_entry_served_while_refreshing_in_background():
+    client = FakeClient(known={"cafe"})
+    c = CachedSearchClient(client, _cache(ttl_s=0.02, stale_s=10))
+    first = c.search("cafe")
+    time.sleep(0.03)
+    assert c.search("cafe") is first           # served stale, refresh kicked off
+    for _ in range(100):
+        if c.cache.stats()["refreshes"]:
+            break
+        time.sleep(0.01)
+    assert len(client.calls) == 2
+    assert c.cache.stats()["stale_hits"] == 1
+
+
+def test_lru_bound_and_invalidation(tmp_path):
+    gen = tmp_path / "gen"
+    cache = SearchCache("t", max_entries=2, generation_file=str(gen))
+    client = FakeClient()
+    c = CachedSearchClient(client, cache)
+    for q in ("a", "b", "c"):
+        c.search(q)
+    assert cache.stats()["size"] == 2 and cache.stats()["evictions"] == 1
+
+    cache.invalidate("c")
+    c.search("c")
+    assert client.calls.count("c") == 2
+
+    gen.write_text("")                          # another process flushed all caches
+    cache._next_generation_check = 0
+    c.search("b")
+    assert client.calls.count("b") == 2
@@ -0,0 +1,67 @@
+import types
+
+import pytest
+from google.api_core import exceptions
+
+from data.pipelines.dag import Dag
+from data.tasks.bq_materialize import US_STATES, _drop_table_in_way_of_view, materialize_steps, parse_regions
+
+
+def test_parse_regions():
+    assert parse_regions("ca, ny,CA") == ("CA", "NY")
+    assert parse_regions("all") == US_STATES and len(US_STATES) == 51
+    for bad in ("", "California", "C'A"):
+        with pytest.raises(ValueError):
+            parse_regions(bad)
+
+
+def test_each_region_gets_its_own_shards_behind_one_view():
+    steps = {s.name: s for s in materialize_steps("p.d", ("CA", "NY"))}
+    Dag(steps.values())                                        # valid graph
+
+    staging = steps["overture_places_staging"].payload
+    assert staging.count("element.country = 'US' AND element.region IN (\"CA\", \"NY\")") == 2
+    assert "categories.primary IN (\"cafe\"" in staging and "OR names.primary = 'Blue Bottle Coffee'" in staging
+    assert "OFFSET\n        (0)" not in staging and "address.region AS region" in staging
+    assert "WHERE region = 'NY'" in steps["poi_entities_ny"].payload
+    assert "state_code = 'NY'" in steps["area_boundaries_ny"].payload
+    view = steps["area_indicators"]
+    assert view.deps == ("area_indicators_ca", "area_indicators_ny")
+    assert "CREATE OR REPLACE VIEW `p.d.area_indicators`" in view.payload
+    assert "UNION ALL" in view.payload and "FROM `p.d.area_indicators_ny`" in view.payload
+    assert steps["poi_entities_search"].deps == ("poi_entities",)
+
+
+def test_each_public_source_is_read_by_one_staging_step():
+    steps = {s.name: s for s in materialize_steps("p.d", ("CA", "NY", "TX"))}
+    sources = {
+        "bigquery-public-data.overture_maps.place": "overture_places_staging",
+        "bigquery-public-data.geo_us_boundaries.zip_codes": "zip_areas_staging",
+        "bigquery-public-data.census_bureau_acs.zip_codes_2018_5yr": "zip_areas_staging",
+    }
+    for source, staging in sources.items():
+        assert [n for n, s in steps.items() if source in s.payload] == [staging]
+    assert "state_code IN (\"CA\", \"NY\", \"TX\")" in steps["zip_areas_staging"].payload
+    for shard in ("area_indicators_tx", "area_boundaries_tx"):
+        assert steps[shard].deps == ("zip_areas_staging",)
+        assert "FROM `p.d.zip_areas_staging`" in steps[shard].payload and "state_code = 'TX'" in steps[shard].payload
+
+
+class FakeTables:
+    def __init__(self, tables):
+        self.tables, self.deleted = tables, []
+
+    def get_table(self, table_id):
+        if table_id not in self.tables:
+            raise exceptions.NotFound(table_id)
+        return types.SimpleNamespace(table_type=self.tables[table_id])
+
+    def delete_table(self, table_id):
+        self.deleted.append(table_id)
+
+
+def test_pre_sharding_table_is_dropped_before_its_view_is_created():
+    client = FakeTables({"p.d.poi_entities": "TABLE", "p.d.org_locations": "VIEW"})
+    for table_id in ("p.d.poi_entities", "p.d.org_locations", "p.d.area_indicators"):
+        _drop_table_in_way_of_view(client, table_id)
+    assert client.deleted == ["p.d.poi_entities"]
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import agents.workflows.query_workflow as qw
+from agents.components.single_flight import SingleFlight
+
+
+def test_concurrent_sync_callers_share_one_call():
+    sf = SingleFlight()
+    calls = []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"filters": []}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(sf.do("k", work))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert len(results) == 8
+    results[0]["filters"].append("mutated")
+    assert results[1]["filters"] == []
+    assert sf.stats()["coalesced"] == 7
+
+
+def test_errors_propagate_to_followers():
+    sf = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.02)
+        raise RuntimeError("model down")
+
+    async def run():
+        return await asyncio.gather(*(sf.ado("k", boom) for _ in range(3)), return_exceptions=True)
+
+    out = asyncio.run(run())
+    assert all(isinstance(e, RuntimeError) for e in out)
+    assert sf.stats()["in_flight"] == 0
+
+
+def test_workflow_coalesces_on_normalized_text(monkeypatch):
+    calls = []
+
+    async def fake_run(user_text, deadline_s):
+        calls.append(user_text)
+        await asyncio.sleep(0.02)
+        return {"intent": "gap"}
+
+    monkeypatch.setattr(qw, "_arun_slot_agent", fake_run)
+    monkeypatch.setattr(qw, "_INFLIGHT", SingleFlight())
+
+    async def run():
+        return await asyncio.gather(qw.arun_slot_agent("Cafes near 94107"), qw.arun_slot_agent("cafes  near 94107"))
+
+    assert asyncio.run(run()) == [{"intent": "gap"}, {"intent": "gap"}]
+    assert len(calls) == 1
+    assert qw.coalescing_stats()["coalescing_ratio"] == pytest.approx(0.5)
+
+
+def test_cancelled_leader_hands_over_to_a_follower():
+    sf = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def run():
+        leader = asyncio.ensure_future(sf.ado("k", work))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(sf.ado("k", work)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()                        # e.g. the client disconnected
+        return await asyncio.gather(*followers)
+
+    assert asyncio.run(run()) == [2, 2, 2]      # one follower re-ran the work, the rest shared it
+    assert sf.stats()["in_flight"] == 0
+
+
+def test_workflow_does_not_coalesce_across_deadlines(monkeypatch):
+    calls = []
+
+    async def fake_run(user_text, deadline_s):
+        calls.append(deadline_s)
+        await asyncio.sleep(0.02)
+        return {"intent": "gap"}
+
+    monkeypatch.setattr(qw, "_arun_slot_agent", fake_run)
+    monkeypatch.setattr(qw, "_INFLIGHT", SingleFlight())
+
+    async def run():
+        return await asyncio.gather(
+            qw.arun_slot_agent("cafes near 94107", deadline_s=0.5),
+            qw.arun_slot_agent("cafes near 94107", deadline_s=0.55),
+            qw.arun_slot_agent("cafes near 94107", deadline_s=5.0),
+        )
+
+    asyncio.run(run())
+    assert sorted(calls) == [0.5, 5.0]
@@ -0,0 +1,75 @@
+import asyncio
+
+import agents.components.slot_extractor as se
+from agents.components.slot_cache import SlotCache, cache_key, fingerprint, normalize_query, set_slot_cache
+from agents.components.slot_schema import SlotExtraction
+
+
+def _slots():
+    return SlotExtraction(intent="gap", target_category="coffee_shop")
+
+
+def test_normalize_query_collapses_case_and_space():
+    assert normalize_query("  Cafes   near 94107 ") == normalize_query("cafes near 94107")
+
+
+def test_key_changes_with_prompt_or_schema():
+    fp = fingerprint("m", "prompt", {"a": 1})
+    assert cache_key("q", fp) != cache_key("q", fingerprint("m", "prompt v2", {"a": 1}))
+    assert cache_key("q", fp) != cache_key("q", fingerprint("m", "prompt", {"a": 2}))
+
+
+def test_memory_lru_and_disk_tier(tmp_path):
+    path = str(tmp_path / "slots.sqlite")
+    cache = SlotCache(path, maxsize=1, ttl=60)
+    cache.put("a", _slots())
+    cache.put("b", _slots())   # evicts "a" from memory, still on disk
+    assert cache.get("a").target_category == "coffee_shop"
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.get("a") is not None
+    assert cache.stats()["memory_hits"] == 1
+
+    # a new process sees the disk tier
+    assert SlotCache(path, maxsize=4).get("b") is not None
+
+
+def test_ttl_expiry(tmp_path):
+    cache = SlotCache(str(tmp_path / "slots.sqlite"), ttl=-1)
+    cache.put("a", _slots())
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_extract_slots_genai_uses_cache(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(se, "_generate_slots", lambda q: calls.append(q) or _slots())
+    set_slot_cache(SlotCache(str(tmp_path / "slots.sqlite")))
+    try:
+        first = se.extract_slots_genai("Cafes near 94107")
+        first.target_category = "mutated"
+        assert se.extract_slots_genai("cafes  near 94107").target_category == "coffee_shop"
+        se.extract_slots_genai("cafes near 94107", use_cache=False)
+        assert len(calls) == 2
+    finally:
+        set_slot_cache(None)
+
+
+def test_fast_model_answers_are_cached_under_their_own_model(monkeypatch, tmp_path):
+    from agents.components.slot_hedging import Hedger
+
+    async def fake_generate(q, model):
+        return SlotExtraction(intent="aggregate", target_category=model)
+
+    sync_calls = []
+    monkeypatch.setattr(se, "_HEDGER", Hedger(fake_generate, se.MODEL, fast_model="fast-model"))
+    monkeypatch.setattr(se, "_generate_slots", lambda q: sync_calls.append(q) or _slots())
+    set_slot_cache(SlotCache(str(tmp_path / "slots.sqlite")))
+    try:
+        routed = asyncio.run(se.aextract_slots_genai("coffee shops in oakland", deadline_s=1.0))
+        assert routed.target_category == "fast-model"
+        # the deadline-bound path reuses it; the primary-model path does not
+        assert asyncio.run(se.aextract_slots_genai("coffee shops in oakland", deadline_s=1.0)).target_category == "fast-model"
+        assert se.extract_slots_genai("coffee shops in oakland").target_category == "coffee_shop"
+        assert sync_calls == ["coffee shops in oakland"]
+    finally:
+        set_slot_cache(None)
@@ -0,0 +1,42 @@
+import asyncio
+import json
+import types
+
+import agents.components.slot_extractor as se
+
+
+class FakeAsyncModels:
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate_content(self, model, contents, config):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return types.SimpleNamespace(parsed=None, text=json.dumps({"intent": "aggregate"}))
+
+
+def test_async_extraction_shares_client_and_caps_concurrency(monkeypatch):
+    models = FakeAsyncModels()
+    built = []
+
+    def fake_client(**kwargs):
+        built.append(kwargs)
+        return types.SimpleNamespace(aio=types.SimpleNamespace(models=models))
+
+    monkeypatch.setenv("GOOGLE_CLOUD_PROJECT", "p")
+    monkeypatch.setattr(se.genai, "Client", fake_client)
+    monkeypatch.setattr(se, "GENAI_MAX_CONCURRENCY", 3)
+    se.close_client()
+
+    async def run():
+        return await asyncio.gather(*(se.aextract_slots_genai(f"q{i}", use_cache=False) for i in range(10)))
+
+    out = asyncio.run(run())
+    assert all(s.intent == "aggregate" for s in out)
+    assert len(built) == 1
+    assert models.peak == 3
+    se.close_client()
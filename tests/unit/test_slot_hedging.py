@@ -0,0 +1,111 @@
+import asyncio
+import json
+import types
+
+import pytest
+from fastapi.testclient import TestClient
+
+import agents.components.slot_extractor as se
+from agents.components.slot_hedging import Hedger, route_model
+
+
+class DelayedModels:
+    """Fake genai `aio.models` that answers each call after a scripted delay."""
+
+    def __init__(self, delays, fail=()):
+        self.delays = list(delays)
+        self.fail = set(fail)
+        self.calls = []
+
+    async def generate_content(self, model, contents, config):
+        n = len(self.calls)
+        self.calls.append(model)
+        await asyncio.sleep(self.delays[min(n, len(self.delays) - 1)])
+        if n in self.fail:
+            return types.SimpleNamespace(parsed=None, text=json.dumps({"intent": 42}))
+        return types.SimpleNamespace(parsed=None, text=json.dumps({"intent": "aggregate", "target_category": f"call{n}"}))
+
+
+@pytest.fixture
+def fake_models(monkeypatch):
+    def install(models):
+        client = types.SimpleNamespace(aio=types.SimpleNamespace(models=models))
+        monkeypatch.setattr(se, "_client", lambda: client)
+        return models
+    return install
+
+
+def _hedger():
+    return Hedger(se._agenerate_slots, "primary-model", fast_model="fast-model")
+
+
+def test_fast_primary_is_not_hedged(fake_models):
+    fake_models(DelayedModels([0.01]))
+    out = asyncio.run(_hedger().run("how many people live in the bay area in total please", deadline_s=1.0))
+    assert (out.winner, out.hedged) == ("primary", False)
+
+
+def test_slow_primary_loses_to_hedge(fake_models):
+    models = fake_models(DelayedModels([0.5, 0.01]))
+    h = _hedger()
+    for _ in range(50):
+        h.tracker("primary-model").record(0.05)   # observed p95 = 50ms
+    out = asyncio.run(h.run("cafes with income > 70000", deadline_s=1.0))
+    assert (out.winner, out.hedged) == ("hedge", True)
+    assert out.slots.target_category == "call1"
+    assert out.elapsed_s < 0.3
+    assert models.calls == ["primary-model", "primary-model"]
+    assert h.stats()["winner:hedge"] == 1
+
+
+def test_invalid_primary_answer_triggers_immediate_hedge(fake_models):
+    fake_models(DelayedModels([0.01, 0.01], fail={0}))
+    out = asyncio.run(_hedger().run("cafes with income > 70000", deadline_s=1.0))
+    assert out.winner == "hedge"
+
+
+def test_deadline_exceeded(fake_models):
+    fake_models(DelayedModels([0.5]))
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(_hedger().run("cafes with income > 70000", deadline_s=0.1))
+
+
+def test_route_model():
+    assert route_model("coffee shops in oakland", "p", "f") == ("f", "short")
+    assert route_model("areas with income > 70k and no cafes", "p", "f") == ("p", "complex")
+    assert route_model("coffee shops in oakland", "p", "") == ("p", "default")
+
+
+def test_short_query_is_served_by_fast_model(fake_models):
+    models = fake_models(DelayedModels([0.01]))
+    out = asyncio.run(_hedger().run("coffee shops in oakland", deadline_s=1.0))
+    assert out.model == "fast-model" and models.calls == ["fast-model"]
+
+
+@pytest.fixture
+def query_api(fake_models, monkeypatch, tmp_path):
+    import agents.workflows.query_workflow as qw
+    from agents.components.single_flight import SingleFlight
+    from agents.components.slot_cache import SlotCache, set_slot_cache
+    from app.main import app
+
+    monkeypatch.setattr(se, "_HEDGER", _hedger())
+    monkeypatch.setattr(qw, "_INFLIGHT", SingleFlight())
+    monkeypatch.setattr(qw, "_resolve_slots", lambda slots: slots.model_dump())
+    set_slot_cache(SlotCache(str(tmp_path / "slots.sqlite")))
+    yield TestClient(app)
+    set_slot_cache(None)
+
+
+def test_query_route_passes_a_deadline_so_short_queries_use_the_fast_model(fake_models, query_api):
+    models = fake_models(DelayedModels([0.01]))
+    res = query_api.post("/v1/query", params={"q": "coffee shops in oakland"})
+    assert res.status_code == 200 and res.json()["target_category"] == "call0"
+    assert models.calls == ["fast-model"]
+    assert se.hedging_stats()["route:short"] == 1
+
+
+def test_query_route_maps_a_missed_deadline_to_504(fake_models, query_api):
+    fake_models(DelayedModels([0.5]))
+    res = query_api.post("/v1/query", params={"q": "coffee shops in oakland", "deadline_s": 0.05})
+    assert res.status_code == 504
@@ -0,0 +1,47 @@
+import agents.components.slot_extractor as se
+from agents.components.slot_rules import RuleExtractor
+from agents.components.slot_schema import SlotExtraction
+
+rules = RuleExtractor(se.SLOT_EXTRACTION_SCHEMA)
+
+
+def test_gap_pattern():
+    m = rules.extract("Find areas with income > 70k and no coffee shops within 1 km")
+    assert m.rule == "gap" and m.confidence == 1.0
+    f = [(x.field, x.op, x.value) for x in m.slots.filters]
+    assert f == [("income", "gt", "70000"), ("distance", "within_km", "1")]
+    assert m.slots.target_category == "coffee shops"
+
+
+def test_nearby_pattern_converts_units_and_keeps_place():
+    m = rules.extract("coffee shops within 500 m of 94107?")
+    assert m.slots.intent == "nearby"
+    assert [(x.field, x.value) for x in m.slots.filters] == [("distance", "0.5"), ("place", "94107")]
+
+
+def test_unmatched_and_ambiguous_queries():
+    assert rules.extract("what is the best place to open a bakery") is None
+    assert rules.extract("coffee and bakeries within 1 km of Oakland").confidence < se.SLOT_RULES_MIN_CONFIDENCE
+    # "X in Y" is too loose to serve without the model
+    assert rules.extract("coffee shops in Oakland") is None
+
+
+def test_rank_leaves_top_n_to_the_model():
+    m = rules.extract("areas ranked by median income")
+    assert m.rule == "rank" and [x.name for x in m.slots.metrics] == ["median income"]
+    assert rules.extract("top 5 areas by income") is None
+
+
+def test_ops_outside_schema_are_not_emitted():
+    schema = {"properties": {
+        "intent": {"enum": ["gap"]},
+        "filters": {"items": {"properties": {"op": {"enum": ["eq", "within_km"]}}}},
+    }}
+    assert RuleExtractor(schema).extract("areas with income > 70k and no cafes") is None
+
+
+def test_extract_slots_reports_path(monkeypatch):
+    monkeypatch.setattr(se, "_extract_genai_traced", lambda q, use_cache: (SlotExtraction(intent="aggregate"), "model"))
+    assert se.extract_slots_traced("cafes within 2 km of Oakland")[1] == "rules"
+    assert se.extract_slots_traced("how saturated is the coffee market")[1] == "model"
+    assert se.extract_slots_traced("cafes within 2 km of Oakland", use_rules=False)[1] == "model"
@@ -0,0 +1,83 @@
+import json
+import os
+
+from fastapi.testclient import TestClient
+
+from data.tasks.export_suggest import source_table, suggest_docs_sql, write_docs
+from shared.clients.suggest_index import SuggestIndex, SuggestService
+
+POI = [
+    {"id": "p1", "structData": {"name": "Blue Bottle Coffee", "street_address": "300 Webster St", "locality": "Oakland", "postcode": "94607"}},
+    {"id": "p2", "structData": {"name": "Philz Coffee", "street_address": "789 Blue Ridge Rd", "locality": "San Jose", "postcode": "95112"}},
+    {"id": "p3", "structData": {"name": "Philz Coffee", "street_address": "4023 18th St", "locality": "San Francisco", "postcode": "94114"}},
+    {"id": "p4", "structData": {"name": "Bluebird Cafe", "street_address": "1 Main St", "locality": "Oakland", "postcode": "94612"}},
+]
+
+
+def _write(path, docs):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.writelines(json.dumps(d) + "\n" for d in docs)
+    os.replace(tmp, path)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def _index(tmp_path, docs=POI):
+    path = str(tmp_path / "poi_entities_search.jsonl")
+    _write(path, docs)
+    return path, SuggestIndex.from_files([path])
+
+
+def test_prefix_matches_any_word_and_ranks_names_first(tmp_path):
+    _, idx = _index(tmp_path)
+    ids = [s.id for s in idx.suggest("blue")]
+    assert ids[:2] in (["p1", "p4"], ["p4", "p1"])       # name matches
+    assert ids[2] == "p2"                                 # "Blue Ridge Rd" address match
+    assert idx.suggest("coff", k=1)[0].name == "Philz Coffee"   # chain popularity
+    assert idx.suggest("bot")[0].matched_field == "name"
+    assert idx.suggest("zzz") == []
+
+
+def test_region_filters(tmp_path):
+    _, idx = _index(tmp_path)
+    assert [s.id for s in idx.suggest("coffee", locality="san francisco")] == ["p3"]
+    assert [s.id for s in idx.suggest("b", postcode="94612")] == ["p4"]
+    assert idx.suggest("coffee", locality="Nowhere") == []
+
+
+def test_service_swaps_index_when_export_lands(tmp_path):
+    path, _ = _index(tmp_path)
+    svc = SuggestService([path], reload_interval_s=0)
+    old = svc.index()
+    assert svc.suggest("verve") == []
+
+    _write(path, POI + [{"id": "p5", "structData": {"name": "Verve Coffee", "locality": "Santa Cruz"}}])
+    assert svc.index() is old
+    svc.wait_for_reload(5)
+    assert [s.id for s in svc.suggest("verve")] == ["p5"]
+
+
+def test_suggest_route(tmp_path, monkeypatch):
+    import app.api.v1.routes_suggest as routes
+    from app.main import app
+
+    path, _ = _index(tmp_path)
+    monkeypatch.setattr(routes, "get_suggest_service", lambda: SuggestService([path]))
+    res = TestClient(app).get("/v1/suggest", params={"q": "phi", "k": 1})
+    assert res.status_code == 200
+    assert [s["id"] for s in res.json()["suggestions"]] in (["p2"], ["p3"])
+
+
+def test_export_writes_files_the_index_loads(tmp_path):
+    path = str(tmp_path / "exports" / "poi_entities_search.jsonl")
+    rows = [
+        {"id": 1, "name": "Blue Bottle Coffee", "street_address": "300 Webster St", "locality": "Oakland", "postcode": "94607"},
+        {"id": 2, "name": "Blue Bottle Coffee", "street_address": "1 Ferry Bldg", "locality": "San Francisco", "postcode": "94111"},
+    ]
+    assert write_docs(rows, path) == 2
+    assert source_table(path) == "poi_entities_search"
+    assert "FROM `p.d.poi_entities_search`" in suggest_docs_sql("p.d", "poi_entities_search")
+
+    hits = SuggestIndex.from_files([path]).suggest("blue bot", locality="oakland")
+    assert [(h.id, h.source) for h in hits] == [("1", "poi_entities_search")]
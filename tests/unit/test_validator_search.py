@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+from agents.components.slot_schema import Filter, SlotExtraction
+from agents.components.validator_search import avalidate_slots, lookups_for
+
+
+class FakeSearch:
+    def __init__(self, delay=0.1, known=(), fail=()):
+        self.delay, self.known, self.fail = delay, set(known), set(fail)
+        self.active = self.peak = 0
+
+    async def asearch(self, term):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if term in self.fail:
+                raise RuntimeError("datastore unavailable")
+            return {"results": [{"id": term}] if term in self.known else [], "query": term}
+        finally:
+            self.active -= 1
+
+
+def _slots():
+    return SlotExtraction(
+        intent="nearby",
+        target_category="cafe",
+        filters=[
+            Filter(field="category", op="eq", value="bakery"),
+            Filter(field="place", op="eq", value="Oakland"),
+            Filter(field="distance", op="within_km", value="2"),
+            Filter(field="zip", op="eq", value="94107"),
+        ],
+    )
+
+
+def test_lookups_cover_categories_and_places_only():
+    kinds = [(lk.slot, lk.kind) for lk in lookups_for(_slots())]
+    assert kinds == [
+        ("target_category", "category"),
+        ("filters[0].value", "category"),
+        ("filters[1].value", "place"),
+        ("filters[3].value", "place"),
+    ]
+
+
+def test_lookups_run_concurrently_and_merge():
+    cat = FakeSearch(known={"cafe", "bakery"})
+    gaz = FakeSearch(known={"Oakland"}, fail={"94107"})
+    t0 = time.perf_counter()
+    report = asyncio.run(avalidate_slots(_slots(), category_client=cat, gazetteer_client=gaz))
+    assert time.perf_counter() - t0 < 0.3          # ~one lookup, not four in series
+    assert report["passed"] and report["degraded"]
+    assert [d["status"] for d in report["details"]] == ["ok", "ok", "ok", "error"]
+
+
+def test_concurrency_cap_and_timeout():
+    cat = FakeSearch(delay=0.05, known={"cafe", "bakery"})
+    gaz = FakeSearch(delay=1.0, known={"Oakland", "94107"})
+    report = asyncio.run(avalidate_slots(
+        _slots(), category_client=cat, gazetteer_client=gaz, max_concurrency=1, timeout_s=0.2,
+    ))
+    assert cat.peak == 1
+    statuses = {d["term"]: d["status"] for d in report["details"]}
+    assert statuses == {"cafe": "ok", "bakery": "ok", "Oakland": "timeout", "94107": "timeout"}
+
+
+def test_not_found_fails_validation():
+    cat = FakeSearch(delay=0, known={"cafe"})
+    gaz = FakeSearch(delay=0, known={"Oakland", "94107"})
+    report = asyncio.run(avalidate_slots(_slots(), category_client=cat, gazetteer_client=gaz))
+    assert not report["passed"]
+    assert not report["degraded"]